@@ -15,6 +15,7 @@ from kalman_tracker import KalmanTracker
 from trajectory_predictor import TrajectoryPredictor
 from config import N_FRAMES_TO_ANALYZE, FRAME_SKIP, FPS
 from osm_fetcher import OSMGolfFetcher
+from course_geometry import POLYGON_KINDS
 
 app = Flask(__name__)
 
@@ -25,7 +26,14 @@ CORS(app)  # Enable CORS for mobile app requests
 # Initialize detector with hybrid pipeline (YOLO + Hough + Kalman)
 # Will automatically fall back to Hough-only if YOLO model not found
 yolo_model_path = 'models/yolov8n.onnx' if os.path.exists('models/yolov8n.onnx') else None
-detector = HybridBallDetector(yolo_model_path=yolo_model_path, confidence_threshold=0.3)
+detector = HybridBallDetector(yolo_model_path=yolo_model_path, confidence_threshold=0.3,
+                              max_candidates=3)  # NMS'd hypotheses, ROI-nearest wins
+
+# Hough preprocessing per endpoint, (acquisition, tracking) profiles (see
+# frame_preprocessor.benchmark_profiles): live preview trades a little
+# robustness for latency, offline analysis keeps the full filter chain
+LIVE_PROFILES = ('balanced', 'fast')
+OFFLINE_PROFILES = ('quality', 'quality')
 
 tracker = KalmanTracker(
     process_noise=1.5,      # Moderate process noise (ball physics)
@@ -63,7 +71,7 @@ def detect_frame():
             return jsonify({'detected': False, 'error': 'Bad image'}), 400
 
         # Detect ball
-        center, radius = detector.detect_ball(frame)
+        center, radius = detector.detect_ball(frame, profiles=LIVE_PROFILES)
         
         # Update Kalman filter
         # Pass (x, y, radius) tuple or None
@@ -199,7 +207,7 @@ def process_video(video_path):
             continue
 
         # Detect ball in current frame
-        center, radius = detector.detect_ball(frame)
+        center, radius = detector.detect_ball(frame, profiles=OFFLINE_PROFILES)
 
         if center:
             timestamp = frame_count / fps
@@ -271,6 +279,14 @@ def get_config():
     })
 
 
+@app.route('/api/trajectory_cache', methods=['GET'])
+def trajectory_cache_stats():
+    """Returns hit/miss and memory statistics for the trajectory cache"""
+    from trajectory_cache import get_trajectory_cache
+    
+    return jsonify(get_trajectory_cache().get_stats())
+
+
 @app.route('/api/analyze_shot', methods=['POST'])
 def analyze_shot():
     """
@@ -281,7 +297,49 @@ def analyze_shot():
         "frames": [base64_encoded_images],  // First 10-15 frames after impact
         "gps": {"lat": float, "lon": float},
         "compass_heading": float,  // degrees from North
-        "gyro_tilt": float  // Phone tilt in degrees
+        "gyro_tilt": float,  // Phone tilt in degrees
+        "landing_only": bool,  // Optional: interpolate landing points from the
+                               // precomputed carry surface instead of simulating
+                               // full flights (see "landing_only" below);
+                               // 400 if the surface hasn't been generated
+        "ensemble_size": int,  // Optional: Monte Carlo trajectories for the search
+                               // zones, e.g. 2000 (default 0 = fixed 15m
+                               // circles). Opt-in: about 20 ms per 1000
+                               // (10000 = ~230 ms); interpolated from the
+                               // carry surface with landing_only
+        "simplify_tolerance_m": float,  // Optional: drop trajectory points within
+                                        // this distance of the line (default 0.25,
+                                        // 0 = full resolution)
+        "max_points": int,  // Optional: point budget per trajectory
+        "motion_gating": bool,  // Optional: after the first frame search only
+                                // moving blobs (default false; drops a ball
+                                // still at address in the early frames)
+        "launch_fit": bool,  // Optional: fit launch speed/angle to all tracked
+                             // points (default true, false = first/last point)
+        "sample_rate_hz": float,  // Optional: resample each flight at this rate
+                                  // (the client's render rate) instead of
+                                  // simplifying it
+        "rollout": bool,  // Optional: bounce and roll to the final rest position
+                          // (default true); search zones cover the rest spread.
+                          // Not available with landing_only (no landing
+                          // velocity or spin): zones cover the landing spread
+        "lie": str,  // Optional: landing surface for the rollout (default
+                     // "fairway", see ball_rollout.SURFACE_COEFFICIENTS);
+                     // with "course" each ball rolls out on the lie it
+                     // landed in instead (ball_rollout.COURSE_LIE_SURFACES)
+        "top_archetypes": int,  // Optional: only simulate the k archetypes that
+                                // best match the tracked early flight, plus
+                                // those indistinguishable from them side-on
+                                // (default 0 = all archetypes, no ranking)
+        "output_format": str,  // Optional: "json" (default, [lat, lon, z] lists)
+                               // or "polyline": points and search zone
+                               // perimeters become encoded polylines
+                               // ("points_encoded", "perimeter_encoded"),
+                               // described by the top-level "encoding"
+        "course": {"lat": float, "lon": float, "radius": int}  // Optional:
+                               // course center; classifies landing/rest
+                               // points and the ensemble against the
+                               // course polygons (see course_geometry)
     }
     
     Returns:
@@ -293,19 +351,48 @@ def analyze_shot():
             "high_slice": {
                 "points": [[lat,lon,z], ...],
                 "landing_gps": {"lat": ..., "lon": ...},
+                "rest_gps": {"lat": ..., "lon": ...},
                 "carry_distance_yards": float,
+                "rollout_yards": float,
+                "total_distance_yards": float,
                 "curve_yards": float,
-                "search_zone": {...}
+                "search_zone": {...},
+                "rollout_surface": str,  // rollout only: surface it rolled on
+                "landing_lie": str,  // with "course" only
+                "rest_lie": str,
+                "lie_probabilities": {"fairway": 0.8, "rough": 0.2, ...},
+                "terrain_landing": bool,  // with a course DEM only: false if the
+                                          // flight never met the terrain
+                "landing_elevation_m": float,  // terrain landings only
+                "elevation_change_m": float
             },
             ...
         },
-        "weather": {...}
+        "archetype_ranking": [{"archetype": ..., "weight": ...,  // top_archetypes only
+                               "equivalent_archetypes": [...]}, ...],  // tied side-on
+        "weather": {...},
+        "lie": str,  // client lie used for the rollout (null with "course")
+        "landing_only": bool  // true when served from the carry surface: the
+                              // trajectories have no "points"/"points_encoded",
+                              // and "rest_gps", "rest_lie", "rollout_yards" and
+                              // "total_distance_yards" are null (no landing
+                              // velocity or spin to roll out from)
     }
     """
-    from shot_archetypes import SHOT_TYPES, get_all_archetypes
-    from trajectory_physics import TrajectorySimulator
-    from gps_converter import trajectory_to_gps, create_search_zone
+    from shot_archetypes import SHOT_TYPES
+    from trajectory_cache import get_trajectory_cache
+    from trajectory_physics import DenseTrajectory
+    from trajectory_array import TrajectoryArray
+    from polyline_codec import encode_gps_points, encoding_info
+    from gps_converter import trajectory_to_gps, create_search_zone, create_ellipse_search_zone, get_projection
+    from course_geometry import LIE_CATEGORIES
+    from landing_ensemble import simulate_landing_ensemble, fit_landing_ellipse
+    from ball_rollout import simulate_rollout, SURFACE_COEFFICIENTS, COURSE_LIE_SURFACES, DEFAULT_LIE
+    from trajectory_decimation import simplify_trajectory, DEFAULT_TOLERANCE_M
     from weather_service import get_weather_service
+    from carry_surface import get_carry_surface
+    from terrain_model import get_terrain_service
+    from archetype_classifier import get_archetype_classifier
     
     try:
         data = request.get_json()
@@ -328,6 +415,14 @@ def analyze_shot():
         if not frames_b64:
             return jsonify({'error': 'No frames provided'}), 400
         
+        # Landing-only needs the precomputed surface; never fall back silently
+        carry_surface = None
+        if data.get('landing_only'):
+            carry_surface = get_carry_surface()
+            if carry_surface is None:
+                return jsonify({'error': 'landing_only requested but no carry surface is installed '
+                                         '(generate it with python carry_surface.py --generate)'}), 400
+        
         # Decode frames
         frames = []
         for frame_b64 in frames_b64[:15]:  # Limit to first 15 frames
@@ -344,10 +439,13 @@ def analyze_shot():
         if len(frames) < 5:
             return jsonify({'error': 'Not enough valid frames (need at least 5)'}), 400
         
-        # Track ball through frames
+        # Track ball through frames (one batched YOLO pass for all frames, on
+        # the burst's own tracking state); with motion_gating only moving
+        # blobs are searched after the first frame
+        motion_gating = bool(data.get('motion_gating', False))
+        detections = detector.detect_batch(frames, profiles=OFFLINE_PROFILES, motion_gating=motion_gating)
         trajectory_points = []
-        for i, frame in enumerate(frames):
-            center, radius = detector.detect_ball(frame)
+        for i, (center, radius) in enumerate(detections):
             if center:
                 measurement = (center[0], center[1], radius)
                 state = tracker.update(measurement)
@@ -368,8 +466,7 @@ def analyze_shot():
         # Quick calibration using detected ball size
         avg_radius = 10  # Default
         radius_samples = []
-        for i, frame in enumerate(frames[:5]):
-            center, radius = detector.detect_ball(frame)
+        for center, radius in detections[:5]:
             if radius > 0:
                 radius_samples.append(radius)
         if radius_samples:
@@ -380,8 +477,14 @@ def analyze_shot():
         # Initialize launch vector calculator
         launch_calc = LaunchVectorCalculator(calibrator=calibrator)
         
-        # Calculate launch vector from trajectory
-        launch_vector = launch_calc.calculate_launch_vector(
+        # Calculate launch vector from trajectory (fit to every tracked point
+        # unless the client asks for the first/last point estimate)
+        if data.get('launch_fit', True):
+            compute_launch_vector = launch_calc.fit_launch_vector
+        else:
+            compute_launch_vector = launch_calc.calculate_launch_vector
+        
+        launch_vector = compute_launch_vector(
             trajectory_points=trajectory_points,
             gyro_data=gyro_tilt,
             compass_heading=compass_heading,
@@ -392,6 +495,22 @@ def analyze_shot():
         launch_direction = launch_vector['direction']
         launch_angle = launch_vector['launch_angle']
         
+        # Rank archetypes by their early-flight signature (nearest neighbours),
+        # only when the client asks for the top k. Side-on the signature can't
+        # see side spin: tied archetypes come back as one entry and are all
+        # simulated
+        top_archetypes = int(data.get('top_archetypes', 0))
+        archetype_ranking = None
+        archetypes = SHOT_TYPES
+        if top_archetypes > 0:
+            archetype_ranking = get_archetype_classifier().classify_points(
+                trajectory_points, calibrator, gyro_tilt=gyro_tilt, fps=30,
+                speed_mph=estimated_speed_mph, k=top_archetypes
+            )
+            if archetype_ranking:
+                archetypes = {key: SHOT_TYPES[key] for r in archetype_ranking
+                              for key in [r['archetype']] + r['equivalent_archetypes']}
+        
         # Get weather data
         weather_service = get_weather_service()
         weather_data = weather_service.get_wind_relative_to_shot(
@@ -401,46 +520,295 @@ def analyze_shot():
         wind_speed = weather_data.get('wind_speed_mph', 0) if weather_data else 0
         wind_direction = weather_data.get('wind_direction_deg', 0) if weather_data else 0
         
-        # Initialize physics simulator
-        simulator = TrajectorySimulator()
+        relative_wind_direction = wind_direction - launch_direction  # Relative to shot
+        terrain = None
+        tee_elevation = None
         
-        # Generate trajectories for all archetypes
-        trajectories = {}
+        if carry_surface is not None:
+            # Landing points straight from the lookup surface (no RK4, so no
+            # flight points, landing velocity or spin: see the landing-only
+            # response fields in the docstring)
+            results = {}
+            for archetype_key, archetype_data in archetypes.items():
+                landing = carry_surface.query_archetype(
+                    archetype_data, estimated_speed_mph, wind_speed, relative_wind_direction
+                )
+                results[archetype_key] = {
+                    'landing_m': [landing['landing_x_m'], landing['landing_y_m']],
+                    'carry_distance_yards': landing['carry_distance_yards'],
+                    'apex_height_yards': landing['apex_height_yards'],
+                    'curve_yards': landing['curve_yards'],
+                    'flight_time_seconds': landing['flight_time_seconds']
+                }
+        else:
+            # Course DEM (if registered): keep integrating below the tee down
+            # to the lowest nearby ground, then intersect with the terrain
+            terrain = get_terrain_service().get_model(start_lat, start_lon)
+            ground_level = 0
+            if terrain is not None:
+                tee_elevation = terrain.elevation_at(start_lat, start_lon)
+                ground_level = min(terrain.lowest_relative_height(start_lat, start_lon), 0) - 1
+            
+            # Generate trajectories for all archetypes in one vectorized batch
+            # (quantized inputs, repeat requests are served from the cache)
+            results = get_trajectory_cache().simulate_archetypes(
+                archetypes,
+                launch_speed_mph=estimated_speed_mph,
+                wind_speed_mph=wind_speed,
+                wind_direction_deg=relative_wind_direction,
+                ground_level_m=ground_level
+            )
         
-        for archetype_key, archetype_data in SHOT_TYPES.items():
-            # Simulate trajectory
-            result = simulator.simulate_archetype(
-                archetype_data,
+        rollout = bool(data.get('rollout', True))
+        lie = data.get('lie', DEFAULT_LIE)
+        if lie not in SURFACE_COEFFICIENTS:
+            return jsonify({'error': f'Unknown lie: {lie}'}), 400
+        
+        # Rollout needs simulated flights; landing-only results have none
+        rollout = rollout and carry_surface is None
+        
+        # Course polygons: landing points pick each ball's rollout surface,
+        # landing/rest points and the ensemble spread get a lie
+        geometry = None
+        course = data.get('course')
+        if course:
+            geometry = golf_fetcher.get_course_geometry(
+                float(course['lat']), float(course['lon']), int(course.get('radius', 1000))
+            )
+            if len(geometry) == 0:
+                geometry = None
+        projection = get_projection(start_lat, start_lon)
+        
+        def classify_lies(xy):
+            """Lie category index of shot-frame [x, y] points (one tree query)"""
+            lat, lon = projection.shot_to_gps(xy[:, 0], xy[:, 1], launch_direction)
+            return geometry.classify_lies(lat, lon)
+        
+        course_surfaces = np.array([COURSE_LIE_SURFACES[category] for category in LIE_CATEGORIES])
+        rollout_lie = lie
+        if geometry is not None:
+            def rollout_lie(xy):
+                return course_surfaces[classify_lies(xy)]
+        
+        # Monte Carlo landing (or rest) spread from the launch measurement
+        # uncertainty; landing-only members come from the carry surface, so
+        # no RK4 batch runs on that path either
+        ensemble_size = int(data.get('ensemble_size', 0))
+        ensemble = None
+        if ensemble_size > 0:
+            # Members land on the course DEM like the archetype flights
+            ground_height = None
+            if terrain is not None:
+                def ground_height(x, y):
+                    return terrain.relative_height(x, y, start_lat, start_lon,
+                                                   launch_direction, tee_elevation)
+            
+            ensemble = simulate_landing_ensemble(
+                archetypes,
                 launch_speed_mph=estimated_speed_mph,
+                uncertainty=launch_vector.get('uncertainty'),
                 wind_speed_mph=wind_speed,
-                wind_direction_deg=wind_direction - launch_direction  # Relative to shot
+                wind_direction_deg=relative_wind_direction,
+                samples=ensemble_size,
+                include_rollout=rollout,
+                lie=rollout_lie,
+                surface=carry_surface,
+                ground_height=ground_height
             )
+        
+        # Level of detail (apex and landing are always kept)
+        simplify_tolerance = float(data.get('simplify_tolerance_m', DEFAULT_TOLERANCE_M))
+        max_points = data.get('max_points')
+        max_points = int(max_points) if max_points is not None else None
+        sample_rate = data.get('sample_rate_hz')
+        sample_rate = float(sample_rate) if sample_rate else None
+        if sample_rate is not None and sample_rate <= 0:
+            return jsonify({'error': 'sample_rate_hz must be positive'}), 400
+        
+        output_format = data.get('output_format', 'json')
+        if output_format not in ('json', 'polyline'):
+            return jsonify({'error': f'Unknown output_format: {output_format}'}), 400
+        encoded = output_format == 'polyline'
+        
+        landings = {}
+        
+        for archetype_key in archetypes:
+            result = results[archetype_key]
             
-            # Convert to GPS coordinates
-            gps_points = trajectory_to_gps(
-                result['points'],
-                start_lat,
-                start_lon,
-                launch_direction
+            landing = None
+            if terrain is not None:
+                # Vectorized trajectory/terrain intersection
+                landing = terrain.find_landing(
+                    result['points'], start_lat, start_lon, launch_direction, tee_elevation
+                )
+                if landing is None:
+                    # Ended on the lowered floor without meeting the DEM (carried
+                    # past the searched window): flagged as terrain_landing false
+                    print(f"[WARNING] {archetype_key} never met the terrain, carry is to the lowered floor")
+            if landing is not None:
+                original = np.asarray(result['points'])
+                times = np.asarray(result['times'])
+                index = landing['landing_index']
+                points = np.vstack([original[:index], landing['landing']])
+                landing_time = float(np.interp(landing['landing_step'], np.arange(len(times)), times))
+                # Landing velocity from the step that crossed the terrain
+                landing_velocity = (original[index] - original[index - 1]) / (times[index] - times[index - 1])
+                result = {
+                    **result,
+                    'points': points,
+                    'times': np.append(times[:index], landing_time),
+                    'num_points': len(points),
+                    'carry_distance_yards': landing['carry_distance_yards'],
+                    'curve_yards': landing['landing'][1] * 1.09361,
+                    'flight_time_seconds': landing_time,
+                    'landing_velocity': landing_velocity.tolist()
+                }
+            
+            results[archetype_key] = result
+            landings[archetype_key] = landing
+        
+        keys = list(archetypes)
+        landing_xy = np.array([results[k]['landing_m'] if carry_surface is not None
+                               else results[k]['points'][-1][:2] for k in keys], dtype=np.float64)
+        landing_lies = classify_lies(landing_xy) if geometry is not None else None
+        
+        # Bounce and roll all archetypes in one vectorized pass, each on the
+        # surface it landed on
+        rest = None
+        rollout_surfaces = None
+        if rollout:
+            rollout_surfaces = (course_surfaces[landing_lies] if landing_lies is not None
+                                else np.full(len(keys), lie))
+            rest = simulate_rollout(
+                landing_xy,
+                [results[k]['landing_velocity'] for k in keys],
+                [results[k]['final_spin_rpm'] for k in keys],
+                rollout_surfaces
             )
+        
+        # Lies of the rest points and the ensemble spread (one tree query for
+        # all archetypes at once)
+        lies = None
+        if geometry is not None:
+            rest_xy = rest['rest'] if rest is not None else landing_xy
+            samples = [ensemble[k] if ensemble is not None else rest_xy[i:i + 1]
+                       for i, k in enumerate(keys)]
+            
+            xy = np.vstack([rest_xy] + samples)
+            lat, lon = projection.shot_to_gps(xy[:, 0], xy[:, 1], launch_direction)
+            groups = np.repeat(np.arange(len(keys)), [len(sample) for sample in samples])
+            lies = {
+                'landing': landing_lies,
+                'rest': geometry.classify_lies(lat[:len(keys)], lon[:len(keys)]),
+                'probabilities': geometry.lie_probabilities(
+                    lat[len(keys):], lon[len(keys):], groups, len(keys)
+                )
+            }
+        
+        trajectories = {}
+        
+        for i, (archetype_key, archetype_data) in enumerate(archetypes.items()):
+            result = results[archetype_key]
+            landing = landings[archetype_key]
+            
+            flight = None
+            if carry_surface is not None:
+                # Landing-only: nothing to resample, simplify or draw
+                landing_x, landing_y = result['landing_m']
+                landing_point = trajectory_to_gps(
+                    [[landing_x, landing_y, 0]], start_lat, start_lon, launch_direction
+                )[0]
+            else:
+                if sample_rate is not None:
+                    # Resample at the client's render rate from the dense interpolant
+                    # (point times from the simulator, incl. a terrain landing)
+                    trajectory = DenseTrajectory(result['times'], result['points'])
+                    flight_points = trajectory.sample(interval=1.0 / sample_rate).tolist()
+                else:
+                    # Simplify before GPS conversion to skip most of the trig
+                    flight_points = simplify_trajectory(
+                        result['points'],
+                        tolerance_m=simplify_tolerance,
+                        max_points=max_points
+                    )
+            
+                # Convert to GPS coordinates (vectorized, in place)
+                flight = TrajectoryArray.from_points(flight_points).set_gps(
+                    start_lat,
+                    start_lon,
+                    launch_direction
+                )
+            
+                # Get landing point (last point above ground)
+                if len(flight):
+                    landing_point = [float(flight.lat[-1]), float(flight.lon[-1]), float(flight.z[-1])]
+                else:
+                    landing_point = [start_lat, start_lon, 0]
+            
+            
+            # Final rest position after bounce and roll (unknown landing-only)
+            rest_point = landing_point if flight is not None else None
+            rollout_yards = 0.0 if flight is not None else None
+            if rest is not None:
+                rest_x, rest_y = rest['rest'][i]
+                rest_point = trajectory_to_gps(
+                    [[rest_x, rest_y, result['points'][-1][2]]],
+                    start_lat, start_lon, launch_direction
+                )[0]
+                rollout_yards = float(rest['rollout_m'][i]) * 1.09361
             
-            # Get landing point (last point above ground)
-            landing_point = gps_points[-1] if gps_points else [start_lat, start_lon, 0]
+            # Create search zone (ensemble ellipse, or fixed circle)
+            if ensemble is not None:
+                search_zone = create_ellipse_search_zone(
+                    start_lat, start_lon, launch_direction,
+                    fit_landing_ellipse(ensemble[archetype_key])
+                )
+            else:
+                search_zone = create_search_zone((rest_point or landing_point)[:2], radius_meters=15)
             
-            # Create search zone
-            search_zone = create_search_zone(landing_point[:2], radius_meters=15)
+            points = {}
+            if encoded:
+                # Skip the float lists entirely: arrays straight to polylines
+                if flight is not None:
+                    points = {'points_encoded': encode_gps_points(
+                        np.column_stack([flight.lat, flight.lon, flight.z]))}
+                search_zone['perimeter_encoded'] = encode_gps_points(
+                    search_zone.pop('perimeter_points'))['path']
+            elif flight is not None:
+                points = {'points': flight.to_list(("lat", "lon", "z"))}
             
             trajectories[archetype_key] = {
                 'name': archetype_data['name'],
                 'color': archetype_data['color'],
-                'points': gps_points,
+                **points,
                 'landing_gps': {'lat': landing_point[0], 'lon': landing_point[1]},
+                'rest_gps': {'lat': rest_point[0], 'lon': rest_point[1]} if rest_point else None,
                 'carry_distance_yards': result['carry_distance_yards'],
+                'rollout_yards': rollout_yards,
+                'total_distance_yards': (result['carry_distance_yards'] + rollout_yards
+                                         if rollout_yards is not None else None),
                 'apex_height_yards': result['apex_height_yards'],
                 'curve_yards': result['curve_yards'],
                 'flight_time_seconds': result['flight_time_seconds'],
                 'search_zone': search_zone
             }
+            
+            if rollout_surfaces is not None:
+                trajectories[archetype_key]['rollout_surface'] = str(rollout_surfaces[i])
+            if lies is not None:
+                trajectories[archetype_key]['landing_lie'] = LIE_CATEGORIES[lies['landing'][i]]
+                trajectories[archetype_key]['rest_lie'] = (LIE_CATEGORIES[lies['rest'][i]]
+                                                           if rest_point else None)
+                trajectories[archetype_key]['lie_probabilities'] = {
+                    category: round(float(p), 3)
+                    for category, p in zip(LIE_CATEGORIES, lies['probabilities'][i]) if p > 0
+                }
+            
+            if terrain is not None:
+                trajectories[archetype_key]['terrain_landing'] = landing is not None
+            if landing is not None:
+                trajectories[archetype_key]['landing_elevation_m'] = landing['ground_elevation_m']
+                trajectories[archetype_key]['elevation_change_m'] = landing['elevation_change_m']
         
         # Return complete analysis
         return jsonify({
@@ -452,6 +820,11 @@ def analyze_shot():
             'trajectory_points_detected': len(trajectory_points),
             'trajectories': trajectories,
             'weather': weather_data,
+            'tee_elevation_m': tee_elevation,
+            'archetype_ranking': archetype_ranking,
+            'lie': lie if rest is not None and geometry is None else None,
+            'landing_only': carry_surface is not None,
+            'encoding': encoding_info() if encoded else None,
             'note': 'Speed calculation is estimated - needs calibration for accuracy'
         })
         
@@ -607,6 +980,130 @@ def get_course_details():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/courses/locate', methods=['POST'])
+def locate_on_course():
+    """
+    Look up course features at many positions (landing points, players).
+    
+    Uses the course's cached spatial index, so repeated lookups on the same
+    course don't refetch or rescan features.
+    
+    Expected JSON:
+        {
+            "lat": course center latitude (required),
+            "lon": course center longitude (required),
+            "radius": search radius in meters (default: 1000),
+            "points": [[lat, lon], ...] (required)
+        }
+    
+    Returns:
+        Per point: feature kinds containing it and distance to the nearest
+        green, fairway, bunker and water
+    """
+    try:
+        data = request.get_json() or {}
+        lat = data.get('lat')
+        lon = data.get('lon')
+        radius = int(data.get('radius', 1000))
+        points = data.get('points')
+        
+        if lat is None or lon is None or not points:
+            return jsonify({'error': 'lat, lon and points are required'}), 400
+        
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        geometry = golf_fetcher.get_course_geometry(float(lat), float(lon), radius)
+        
+        kinds = geometry.kinds_at(points[:, 0], points[:, 1])
+        nearest = {
+            kind: geometry.nearest(points[:, 0], points[:, 1], kind=kind)
+            for kind in ('greens', 'fairways', 'bunkers', 'water')
+        }
+        
+        results = []
+        for i, (point_lat, point_lon) in enumerate(points):
+            result = {
+                'lat': float(point_lat),
+                'lon': float(point_lon),
+                'inside': [kind for kind, hit in zip(POLYGON_KINDS, kinds[i]) if hit],
+                'nearest': {}
+            }
+            for kind, (polygon, distance) in nearest.items():
+                if polygon[i] >= 0:
+                    result['nearest'][kind] = {
+                        'distance_m': round(float(distance[i]), 1),
+                        'ref': geometry.feature(polygon[i]).get('ref')
+                    }
+            results.append(result)
+        
+        return jsonify({
+            'success': True,
+            'course': geometry.summary(),
+            'points': results
+        })
+        
+    except Exception as e:
+        print(f"Error locating points on course: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/courses/current_hole', methods=['GET'])
+def get_current_hole():
+    """
+    Snap a player's GPS fix to the hole they are most likely playing.
+    
+    Cheap enough to call on every location update: the course's hole paths
+    are compiled into a segment index once and cached.
+    
+    Query params:
+        lat: Player latitude (required)
+        lon: Player longitude (required)
+        course_lat: Latitude of course center (required)
+        course_lon: Longitude of course center (required)
+        radius: Course search radius in meters (default: 1000)
+        previous_hole: Last known hole; nearby holes other than it and the
+                       next one need to be clearly closer to take over
+    
+    Returns:
+        Hole number, par, and distances along the hole (yards)
+    """
+    try:
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        course_lat = request.args.get('course_lat', type=float)
+        course_lon = request.args.get('course_lon', type=float)
+        radius = request.args.get('radius', 1000, type=int)
+        previous_hole = request.args.get('previous_hole', type=int)
+        
+        if None in (lat, lon, course_lat, course_lon):
+            return jsonify({'error': 'lat, lon, course_lat and course_lon are required'}), 400
+        
+        geometry = golf_fetcher.get_course_geometry(course_lat, course_lon, radius)
+        snapped = geometry.locate_hole(lat, lon, previous_hole=previous_hole)
+        
+        hole_index = int(snapped['hole_index'][0])
+        if hole_index < 0:
+            return jsonify({
+                'success': True,
+                'hole': None,
+                'offset_yards': round(float(snapped['offset_m'][0]) * 1.09361, 1)
+            })
+        
+        hole = geometry.hole_feature(hole_index)
+        return jsonify({
+            'success': True,
+            'hole': int(snapped['hole'][0]),
+            'par': hole.get('par'),
+            'name': hole.get('name'),
+            'distance_from_tee_yards': round(float(snapped['distance_along_m'][0]) * 1.09361, 1),
+            'distance_to_green_yards': round(float(snapped['distance_to_green_m'][0]) * 1.09361, 1),
+            'offset_yards': round(float(snapped['offset_m'][0]) * 1.09361, 1)
+        })
+        
+    except Exception as e:
+        print(f"Error detecting current hole: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("LinksAI API Server")
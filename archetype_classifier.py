@@ -0,0 +1,429 @@
+"""
+Nearest-Neighbour Archetype Classifier
+
+Ranks shot archetypes from the first tracked frames of a flight:
+1. Signature: chord angles (elevation, optionally azimuth) from the launch
+   point to the ball at fixed early times, plus ball speed when known
+2. Index: one signature per archetype/speed variant (from the lookup tables
+   or simulated on demand), searched with a KD-tree
+3. Result: the k most likely archetypes with normalized weights
+
+Side-on (no lateral channel) the signature can't see side spin, so
+archetypes whose elevation signatures match within SIDE_ON_TIE_DEG (e.g. a
+fade and the mirrored draw) are reported as one entry listing all of them.
+
+Chord angles do not depend on the camera scale, so the same index serves
+every calibration. Queries take well under a millisecond.
+"""
+
+import math
+import threading
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Times after launch at which the signature is sampled (seconds)
+SIGNATURE_TIMES = (0.1, 0.2, 0.3, 0.4)
+
+# Feature scales: differences of this size count as one unit of distance
+ELEVATION_SCALE_DEG = 0.5
+AZIMUTH_SCALE_DEG = 0.25
+SPEED_SCALE_MPH = 8.0
+
+# Archetypes whose elevation signatures never differ by more than this are
+# indistinguishable without azimuth (measured: such pairs differ by ~0.02°,
+# every other pair by over 1°)
+SIDE_ON_TIE_DEG = 0.25
+
+# Ball speeds simulated per archetype when not building from lookup tables
+DEFAULT_SPEEDS_MPH = tuple(range(80, 181, 10))
+
+
+class _BruteForceIndex:
+    """Exhaustive nearest-neighbour search with the cKDTree query interface."""
+
+    def __init__(self, data):
+        self.data = np.asarray(data, dtype=np.float64)
+
+    def query(self, x, k=1):
+        distances = np.sqrt(((self.data - x) ** 2).sum(axis=1))
+        idx = np.argsort(distances)[:k]
+        return distances[idx], idx
+
+
+def chord_angles(positions):
+    """
+    Elevation and azimuth of the chord from the launch point to each position.
+
+    Args:
+        positions: (..., 3) array of [forward, lateral, up] in meters
+
+    Returns:
+        (elevation_deg, azimuth_deg), each of shape (...)
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    forward = np.maximum(positions[..., 0], 1e-9)
+    elevation = np.degrees(np.arctan2(positions[..., 2], forward))
+    azimuth = np.degrees(np.arctan2(positions[..., 1], forward))
+    return elevation, azimuth
+
+
+class ArchetypeClassifier:
+    """
+    KD-tree over early-flight signatures of archetype/speed variants.
+
+    Falls back to an exhaustive NumPy search without SciPy (the index holds
+    at most a few hundred variants, so this stays well under a millisecond).
+    """
+
+    def __init__(self, archetypes, variants, speeds_mph, positions, times=SIGNATURE_TIMES):
+        """
+        Args:
+            archetypes: (M,) archetype key per variant
+            variants: (M,) variant name per variant (e.g. "100pct", "140mph")
+            speeds_mph: (M,) launch speed per variant
+            positions: (M, T, 3) positions [forward, lateral, up] at times
+            times: (T,) signature times in seconds
+        """
+        self.archetypes = list(archetypes)
+        self.variants = list(variants)
+        self.speeds_mph = np.asarray(speeds_mph, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.shape != (len(self.archetypes), len(self.times), 3):
+            raise ValueError(f"Expected positions of shape "
+                             f"{(len(self.archetypes), len(self.times), 3)}, got {positions.shape}")
+
+        self.elevation, self.azimuth = chord_angles(positions)
+        self.side_on_equivalents = self._side_on_equivalents()
+
+        self._indexes = {}  # (num_times, use_azimuth, use_speed) -> index
+        self._lock = threading.Lock()
+
+    def _side_on_equivalents(self):
+        """
+        Archetypes that share an elevation signature (variants matched by name).
+        
+        Returns:
+            Dict of archetype -> list of archetypes tied with it side-on
+        """
+        rows = {}
+        for i, (archetype, variant) in enumerate(zip(self.archetypes, self.variants)):
+            rows.setdefault(archetype, {})[variant] = i
+        
+        keys = list(rows)
+        equivalents = {archetype: [] for archetype in keys}
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                common = sorted(rows[a].keys() & rows[b].keys())
+                if not common:
+                    continue
+                difference = (self.elevation[[rows[a][v] for v in common]] -
+                              self.elevation[[rows[b][v] for v in common]])
+                if np.abs(difference).max() <= SIDE_ON_TIE_DEG:
+                    equivalents[a].append(b)
+                    equivalents[b].append(a)
+        return equivalents
+    
+    @classmethod
+    def from_lookup_tables(cls, tables, times=SIGNATURE_TIMES):
+        """
+        Build from archetype lookup tables.
+
+        Args:
+            tables: BinaryArchetypeTables, or the JSON table dict
+            times: Signature times in seconds
+
+        Returns:
+            ArchetypeClassifier over every archetype/speed variant
+        """
+        if isinstance(tables, dict):
+            entries = [
+                (archetype, variant, data["speed_mph"],
+                 [[p["x"], p["y"], p["z"], p["t"]] for p in data["points"]])
+                for archetype, entry in tables["archetypes"].items()
+                for variant, data in entry["variants"].items()
+            ]
+        else:
+            entries = [
+                (archetype, variant, tables.variant_info(archetype, variant)["speed_mph"],
+                 tables.points(archetype, variant))
+                for archetype in tables.archetypes
+                for variant in tables.variants(archetype)
+            ]
+
+        archetypes, variants, speeds, positions = [], [], [], []
+        for archetype, variant, speed, points in entries:
+            # Table points are [x forward, y up, z lateral, t]
+            points = np.asarray(points, dtype=np.float64)
+            sampled = [np.interp(times, points[:, 3], points[:, axis]) for axis in (0, 2, 1)]
+
+            archetypes.append(archetype)
+            variants.append(variant)
+            speeds.append(speed)
+            positions.append(np.stack(sampled, axis=-1))
+
+        return cls(archetypes, variants, speeds, positions, times)
+
+    @classmethod
+    def from_simulator(cls, archetypes, speeds_mph=DEFAULT_SPEEDS_MPH,
+                       simulator=None, times=SIGNATURE_TIMES):
+        """
+        Build by simulating the early flight of each archetype at each speed.
+
+        Args:
+            archetypes: Dict of key -> archetype data (e.g. SHOT_TYPES)
+            speeds_mph: Launch speeds to index per archetype
+            simulator: TrajectorySimulator (default: new instance)
+            times: Signature times in seconds
+
+        Returns:
+            ArchetypeClassifier with variants named like "140mph"
+        """
+        from trajectory_physics import TrajectorySimulator
+
+        simulator = simulator or TrajectorySimulator()
+        keys = [key for key in archetypes for _ in speeds_mph]
+        speeds = np.tile(np.asarray(speeds_mph, dtype=np.float64), len(archetypes))
+
+        positions = simulator.positions_at_times(
+            times, speeds,
+            [archetypes[k]["launch_angle"] for k in keys],
+            [archetypes[k]["backspin_rpm"] for k in keys],
+            [archetypes[k]["side_spin_axis"] for k in keys]
+        )
+
+        variants = [f"{speed:g}mph" for speed in speeds]
+        return cls(keys, variants, speeds, positions, times)
+
+    def _features(self, elevation, azimuth, speeds, use_azimuth, use_speed):
+        """Scale signature components into one feature matrix."""
+        features = [elevation / ELEVATION_SCALE_DEG]
+        if use_azimuth:
+            features.append(azimuth / AZIMUTH_SCALE_DEG)
+        if use_speed:
+            features.append(np.asarray(speeds, dtype=np.float64).reshape(-1, 1) / SPEED_SCALE_MPH)
+        return np.hstack(features)
+
+    def _index(self, num_times, use_azimuth, use_speed):
+        """Get (building on first use) the index over the first num_times samples."""
+        key = (num_times, use_azimuth, use_speed)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                features = self._features(
+                    self.elevation[:, :num_times], self.azimuth[:, :num_times],
+                    self.speeds_mph, use_azimuth, use_speed
+                )
+                index = cKDTree(features) if SCIPY_AVAILABLE else _BruteForceIndex(features)
+                self._indexes[key] = index
+        return index
+
+    def classify(self, times, positions, speed_mph=None, k=3, neighbors=8):
+        """
+        Rank archetypes for an observed early flight.
+
+        Args:
+            times: (T,) seconds since launch of each observed position
+            positions: (T, 3) observed [forward, lateral, up] relative to the
+                launch point (lateral may be NaN when the view can't see it);
+                only the chord angles are used, so any consistent scale works
+            speed_mph: Measured launch speed (optional)
+            k: Number of archetypes to return
+            neighbors: Variants retrieved before grouping by archetype
+                (widened automatically to reach k archetypes)
+
+        Returns:
+            List of up to k dicts with archetype, weight (sums to 1 over the
+            returned archetypes), distance, closest variant and
+            equivalent_archetypes, best first. Without azimuth, archetypes
+            tied side-on are one entry: the best-scoring one names it, the
+            others are listed in equivalent_archetypes, weights summed
+        """
+        times = np.asarray(times, dtype=np.float64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if len(times) != len(positions) or len(times) < 2:
+            raise ValueError("Need at least two observed positions with matching times")
+
+        # Signature samples inside the observed window (at least one)
+        num_times = int(np.searchsorted(self.times, times[-1], side="right"))
+        if num_times == 0:
+            raise ValueError(f"Observed flight too short: need {self.times[0]:.2f}s, "
+                             f"got {times[-1]:.2f}s")
+
+        sampled = np.stack([np.interp(self.times[:num_times], times, positions[:, axis])
+                            for axis in range(3)], axis=-1)
+        elevation, azimuth = chord_angles(sampled)
+
+        use_azimuth = bool(np.all(np.isfinite(azimuth)))
+        use_speed = speed_mph is not None
+        query = self._features(elevation[None, :], azimuth[None, :],
+                               [speed_mph] if use_speed else None, use_azimuth, use_speed)[0]
+
+        # Widen the search until k distinct archetypes are among the neighbours
+        index = self._index(num_times, use_azimuth, use_speed)
+        neighbors = min(max(neighbors, k), len(self.archetypes))
+        while True:
+            distances, idx = index.query(query, k=neighbors)
+            distances, idx = np.atleast_1d(distances), np.atleast_1d(idx)
+            found = len({self.archetypes[i] for i in idx})
+            if found >= k or neighbors == len(self.archetypes):
+                break
+            neighbors = min(2 * neighbors, len(self.archetypes))
+
+        # Gaussian kernel, shifted so the nearest variant never underflows
+        kernel = np.exp(-0.5 * (distances ** 2 - distances[0] ** 2))
+
+        ranked = {}
+        for distance, i, weight in zip(distances, idx, kernel):
+            archetype = self.archetypes[i]
+            if archetype not in ranked:
+                ranked[archetype] = {"archetype": archetype, "weight": 0.0,
+                                     "distance": float(distance), "variant": self.variants[i],
+                                     "equivalent_archetypes": []}
+            ranked[archetype]["weight"] += float(weight)
+
+        results = sorted(ranked.values(), key=lambda r: -r["weight"])
+        if not use_azimuth:
+            results = self._merge_side_on_ties(results)
+        results = results[:k]
+        total = sum(r["weight"] for r in results)
+        for r in results:
+            r["weight"] /= total
+        return results
+
+    def _merge_side_on_ties(self, results):
+        """Fold archetypes tied side-on into the best-ranked one of each group."""
+        merged = {}
+        for result in results:
+            group = self.side_on_equivalents.get(result["archetype"], [])
+            kept = next((merged[a] for a in group if a in merged), None)
+            if kept is None:
+                merged[result["archetype"]] = result
+            else:
+                kept["weight"] += result["weight"]
+                kept["equivalent_archetypes"].append(result["archetype"])
+        
+        # Tied members missing from the neighbours still belong to the entry
+        for result in merged.values():
+            for archetype in self.side_on_equivalents.get(result["archetype"], []):
+                if archetype not in result["equivalent_archetypes"]:
+                    result["equivalent_archetypes"].append(archetype)
+        
+        return sorted(merged.values(), key=lambda r: -r["weight"])
+    
+    def classify_points(self, trajectory_points, calibrator, gyro_tilt=0, fps=30,
+                        speed_mph=None, k=3):
+        """
+        Rank archetypes from tracked pixel points (side-on view, as in
+        LaunchVectorCalculator.fit_launch_vector).
+
+        Args:
+            trajectory_points: List of dicts with 'x', 'y', 'timestamp' (or 'frame')
+            calibrator: Calibrated HomographyCalibrator
+            gyro_tilt: Phone roll in degrees
+            fps: Frames per second (if timestamps not available)
+            speed_mph: Measured launch speed (optional)
+            k: Number of archetypes to return
+
+        Returns:
+            classify() result, or [] if the points can't be used
+        """
+        if len(trajectory_points) < 2 or calibrator is None or not calibrator.is_calibrated():
+            return []
+
+        first = trajectory_points[0]
+        if all('timestamp' in p for p in trajectory_points):
+            times = np.array([p['timestamp'] - first['timestamp'] for p in trajectory_points])
+        else:
+            times = np.array([(p.get('frame', i) - first.get('frame', 0)) / fps
+                              for i, p in enumerate(trajectory_points)])
+
+        plane = np.array([calibrator.pixel_to_meters((p['x'], p['y'])) for p in trajectory_points],
+                         dtype=np.float64)
+        plane -= plane[0]
+
+        # Undo the camera roll; image y points down
+        heading = 1.0 if plane[-1, 0] >= 0 else -1.0
+        along, up = heading * plane[:, 0], -plane[:, 1]
+        tilt = math.radians(gyro_tilt or 0)
+        forward = along * math.cos(tilt) - up * math.sin(tilt)
+        height = along * math.sin(tilt) + up * math.cos(tilt)
+
+        positions = np.column_stack([forward, np.full(len(times), np.nan), height])
+
+        try:
+            return self.classify(times, positions, speed_mph=speed_mph, k=k)
+        except ValueError:
+            return []
+
+
+# Singleton instance
+_archetype_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_archetype_classifier():
+    """Get or create the classifier over SHOT_TYPES (the archetypes the API simulates)"""
+    global _archetype_classifier
+    with _classifier_lock:
+        if _archetype_classifier is None:
+            from shot_archetypes import SHOT_TYPES
+            _archetype_classifier = ArchetypeClassifier.from_simulator(SHOT_TYPES)
+    return _archetype_classifier
+
+
+if __name__ == "__main__":
+    """Test the classifier on simulated early flights"""
+    import time
+    from archetype_table_format import load_binary_tables
+    from trajectory_physics import TrajectorySimulator
+    from shot_archetypes import SHOT_TYPES
+
+    print("Archetype Classifier Test")
+    print("=" * 60)
+    print(f"SciPy KD-tree: {SCIPY_AVAILABLE}")
+
+    tables = load_binary_tables("models/archetype_lookup_tables.bin")
+    if tables is not None:
+        table_classifier = ArchetypeClassifier.from_lookup_tables(tables)
+        print(f"Lookup table index: {len(table_classifier.archetypes)} variants")
+
+    start_time = time.perf_counter()
+    classifier = get_archetype_classifier()
+    print(f"SHOT_TYPES index: {len(classifier.archetypes)} variants "
+          f"({(time.perf_counter() - start_time) * 1000:.1f} ms)")
+
+    # Observe 12 frames at 30fps of each archetype, side-on (no lateral)
+    rng = np.random.default_rng(0)
+    frame_times = np.arange(12) / 30
+    simulator = TrajectorySimulator()
+    correct = 0
+
+    for key, archetype in SHOT_TYPES.items():
+        observed = simulator.positions_at_times(
+            frame_times, 143, archetype["launch_angle"],
+            archetype["backspin_rpm"], archetype["side_spin_axis"]
+        )[0]
+        observed[:, 1] = np.nan
+        observed[1:, [0, 2]] += rng.normal(0, 0.05, (len(frame_times) - 1, 2))
+
+        start_time = time.perf_counter()
+        ranked = classifier.classify(frame_times, observed, speed_mph=143, k=3)
+        elapsed = time.perf_counter() - start_time
+
+        correct += key in [ranked[0]["archetype"]] + ranked[0]["equivalent_archetypes"]
+        top = ", ".join("|".join([r["archetype"]] + r["equivalent_archetypes"]) + f" {r['weight']:.2f}"
+                        for r in ranked)
+        print(f"\n{key:15s} -> {top}  ({elapsed * 1e6:.0f} µs)")
+
+    ties = sorted({tuple(sorted([a] + b)) for a, b in classifier.side_on_equivalents.items() if b})
+    print(f"\nTied side-on (side spin only): {', '.join(' = '.join(t) for t in ties)}")
+    print(f"Top-1 incl. tied archetypes (side-on, lateral unobserved): {correct}/{len(SHOT_TYPES)}")
+    print("\n" + "=" * 60)
@@ -0,0 +1,222 @@
+"""
+Binary Archetype Lookup Table Format
+
+Compact, memory-mappable alternative to archetype_lookup_tables.json:
+1. Fixed header: magic, format version, index length
+2. JSON index: per archetype/variant metadata, row offset and row count
+3. Data block: float32 rows of [x, y, z, t], 16-byte aligned
+
+Readers map the data block with numpy.memmap and slice variants lazily, so
+any number of server workers share one copy of the table through the page
+cache and load it in microseconds.
+"""
+
+import json
+import struct
+from pathlib import Path
+import numpy as np
+
+
+MAGIC = b"LKAT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sII")  # magic, version, index length in bytes
+ALIGNMENT = 16
+POINT_FIELDS = ("x", "y", "z", "t")
+
+
+def encode_binary_tables(tables):
+    """
+    Encode lookup tables (generate_all_lookup_tables format) to bytes.
+
+    Args:
+        tables: Dict with "archetypes" -> name -> "variants" -> variant dicts
+
+    Returns:
+        bytes of the complete binary file
+    """
+    index = {key: value for key, value in tables.items() if key != "archetypes"}
+    index["fields"] = list(POINT_FIELDS)
+    index["archetypes"] = {}
+
+    blocks = []
+    offset = 0
+    for name, archetype in tables["archetypes"].items():
+        entry = {key: value for key, value in archetype.items() if key != "variants"}
+        entry["variants"] = {}
+
+        for variant_name, variant in archetype["variants"].items():
+            points = np.array(
+                [[p[field] for field in POINT_FIELDS] for p in variant["points"]],
+                dtype="<f4"
+            ).reshape(-1, len(POINT_FIELDS))
+            blocks.append(points)
+
+            meta = {key: value for key, value in variant.items() if key != "points"}
+            meta["offset"] = offset
+            meta["count"] = len(points)
+            entry["variants"][variant_name] = meta
+            offset += len(points)
+
+        index["archetypes"][name] = entry
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    header_size = HEADER.size + len(index_bytes)
+    padding = (-header_size) % ALIGNMENT
+
+    data = np.concatenate(blocks) if blocks else np.empty((0, len(POINT_FIELDS)), dtype="<f4")
+    return (HEADER.pack(MAGIC, FORMAT_VERSION, len(index_bytes)) + index_bytes
+            + b"\0" * padding + data.tobytes())
+
+
+def write_binary_tables(tables, path):
+    """
+    Write lookup tables in the binary format.
+
+    Args:
+        tables: Dict in generate_all_lookup_tables format
+        path: Output file path
+    """
+    Path(path).write_bytes(encode_binary_tables(tables))
+
+
+class BinaryArchetypeTables:
+    """
+    Read-only, memory-mapped view of a binary lookup table file.
+
+    Only the JSON index is parsed on open; point arrays are float32 views
+    into the mapped file and are paged in on first access.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Path to a file written by write_binary_tables
+        """
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            magic, version, index_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Not a binary archetype table file: {self.path}")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported table format version {version} in {self.path}")
+            self.index = json.loads(f.read(index_length).decode("utf-8"))
+
+        header_size = HEADER.size + index_length
+        data_offset = header_size + (-header_size) % ALIGNMENT
+        fields = len(self.index["fields"])
+        rows = (self.path.stat().st_size - data_offset) // (4 * fields)
+
+        if rows:
+            self._data = np.memmap(self.path, dtype="<f4", mode="r",
+                                   offset=data_offset, shape=(rows, fields))
+        else:
+            self._data = np.empty((0, fields), dtype="<f4")
+
+    @property
+    def archetypes(self):
+        """Archetype names in file order."""
+        return list(self.index["archetypes"])
+
+    def variants(self, archetype):
+        """Variant names (e.g. "100pct") for an archetype."""
+        return list(self.index["archetypes"][archetype]["variants"])
+
+    def archetype_info(self, archetype):
+        """Archetype metadata (display name, spin, launch angle, ...) without variants."""
+        entry = self.index["archetypes"][archetype]
+        return {key: value for key, value in entry.items() if key != "variants"}
+
+    def variant_info(self, archetype, variant):
+        """Variant summary (carry, apex, curve, ...) including offset and count."""
+        return self.index["archetypes"][archetype]["variants"][variant]
+
+    def points(self, archetype, variant):
+        """
+        Trajectory points of one variant.
+
+        Returns:
+            (N, 4) read-only float32 array of [x, y, z, t] (no copy)
+        """
+        meta = self.variant_info(archetype, variant)
+        return self._data[meta["offset"]:meta["offset"] + meta["count"]]
+
+    def to_dict(self):
+        """Expand back to the JSON table structure (parses every variant)."""
+        tables = {key: value for key, value in self.index.items()
+                  if key not in ("archetypes", "fields")}
+        tables["archetypes"] = {}
+
+        for name in self.archetypes:
+            entry = self.archetype_info(name)
+            entry["variants"] = {}
+            for variant in self.variants(name):
+                meta = {key: value for key, value in self.variant_info(name, variant).items()
+                        if key not in ("offset", "count")}
+                meta["points"] = [
+                    dict(zip(self.index["fields"], (round(float(v), 3) for v in row)))
+                    for row in self.points(name, variant)
+                ]
+                entry["variants"][variant] = meta
+            tables["archetypes"][name] = entry
+
+        return tables
+
+
+def load_binary_tables(path):
+    """
+    Open a binary lookup table file.
+
+    Returns:
+        BinaryArchetypeTables, or None if the file does not exist
+    """
+    path = Path(path)
+    if not path.exists():
+        print(f"[INFO] No binary lookup tables at {path}")
+        return None
+    return BinaryArchetypeTables(path)
+
+
+if __name__ == "__main__":
+    """Convert the JSON lookup tables and compare load times"""
+    import argparse
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Convert archetype lookup tables to binary")
+    parser.add_argument("--json", default="models/archetype_lookup_tables.json", help="Input JSON")
+    parser.add_argument("--output", help="Output file (default: a temporary file, so the "
+                                          "committed models/archetype_lookup_tables.bin, written "
+                                          "by generate_archetype_tables.py, is left alone)")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.output is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        args.output = str(Path(temp_dir.name) / "archetype_lookup_tables.bin")
+
+    print("Binary Archetype Table Test")
+    print("=" * 60)
+
+    start_time = time.perf_counter()
+    with open(args.json, "r") as f:
+        tables = json.load(f)
+    json_time = time.perf_counter() - start_time
+
+    write_binary_tables(tables, args.output)
+
+    start_time = time.perf_counter()
+    binary = BinaryArchetypeTables(args.output)
+    points = binary.points("straight", "100pct")
+    binary_time = time.perf_counter() - start_time
+
+    print(f"\nJSON:   {Path(args.json).stat().st_size / 1024:.1f} KB, load {json_time * 1000:.2f} ms")
+    print(f"Binary: {Path(args.output).stat().st_size / 1024:.1f} KB, "
+          f"open + first variant {binary_time * 1000:.2f} ms")
+    print(f"straight/100pct: {len(points)} points, landing x = {points[-1, 0]:.1f} m")
+
+    if temp_dir is not None:
+        del binary, points  # Release the memory map before removing the file
+        temp_dir.cleanup()
+
+    print("\n" + "=" * 60)
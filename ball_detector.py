@@ -6,12 +6,15 @@ Simplified: detect any circular object (any color) and report the first hit.
 import cv2
 import numpy as np
 from config import MIN_BALL_RADIUS
+from frame_preprocessor import FramePreprocessor, PREPROCESSING_PROFILES, DEFAULT_PROFILE
+from motion_gate import MotionGate
 
 
 class BallDetector:
     """Detects circular objects in a frame using geometry only (color-agnostic)."""
 
-    def __init__(self, use_preprocessing=True, param1=45, param2=18, min_radius=2, max_radius=60):
+    def __init__(self, use_preprocessing=True, param1=45, param2=18, min_radius=2, max_radius=60,
+                 profile=DEFAULT_PROFILE, motion_gating=False):
         """
         Initialize ball detector with configurable parameters.
         
@@ -21,19 +24,34 @@ class BallDetector:
             param2: Hough accumulator threshold (lower = more sensitive)
             min_radius: Minimum ball radius in pixels
             max_radius: Maximum ball radius in pixels
+            profile: Preprocessing profile when use_preprocessing is on
+                ("fast", "balanced" or "quality", see frame_preprocessor)
+            motion_gating: Search only crops around moving blobs (see
+                motion_gate); static circles are ignored, so call reset()
+                at the start of each shot
         """
+        if profile not in PREPROCESSING_PROFILES:
+            raise ValueError(f"Unknown preprocessing profile: {profile}. "
+                             f"Available: {', '.join(PREPROCESSING_PROFILES)}")
         self.use_preprocessing = use_preprocessing
+        self.profile = profile
         self.min_radius = max(1, min(min_radius, 100))  # Validate 1-100
         self.max_radius = max(self.min_radius + 1, min(max_radius, 200))  # Validate
         self.param1 = max(10, min(param1, 200))  # Validate 10-200
         self.param2 = max(5, min(param2, 100))   # Validate 5-100
         
-        # CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        # CLAHE (Contrast Limited Adaptive Histogram Equalization) and filters,
+        # created once, writing into reused per-resolution buffers
+        self.preprocessor = FramePreprocessor()
+        self.clahe = self.preprocessor.clahe
+        
+        # Background model for the current tracking session
+        self.motion_gate = MotionGate() if motion_gating else None
         
         # Log configuration
         print(f"BallDetector initialized: param1={self.param1}, param2={self.param2}, "
-              f"radius={self.min_radius}-{self.max_radius}, preprocessing={use_preprocessing}")
+              f"radius={self.min_radius}-{self.max_radius}, preprocessing={use_preprocessing}, "
+              f"profile={profile}, motion_gating={motion_gating}")
     
     def preprocess(self, frame):
         """
@@ -43,25 +61,16 @@ class BallDetector:
             frame: BGR image
             
         Returns:
-            Preprocessed grayscale image
+            Preprocessed grayscale image (reused buffer, overwritten next frame)
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
         if not self.use_preprocessing:
-            return cv2.GaussianBlur(gray, (7, 7), 1.5)
-        
-        # Apply CLAHE to improve contrast in varying lighting
-        gray = self.clahe.apply(gray)
+            # Grayscale and Gaussian blur only
+            return self.preprocessor.blur(frame, (7, 7), 1.5)
         
-        # Bilateral filter: edge-preserving noise reduction
-        # Keeps edges sharp while smoothing flat regions
-        gray = cv2.bilateralFilter(gray, d=5, sigmaColor=75, sigmaSpace=75)
-        
-        # Gaussian blur to reduce high-frequency noise
-        gray = cv2.GaussianBlur(gray, (5, 5), 1.0)
-        
-        return gray
+        # Grayscale, then contrast enhancement and denoising per profile
+        # ("quality": CLAHE for varying lighting, bilateral filter for
+        # edge-preserving noise reduction, Gaussian blur for high-frequency noise)
+        return self.preprocessor.preprocess(frame, self.profile)
     
     def calculate_confidence(self, frame, center, radius):
         """
@@ -138,8 +147,48 @@ class BallDetector:
             If return_all=False: (center, radius) or (None, 0)
             If return_all=True: List of (center, radius, confidence) tuples
         """
+        regions = self.motion_gate.update(frame) if self.motion_gate else None
+        if regions is None:
+            # No motion model (yet): search the whole frame
+            detections = self._find_circles(frame, frame, 0, 0)
+        else:
+            # Only moving blobs; nothing moving means nothing to search
+            detections = []
+            for x, y, w, h in regions:
+                detections.extend(self._find_circles(frame, frame[y:y+h, x:x+w], x, y))
+        
+        if return_all:
+            # Sort by confidence, return all
+            detections.sort(key=lambda d: d[2], reverse=True)
+            return detections
+        
+        # Return best detection above confidence threshold
+        if detections:
+            detections.sort(key=lambda d: d[2], reverse=True)
+            best = detections[0]
+            
+            # Require minimum confidence of 0.2
+            if best[2] >= 0.2:
+                center, radius, confidence = best
+                print(f"Circle found at {center} radius {radius} (confidence: {confidence:.2f})")
+                return center, radius
+        
+        return None, 0
+    
+    def _find_circles(self, frame, search_frame, offset_x, offset_y):
+        """
+        Hough passes (primary, then relaxed backup) over a frame or crop.
+        
+        Args:
+            frame: Full BGR frame (for confidence scoring)
+            search_frame: Region to search (frame itself or a view into it)
+            offset_x, offset_y: Position of search_frame within frame
+            
+        Returns:
+            List of ((x, y), radius, confidence) in frame coordinates
+        """
         # Preprocess frame
-        gray = self.preprocess(frame)
+        gray = self.preprocess(search_frame)
 
         # Primary detection with configured parameters
         circles = cv2.HoughCircles(
@@ -159,6 +208,7 @@ class BallDetector:
             for (x, y, r) in np.round(circles[0, :]).astype("int"):
                 if r < self.min_radius:
                     continue
+                x, y = x + offset_x, y + offset_y
                     
                 # Calculate confidence
                 confidence = self.calculate_confidence(frame, (int(x), int(y)), r)
@@ -181,28 +231,18 @@ class BallDetector:
                 for (x, y, r) in np.round(backup_circles[0, :]).astype("int"):
                     if r < self.min_radius:
                         continue
+                    x, y = x + offset_x, y + offset_y
                     confidence = self.calculate_confidence(frame, (int(x), int(y)), r)
                     # Only add if not already detected
                     if not any(abs(d[0][0] - x) < 10 and abs(d[0][1] - y) < 10 for d in detections):
                         detections.append(((int(x), int(y)), int(r), confidence * 0.8))  # Penalize backup
         
-        if return_all:
-            # Sort by confidence, return all
-            detections.sort(key=lambda d: d[2], reverse=True)
-            return detections
-        
-        # Return best detection above confidence threshold
-        if detections:
-            detections.sort(key=lambda d: d[2], reverse=True)
-            best = detections[0]
-            
-            # Require minimum confidence of 0.2
-            if best[2] >= 0.2:
-                center, radius, confidence = best
-                print(f"Circle found at {center} radius {radius} (confidence: {confidence:.2f})")
-                return center, radius
-        
-        return None, 0
+        return detections
+    
+    def reset(self):
+        """Start a new tracking session (forget the motion background)."""
+        if self.motion_gate:
+            self.motion_gate.reset()
 
     def draw_ball(self, frame, center, radius):
         """Draw a circle on the frame (useful for debug images)."""
@@ -8,6 +8,7 @@ import numpy as np
 from typing import List, Tuple, Dict, Optional
 from trajectory_predictor import TrajectoryPredictor
 from ball_detector import BallDetector
+from trajectory_array import TrajectoryArray, PIXEL_FIELDS
 
 
 class BallTracer:
@@ -61,7 +62,7 @@ class BallTracer:
 
         # Phase 1: Detect ball positions
         print("\nPhase 1: Detecting ball positions...")
-        ball_positions = []
+        ball_positions = TrajectoryArray(PIXEL_FIELDS, capacity=max(total_frames, 1))
         frame_count = 0
 
         while True:
@@ -74,12 +75,8 @@ class BallTracer:
 
             if center:
                 timestamp = frame_count / fps
-                ball_positions.append({
-                    'frame': frame_count,
-                    'position': center,
-                    'radius': radius,
-                    'timestamp': timestamp
-                })
+                ball_positions.append(t=timestamp, frame=frame_count,
+                                      px=center[0], py=center[1], radius=radius)
 
             # Progress indicator
             if frame_count % 30 == 0:
@@ -95,15 +92,12 @@ class BallTracer:
 
         # Phase 2: Calculate trajectory
         print("\nPhase 2: Calculating trajectory...")
-        positions_for_calc = [
-            (p['position'][0], p['position'][1], p['timestamp'])
-            for p in ball_positions[:min(10, len(ball_positions))]
-        ]
+        positions_for_calc = ball_positions[:10].to_list(("px", "py", "t"))
 
         (vx, vy), angle, speed = self.predictor.estimate_initial_velocity(positions_for_calc)
 
         # Generate smooth trajectory curve
-        x0, y0 = ball_positions[0]['position']
+        x0, y0 = ball_positions.pixels[0]
         traj_x, traj_y = self.predictor.calculate_trajectory(x0, y0, vx, vy, num_points=100)
 
         trajectory_points = [(int(x), int(y)) for x, y in zip(traj_x, traj_y)
@@ -132,7 +126,7 @@ class BallTracer:
             frame_count += 1
 
             # Find if ball is visible in this frame
-            current_ball = next((p for p in ball_positions if p['frame'] == frame_count), None)
+            current_ball = self._ball_index(ball_positions, frame_count) is not None
 
             # Draw trace up to current ball position
             if current_ball and trace_style == "toptracer":
@@ -173,18 +167,24 @@ class BallTracer:
             'total_distance_pixels': total_distance
         }
 
+    def _ball_index(self, ball_positions, frame_number):
+        """Row of the detection in frame_number (frames are increasing), or None."""
+        frames = ball_positions.frame
+        i = int(np.searchsorted(frames, frame_number))
+        return i if i < len(frames) and frames[i] == frame_number else None
+
     def _draw_toptracer_style(self, frame, ball_positions, trajectory,
                               current_frame, speed, angle, distance):
         """
         TopTracer-style overlay: Clean cyan line with animated ball marker
         """
         # Draw trajectory curve (fade effect - more opaque closer to ball)
-        current_ball_idx = next((i for i, p in enumerate(ball_positions)
-                               if p['frame'] == current_frame), None)
+        current_ball_idx = self._ball_index(ball_positions, current_frame)
 
         if current_ball_idx is not None:
             # Draw traced path (where ball has been)
-            traced_positions = [p['position'] for p in ball_positions[:current_ball_idx + 1]]
+            traced_positions = [tuple(p) for p in
+                                ball_positions[:current_ball_idx + 1].pixels.astype(int).tolist()]
 
             if len(traced_positions) > 1:
                 # Draw smooth curve through detected positions
@@ -222,11 +222,11 @@ class BallTracer:
         """
         ShotTracer-style overlay: Thick gradient line with apex marker
         """
-        current_ball_idx = next((i for i, p in enumerate(ball_positions)
-                               if p['frame'] == current_frame), None)
+        current_ball_idx = self._ball_index(ball_positions, current_frame)
 
         if current_ball_idx is not None and current_ball_idx > 0:
-            traced_positions = [p['position'] for p in ball_positions[:current_ball_idx + 1]]
+            traced_positions = [tuple(p) for p in
+                                ball_positions[:current_ball_idx + 1].pixels.astype(int).tolist()]
 
             # Draw gradient trail (orange to yellow)
             for i in range(1, len(traced_positions)):
@@ -246,11 +246,11 @@ class BallTracer:
         """
         Simple trace: Just the line, no fancy effects
         """
-        current_ball_idx = next((i for i, p in enumerate(ball_positions)
-                               if p['frame'] == current_frame), None)
+        current_ball_idx = self._ball_index(ball_positions, current_frame)
 
         if current_ball_idx is not None and current_ball_idx > 0:
-            traced_positions = [p['position'] for p in ball_positions[:current_ball_idx + 1]]
+            traced_positions = [tuple(p) for p in
+                                ball_positions[:current_ball_idx + 1].pixels.astype(int).tolist()]
             points = np.array(traced_positions, dtype=np.int32)
             cv2.polylines(frame, [points], False, self.trace_color, 2)
 
@@ -0,0 +1,402 @@
+"""
+Physics Engine Benchmark & Convergence Suite
+
+Measures TrajectorySimulator and the archetype table generator:
+1. Throughput (trajectories/second) and force evaluations per trajectory
+   for fixed RK4, adaptive Dormand-Prince, batched and cached modes
+2. Convergence of carry/apex against a fine-step reference, and the
+   observed order of each fixed-step integrator against its theory
+3. Machine-readable JSON output, optionally compared to a saved baseline
+
+Usage:
+    python benchmark_physics.py
+    python benchmark_physics.py --json results.json
+    python benchmark_physics.py --baseline results.json   # exits 1 on regression
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+import numpy as np
+from trajectory_physics import TrajectorySimulator
+from trajectory_cache import TrajectoryCache
+from shot_archetypes import SHOT_TYPES
+import generate_archetype_tables as tables
+
+
+# Representative shots: (speed mph, launch angle, backspin rpm, spin axis, wind mph, wind dir)
+BENCHMARK_SHOTS = [
+    (145, 12, 2500, 0, 0, 0),
+    (150, 18, 3500, 25, 10, 45),
+    (165, 9, 2000, -15, 15, 180),
+    (110, 24, 5000, 5, 8, 0),
+    (90, 30, 7000, 0, 5, 270),
+]
+
+RK4_TIME_STEPS = [0.04, 0.02, 0.01, 0.005]
+DOPRI_TOLERANCES = [1e-3, 1e-4, 1e-6, 1e-8]
+EULER_TIME_STEPS = [0.04, 0.02, 0.01, 0.005]
+REFERENCE_TIME_STEP = 0.0005
+REFERENCE_TOLERANCE = 1e-10
+
+# Theoretical convergence order of carry for each fixed-step mode
+EXPECTED_ORDERS = {"rk4": 4, "table_euler": 1}
+ORDER_TOLERANCE = 0.5
+
+# Regression thresholds for --baseline
+THROUGHPUT_TOLERANCE = 0.25   # Fail if trajectories/second drops by more than 25%
+ERROR_TOLERANCE = 0.10        # Fail if a convergence error grows by more than 10%
+ERROR_FLOOR_YARDS = 1e-3      # Ignore changes below this absolute error
+
+
+def _time_repeated(func, min_seconds=0.5, rounds=5, max_repeats=1000):
+    """
+    Time func over several rounds and keep the fastest (least disturbed) one.
+
+    Returns:
+        (seconds per call, last result)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(rounds):
+        calls = 0
+        start = time.perf_counter()
+        while calls < max_repeats:
+            result = func()
+            calls += 1
+            if time.perf_counter() - start >= min_seconds / rounds:
+                break
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best, result
+
+
+def benchmark_throughput(min_seconds=0.5, batch_size=1000):
+    """
+    Trajectories/second and force evaluations per trajectory for each mode.
+
+    Args:
+        min_seconds: Minimum timing window per mode
+        batch_size: Trajectories per simulate_batch call
+
+    Returns:
+        Dict of mode -> {trajectories_per_second, force_evaluations_per_trajectory}
+    """
+    simulator = TrajectorySimulator()
+    shots = BENCHMARK_SHOTS
+    results = {}
+
+    def run_flights(integrator):
+        evaluations = 0
+        for shot in shots:
+            evaluations += simulator.simulate_flight(*shot, integrator=integrator)["force_evaluations"]
+        return evaluations
+
+    for mode, integrator in (("rk4", "rk4"), ("adaptive", "dopri5")):
+        seconds, evaluations = _time_repeated(lambda: run_flights(integrator), min_seconds)
+        results[mode] = {
+            "trajectories_per_second": len(shots) / seconds,
+            "force_evaluations_per_trajectory": evaluations / len(shots)
+        }
+
+    # Batched: shots tiled to batch_size, no recorded points
+    columns = np.array(shots, dtype=float).T
+    repeats = math.ceil(batch_size / len(shots))
+    tiled = [np.tile(column, repeats)[:batch_size] for column in columns]
+
+    def run_batch():
+        batch = simulator.simulate_batch(*tiled[:4], wind_speed_mph=tiled[4],
+                                         wind_direction_deg=tiled[5], record_points=False)
+        # num_points includes the launch point: one RK4 step per other point
+        return int((batch["num_points"] - 1).sum()) * 4
+
+    seconds, evaluations = _time_repeated(run_batch, min_seconds)
+    results["batched"] = {
+        "trajectories_per_second": batch_size / seconds,
+        "force_evaluations_per_trajectory": evaluations / batch_size,
+        "batch_size": batch_size
+    }
+
+    # Cached: all archetypes, warm cache (steady-state hit path)
+    cache = TrajectoryCache(simulator=TrajectorySimulator())
+    cache.simulate_archetypes(SHOT_TYPES, 140, wind_speed_mph=8, wind_direction_deg=30)
+    seconds, _ = _time_repeated(
+        lambda: cache.simulate_archetypes(SHOT_TYPES, 140, wind_speed_mph=8, wind_direction_deg=30),
+        min_seconds
+    )
+    results["cached"] = {
+        "trajectories_per_second": len(SHOT_TYPES) / seconds,
+        "force_evaluations_per_trajectory": 0.0,
+        "hit_rate": cache.get_stats()["hit_rate"]
+    }
+
+    # Archetype table generator (explicit Euler, one evaluation per step)
+    def run_tables():
+        steps = 0
+        for archetype in tables.ARCHETYPES:
+            steps += len(tables.calculate_trajectory(archetype))
+        return steps
+
+    seconds, steps = _time_repeated(run_tables, min_seconds)
+    results["table_euler"] = {
+        "trajectories_per_second": len(tables.ARCHETYPES) / seconds,
+        "force_evaluations_per_trajectory": steps / len(tables.ARCHETYPES)
+    }
+
+    return results
+
+
+def _max_errors(values, reference):
+    """Max absolute carry/apex error in yards over all benchmark shots."""
+    values = np.array(values)
+    reference = np.array(reference)
+    errors = np.abs(values - reference).max(axis=0)
+    return {"carry_error_yards": float(errors[0]), "apex_error_yards": float(errors[1])}
+
+
+def _observed_order(steps, errors):
+    """Least-squares slope of log(error) vs log(step); None if errors vanish."""
+    pairs = [(s, e) for s, e in zip(steps, errors) if e > 0]
+    if len(pairs) < 2:
+        return None
+    x, y = np.log([p[0] for p in pairs]), np.log([p[1] for p in pairs])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def convergence_study():
+    """
+    Carry/apex error of each integrator against a fine-step reference.
+
+    Fixed-step modes are compared with themselves at REFERENCE_TIME_STEP, so
+    the error is the integrator's own truncation error: RK4 carry (ground
+    contact from the Hermite crossing) should converge at order 4, the
+    table generator's Euler model at order 1. Apex is the highest sample,
+    not an interpolated maximum, so it converges more slowly. Adaptive
+    Dormand-Prince is compared with itself at REFERENCE_TOLERANCE, and the
+    fine-step RK4 agreement with that is reported as a cross-check.
+
+    Returns:
+        Dict of mode -> {"levels": [...], "observed_order": float or None,
+        "expected_order": int or None}, plus "reference_check"
+    """
+    simulator = TrajectorySimulator()
+    default_step = simulator.time_step
+
+    def summarize(**kwargs):
+        summary = []
+        for shot in BENCHMARK_SHOTS:
+            result = simulator.simulate_flight(*shot, **kwargs)
+            summary.append((result["carry_distance_yards"], result["apex_height_yards"],
+                            result["force_evaluations"]))
+        return summary
+
+    reference = [s[:2] for s in summarize(integrator="dopri5", rtol=REFERENCE_TOLERANCE,
+                                          atol=REFERENCE_TOLERANCE)]
+
+    try:
+        simulator.time_step = REFERENCE_TIME_STEP
+        rk4_reference = [s[:2] for s in summarize()]
+        reference_check = _max_errors(rk4_reference, reference)
+
+        rk4_levels = []
+        for dt in RK4_TIME_STEPS:
+            simulator.time_step = dt
+            summary = summarize()
+            rk4_levels.append({
+                "time_step": dt,
+                **_max_errors([s[:2] for s in summary], rk4_reference),
+                "force_evaluations_per_trajectory": float(np.mean([s[2] for s in summary]))
+            })
+    finally:
+        simulator.time_step = default_step
+
+    dopri_levels = []
+    for tolerance in DOPRI_TOLERANCES:
+        summary = summarize(integrator="dopri5", rtol=tolerance, atol=tolerance)
+        dopri_levels.append({
+            "tolerance": tolerance,
+            **_max_errors([s[:2] for s in summary], reference),
+            "force_evaluations_per_trajectory": float(np.mean([s[2] for s in summary]))
+        })
+
+    # Table generator: carry = final x, apex = max height, both in yards
+    def euler_summary(dt):
+        summary = []
+        for archetype in tables.ARCHETYPES:
+            trajectory = tables.calculate_trajectory(archetype, dt=dt)
+            summary.append((tables.meters_to_yards(trajectory.x[-1]),
+                            tables.meters_to_yards(trajectory.y.max())))
+        return summary
+
+    euler_reference = euler_summary(REFERENCE_TIME_STEP)
+    euler_levels = [
+        {"time_step": dt, **_max_errors(euler_summary(dt), euler_reference)}
+        for dt in EULER_TIME_STEPS
+    ]
+
+    return {
+        "reference_check": {"time_step": REFERENCE_TIME_STEP, **reference_check},
+        "rk4": {
+            "levels": rk4_levels,
+            "observed_order": _observed_order(RK4_TIME_STEPS, [l["carry_error_yards"] for l in rk4_levels]),
+            "expected_order": EXPECTED_ORDERS["rk4"]
+        },
+        "adaptive": {
+            "levels": dopri_levels,
+            "observed_order": None,
+            "expected_order": None
+        },
+        "table_euler": {
+            "levels": euler_levels,
+            "observed_order": _observed_order(EULER_TIME_STEPS, [l["carry_error_yards"] for l in euler_levels]),
+            "expected_order": EXPECTED_ORDERS["table_euler"]
+        }
+    }
+
+
+def order_mismatches(convergence):
+    """
+    Fixed-step modes whose observed carry order is off their theoretical one.
+
+    Args:
+        convergence: The "convergence" entry of run_benchmarks
+
+    Returns:
+        List of human-readable descriptions (empty = OK)
+    """
+    mismatches = []
+    for mode, study in convergence.items():
+        expected = study.get("expected_order")
+        observed = study.get("observed_order")
+        if expected is None:
+            continue
+        if observed is None or abs(observed - expected) > ORDER_TOLERANCE:
+            label = f"{observed:.2f}" if observed is not None else "none"
+            mismatches.append(f"{mode}: observed order {label}, expected {expected}")
+    return mismatches
+
+
+def compare_to_baseline(current, baseline):
+    """
+    Find regressions relative to a previous benchmark run.
+
+    Args:
+        current: Results of run_benchmarks
+        baseline: Results loaded from a previous --json output
+
+    Returns:
+        List of human-readable regression descriptions (empty = OK)
+    """
+    regressions = []
+
+    for mode, stats in baseline.get("throughput", {}).items():
+        if mode not in current["throughput"]:
+            continue
+        before = stats["trajectories_per_second"]
+        after = current["throughput"][mode]["trajectories_per_second"]
+        if after < before * (1 - THROUGHPUT_TOLERANCE):
+            regressions.append(f"{mode}: {after:.0f} traj/s vs {before:.0f} baseline")
+
+    for mode, study in baseline.get("convergence", {}).items():
+        if "levels" not in study or mode not in current["convergence"]:
+            continue
+        for before, after in zip(study["levels"], current["convergence"][mode]["levels"]):
+            for metric in ("carry_error_yards", "apex_error_yards"):
+                limit = max(before[metric] * (1 + ERROR_TOLERANCE), ERROR_FLOOR_YARDS)
+                if after[metric] > limit:
+                    level = {k: v for k, v in after.items() if k in ("time_step", "tolerance")}
+                    regressions.append(
+                        f"{mode} {level} {metric}: {after[metric]:.4f} vs {before[metric]:.4f} baseline"
+                    )
+
+    regressions.extend(order_mismatches(current["convergence"]))
+    return regressions
+
+
+def run_benchmarks(min_seconds=0.5, batch_size=1000, skip_convergence=False):
+    """Run the full suite and return machine-readable results."""
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "default_time_step": TrajectorySimulator().time_step,
+            "table_time_step": tables.DEFAULT_DT
+        },
+        "throughput": benchmark_throughput(min_seconds, batch_size),
+        "convergence": {} if skip_convergence else convergence_study()
+    }
+
+
+def print_report(results):
+    """Print a human-readable summary of run_benchmarks output."""
+    print("\nTHROUGHPUT")
+    print("-" * 60)
+    print(f"  {'mode':12s} {'traj/s':>12s} {'force evals/traj':>18s}")
+    for mode, stats in results["throughput"].items():
+        print(f"  {mode:12s} {stats['trajectories_per_second']:12.0f} "
+              f"{stats['force_evaluations_per_trajectory']:18.1f}")
+
+    if results["convergence"]:
+        print("\nCONVERGENCE (max error vs fine-step reference, yards)")
+        print("-" * 60)
+        for mode, study in results["convergence"].items():
+            if "levels" not in study:
+                print(f"  fine-step RK4 (dt={study['time_step']}) vs dopri5 reference: "
+                      f"carry {study['carry_error_yards']:.2e}  apex {study['apex_error_yards']:.2e}")
+                continue
+            order = study["observed_order"]
+            expected = study.get("expected_order")
+            header = f"  {mode}"
+            if order is not None:
+                header += f" (observed order {order:.2f}" + (f", expected {expected}" if expected else "") + ")"
+            print(header)
+            for level in study["levels"]:
+                label = (f"dt={level['time_step']}" if "time_step" in level
+                         else f"tol={level['tolerance']:g}")
+                evaluations = level.get("force_evaluations_per_trajectory")
+                extra = f"  evals {evaluations:.0f}" if evaluations is not None else ""
+                print(f"    {label:12s} carry {level['carry_error_yards']:.2e}  "
+                      f"apex {level['apex_error_yards']:.2e}{extra}")
+
+        for mismatch in order_mismatches(results["convergence"]):
+            print(f"[WARNING] {mismatch}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the trajectory physics engine")
+    parser.add_argument("--json", help="Write machine-readable results to this path")
+    parser.add_argument("--baseline", help="Compare against a previous --json output")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Timing window per mode")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Trajectories per batch")
+    parser.add_argument("--skip-convergence", action="store_true", help="Throughput only")
+    args = parser.parse_args()
+
+    print("Physics Engine Benchmark")
+    print("=" * 60)
+
+    results = run_benchmarks(args.min_seconds, args.batch_size, args.skip_convergence)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline)
+        print("\nBASELINE COMPARISON")
+        print("-" * 60)
+        if regressions:
+            for regression in regressions:
+                print(f"  [REGRESSION] {regression}")
+            sys.exit(1)
+        print("  ✅ No regressions")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,425 @@
+"""
+Carry/Landing Lookup Surface
+
+Precomputes ball flight outcomes on a dense grid of launch conditions:
+- Ball speed (mph)
+- Launch angle (degrees)
+- Backspin (rpm)
+- Spin axis (degrees)
+- Headwind and crosswind components (mph)
+
+Each grid node stores carry, apex, curve, flight time and landing offset,
+produced by TrajectorySimulator's vectorized batch engine. Queries use
+multilinear interpolation between the surrounding nodes, so "where does this
+land" costs microseconds instead of a full RK4 integration.
+
+Generate the table once (python carry_surface.py --generate) and the API
+server and ClubSelector pick it up automatically.
+"""
+
+import math
+import os
+import time
+import itertools
+import numpy as np
+from trajectory_physics import TrajectorySimulator
+
+
+DEFAULT_SURFACE_PATH = os.path.join("models", "carry_surface.npz")
+
+# Grid axes in query order (inclusive ranges)
+SURFACE_AXES = {
+    "speed_mph": np.arange(50, 201, 10, dtype=np.float64),
+    "launch_angle_deg": np.arange(4, 25, 2, dtype=np.float64),
+    "backspin_rpm": np.arange(1500, 5001, 500, dtype=np.float64),
+    "spin_axis_deg": np.arange(-30, 31, 10, dtype=np.float64),
+    "headwind_mph": np.arange(-20, 21, 10, dtype=np.float64),
+    "crosswind_mph": np.arange(-20, 21, 10, dtype=np.float64),
+}
+
+# Stored outcome per grid node
+SURFACE_FIELDS = [
+    "carry_distance_yards",
+    "apex_height_yards",
+    "curve_yards",
+    "flight_time_seconds",
+    "landing_x_m",
+    "landing_y_m",
+]
+
+# Bumped when stored values change meaning; older files are refused
+# (2: landing at the interpolated ground contact, not the first state below it)
+SURFACE_VERSION = 2
+
+
+def wind_components(wind_speed_mph, wind_direction_deg):
+    """
+    Split wind into head/cross components (simulator convention).
+
+    Args:
+        wind_speed_mph: Wind speed in mph
+        wind_direction_deg: Wind direction relative to shot
+            (0 = headwind, 90 = right, 180 = tailwind)
+
+    Returns:
+        (headwind_mph, crosswind_mph) - scalars or arrays
+    """
+    wind_rad = np.radians(wind_direction_deg)
+    return wind_speed_mph * np.cos(wind_rad), wind_speed_mph * np.sin(wind_rad)
+
+
+class CarrySurface:
+    def __init__(self, axes, values):
+        """
+        Initialize lookup surface.
+
+        Args:
+            axes: Dict of axis name -> sorted 1D grid (SURFACE_AXES order)
+            values: Array of shape (*grid_shape, len(SURFACE_FIELDS))
+        """
+        self.axis_names = list(axes)
+        self.axes = [np.asarray(axes[name], dtype=np.float64) for name in self.axis_names]
+        self.shape = tuple(len(a) for a in self.axes)
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+
+        if self.values.shape != self.shape + (len(SURFACE_FIELDS),):
+            raise ValueError(f"Surface values shape {self.values.shape} does not match axes {self.shape}")
+
+        # Axes must be uniform so a cell is found with one division
+        for name, grid in zip(self.axis_names, self.axes):
+            if len(grid) < 2 or not np.allclose(np.diff(grid), grid[1] - grid[0]):
+                raise ValueError(f"Surface axis {name} must be uniformly spaced")
+
+        self.lower = np.array([a[0] for a in self.axes])[:, None]
+        self.upper = np.array([a[-1] for a in self.axes])[:, None]
+        self.step = np.array([a[1] - a[0] for a in self.axes])[:, None]
+        self.last_cell = np.array([len(a) - 2 for a in self.axes])[:, None]
+
+        # Flat table and precomputed offsets of the 2^D cell corners
+        self.table = self.values.reshape(-1, len(SURFACE_FIELDS))
+        self.strides = np.array([int(np.prod(self.shape[d + 1:])) for d in range(len(self.shape))])
+        self.corner_bits = np.array(list(itertools.product((0, 1), repeat=len(self.shape))), dtype=bool)
+        self.corner_offsets = self.corner_bits.astype(np.int64) @ self.strides
+
+        # Python copies for the scalar query path
+        self.axis_params = [
+            (float(a[0]), float(a[-1]), float(a[1] - a[0]), len(a) - 2, int(stride))
+            for a, stride in zip(self.axes, self.strides)
+        ]
+
+    def _cells(self, coords):
+        """
+        Locate grid cells and corner weights for a batch of query points.
+
+        Args:
+            coords: (D, N) array of query coordinates
+
+        Returns:
+            (base flat index (N,), corner weights (N, 2^D))
+        """
+        # Clamp to the grid (no extrapolation) and split into cell + fraction
+        u = (np.minimum(np.maximum(coords, self.lower), self.upper) - self.lower) / self.step
+        i = np.minimum(u.astype(np.int64), self.last_cell)
+        t = u - i
+
+        base = self.strides @ i
+        weights = np.where(self.corner_bits[:, :, None], t, 1 - t).prod(axis=1)
+
+        return base, weights.T
+
+    def query_batch(self, speed_mph, launch_angle_deg, backspin_rpm, spin_axis_deg,
+                    wind_speed_mph=0, wind_direction_deg=0):
+        """
+        Interpolate outcomes for many launches at once.
+
+        Arguments broadcast like TrajectorySimulator.simulate_batch; values
+        outside the grid are clamped to its edges.
+
+        Returns:
+            dict of field name -> (N,) array
+        """
+        headwind, crosswind = wind_components(
+            np.asarray(wind_speed_mph, dtype=np.float64),
+            np.asarray(wind_direction_deg, dtype=np.float64)
+        )
+        coords = np.array(np.broadcast_arrays(
+            speed_mph, launch_angle_deg, backspin_rpm, spin_axis_deg, headwind, crosswind
+        ), dtype=np.float64).reshape(len(self.axes), -1)
+
+        base, weights = self._cells(coords)
+        corners = self.table[base[:, None] + self.corner_offsets]  # (N, 2^D, F)
+        result = np.matmul(weights[:, None, :], corners)[:, 0]
+
+        return {field: result[:, j] for j, field in enumerate(SURFACE_FIELDS)}
+
+    def query(self, speed_mph, launch_angle_deg, backspin_rpm, spin_axis_deg,
+              wind_speed_mph=0, wind_direction_deg=0):
+        """
+        Interpolate the outcome of a single launch.
+
+        Args:
+            speed_mph: Ball speed in mph
+            launch_angle_deg: Launch angle in degrees
+            backspin_rpm: Backspin in rpm
+            spin_axis_deg: Spin axis tilt (+ = right, - = left)
+            wind_speed_mph: Wind speed in mph
+            wind_direction_deg: Wind direction relative to shot (0 = headwind)
+
+        Returns:
+            dict of field name -> float
+        """
+        wind_rad = math.radians(wind_direction_deg)
+        coords = (speed_mph, launch_angle_deg, backspin_rpm, spin_axis_deg,
+                  wind_speed_mph * math.cos(wind_rad), wind_speed_mph * math.sin(wind_rad))
+
+        # Plain Python for the cell search keeps a single lookup in microseconds
+        base = 0
+        weights = [1.0]
+        for (lower, upper, step, last, stride), value in zip(self.axis_params, coords):
+            u = (min(max(value, lower), upper) - lower) / step
+            i = min(int(u), last)
+            t = u - i
+            base += i * stride
+            weights = [w * f for w in weights for f in (1 - t, t)]
+
+        result = np.dot(weights, self.table[base + self.corner_offsets])
+        return {field: float(result[j]) for j, field in enumerate(SURFACE_FIELDS)}
+
+    def query_archetype(self, archetype_data, launch_speed_mph,
+                        wind_speed_mph=0, wind_direction_deg=0):
+        """
+        Interpolate the outcome for a shot archetype (see shot_archetypes.py).
+
+        Returns:
+            dict of field name -> float
+        """
+        return self.query(
+            launch_speed_mph,
+            archetype_data["launch_angle"],
+            archetype_data["backspin_rpm"],
+            archetype_data["side_spin_axis"],
+            wind_speed_mph,
+            wind_direction_deg
+        )
+
+    def speed_for_carry(self, carry_yards, launch_angle_deg=12, backspin_rpm=2500,
+                        spin_axis_deg=0):
+        """
+        Inverse lookup: calm-air ball speed that carries a given distance.
+
+        Carry is monotonic in speed, so the speed axis is swept once and
+        inverted by linear interpolation (clamped to the grid).
+
+        Returns:
+            Ball speed in mph
+        """
+        speeds = self.axes[0]
+        carries = self.query_batch(speeds, launch_angle_deg, backspin_rpm, spin_axis_deg)["carry_distance_yards"]
+        return float(np.interp(carry_yards, carries, speeds))
+
+    def save(self, filepath=DEFAULT_SURFACE_PATH):
+        """Save surface to a compressed .npz file."""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez_compressed(
+            filepath,
+            values=self.values,
+            version=SURFACE_VERSION,
+            fields=np.array(SURFACE_FIELDS),
+            axis_names=np.array(self.axis_names),
+            **{f"axis_{name}": grid for name, grid in zip(self.axis_names, self.axes)}
+        )
+        print(f"✅ Carry surface saved to {filepath}")
+
+
+def load_carry_surface(filepath=DEFAULT_SURFACE_PATH):
+    """
+    Load a surface written by CarrySurface.save.
+
+    Returns:
+        CarrySurface instance or None if the file is missing
+    """
+    if not os.path.exists(filepath):
+        print(f"[INFO] No carry surface at {filepath} - run carry_surface.py --generate")
+        return None
+
+    with np.load(filepath) as data:
+        if list(data["fields"]) != SURFACE_FIELDS:
+            print(f"[WARNING] Carry surface {filepath} has unexpected fields, ignoring")
+            return None
+        if "version" not in data or int(data["version"]) != SURFACE_VERSION:
+            print(f"[WARNING] Carry surface {filepath} is outdated - run carry_surface.py --generate")
+            return None
+
+        axes = {str(name): data[f"axis_{name}"] for name in data["axis_names"]}
+        return CarrySurface(axes, data["values"])
+
+
+def generate_carry_surface(simulator=None, axes=None, chunk_size=20000):
+    """
+    Simulate every grid node with the vectorized batch engine.
+
+    Args:
+        simulator: TrajectorySimulator (default: new instance)
+        axes: Dict of grid axes (default: SURFACE_AXES)
+        chunk_size: Trajectories per simulate_batch call
+
+    Returns:
+        CarrySurface instance
+    """
+    simulator = simulator or TrajectorySimulator()
+    axes = axes or SURFACE_AXES
+
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    speed, angle, backspin, spin_axis, headwind, crosswind = (m.ravel() for m in mesh)
+    wind_speed = np.hypot(headwind, crosswind)
+    wind_direction = np.degrees(np.arctan2(crosswind, headwind))
+
+    total = speed.size
+    values = np.empty((total, len(SURFACE_FIELDS)), dtype=np.float32)
+    start_time = time.time()
+
+    for start in range(0, total, chunk_size):
+        chunk = slice(start, min(start + chunk_size, total))
+        batch = simulator.simulate_batch(
+            speed[chunk], angle[chunk], backspin[chunk], spin_axis[chunk],
+            wind_speed_mph=wind_speed[chunk],
+            wind_direction_deg=wind_direction[chunk],
+            record_points=False
+        )
+        values[chunk, 0] = batch["carry_distance_yards"]
+        values[chunk, 1] = batch["apex_height_yards"]
+        values[chunk, 2] = batch["curve_yards"]
+        values[chunk, 3] = batch["flight_time_seconds"]
+        values[chunk, 4] = batch["landing"][:, 0]
+        values[chunk, 5] = batch["landing"][:, 1]
+
+        print(f"  Progress: {chunk.stop}/{total} trajectories", end='\r')
+
+    print(f"\n  Simulated {total} trajectories in {time.time() - start_time:.1f}s")
+
+    shape = tuple(len(a) for a in axes.values())
+    return CarrySurface(axes, values.reshape(shape + (len(SURFACE_FIELDS),)))
+
+
+def report_interpolation_error(surface, simulator=None, samples=200, seed=0):
+    """
+    Compare surface lookups against full TrajectorySimulator runs.
+
+    Samples random launch conditions inside the grid and prints the mean,
+    95th percentile and max absolute error per field.
+
+    Args:
+        surface: CarrySurface to check
+        simulator: TrajectorySimulator (default: new instance)
+        samples: Number of random launches
+        seed: Random seed
+
+    Returns:
+        dict of field name -> {"mean", "p95", "max"} absolute errors
+    """
+    simulator = simulator or TrajectorySimulator()
+    rng = np.random.default_rng(seed)
+
+    coords = [rng.uniform(grid[0], grid[-1], samples) for grid in surface.axes]
+    speed, angle, backspin, spin_axis, headwind, crosswind = coords
+    wind_speed = np.hypot(headwind, crosswind)
+    wind_direction = np.degrees(np.arctan2(crosswind, headwind))
+
+    start_time = time.perf_counter()
+    predicted = surface.query_batch(speed, angle, backspin, spin_axis, wind_speed, wind_direction)
+    lookup_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    errors = {field: [] for field in SURFACE_FIELDS}
+    for i in range(samples):
+        result = simulator.simulate_flight(
+            speed[i], angle[i], backspin[i], spin_axis[i],
+            wind_speed_mph=wind_speed[i], wind_direction_deg=wind_direction[i]
+        )
+        # The last point is the interpolated ground contact
+        landing_x, landing_y = result["points"][-1][:2]
+        actual = {
+            "carry_distance_yards": result["carry_distance_yards"],
+            "apex_height_yards": result["apex_height_yards"],
+            "curve_yards": result["curve_yards"],
+            "flight_time_seconds": result["flight_time_seconds"],
+            "landing_x_m": landing_x,
+            "landing_y_m": landing_y,
+        }
+        for field in SURFACE_FIELDS:
+            errors[field].append(abs(predicted[field][i] - actual[field]))
+    simulate_time = time.perf_counter() - start_time
+
+    report = {}
+    print(f"\nInterpolation error over {samples} random launches:")
+    print(f"  {'field':22s} {'mean':>8s} {'p95':>8s} {'max':>8s}")
+    for field in SURFACE_FIELDS:
+        e = np.array(errors[field])
+        report[field] = {
+            "mean": float(e.mean()),
+            "p95": float(np.percentile(e, 95)),
+            "max": float(e.max())
+        }
+        print(f"  {field:22s} {report[field]['mean']:8.3f} {report[field]['p95']:8.3f} {report[field]['max']:8.3f}")
+
+    print(f"\n  Lookup: {lookup_time / samples * 1e6:.1f} us/launch (batched)")
+    print(f"  Simulate: {simulate_time / samples * 1e3:.2f} ms/launch")
+
+    return report
+
+
+# Shared instance for the API server
+_carry_surface = None
+_carry_surface_loaded = False
+
+def get_carry_surface(filepath=DEFAULT_SURFACE_PATH):
+    """Get or load the carry surface singleton (None if not generated)."""
+    global _carry_surface, _carry_surface_loaded
+    if not _carry_surface_loaded:
+        _carry_surface = load_carry_surface(filepath)
+        _carry_surface_loaded = True
+    return _carry_surface
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate or check the carry/landing lookup surface')
+    parser.add_argument('--generate', action='store_true',
+                        help='Simulate the full grid and save it')
+    parser.add_argument('--report', action='store_true',
+                        help='Report interpolation error against TrajectorySimulator')
+    parser.add_argument('--path', type=str, default=DEFAULT_SURFACE_PATH,
+                        help='Surface file path')
+    parser.add_argument('--samples', type=int, default=200,
+                        help='Random launches for the error report')
+    args = parser.parse_args()
+
+    print("Carry/Landing Lookup Surface")
+    print("=" * 60)
+
+    surface = None
+    if args.generate:
+        grid_size = int(np.prod([len(a) for a in SURFACE_AXES.values()]))
+        print(f"\nGenerating {grid_size} grid nodes...")
+        surface = generate_carry_surface()
+        surface.save(args.path)
+        print(f"  Size: {os.path.getsize(args.path) / 1024:.1f} KB")
+
+    if surface is None:
+        surface = load_carry_surface(args.path)
+
+    if surface is not None:
+        result = surface.query(145, 12, 2500, 0)
+        print("\n145mph, 12°, 2500rpm, no wind:")
+        print(f"  Carry: {result['carry_distance_yards']:.1f} yards")
+        print(f"  Apex: {result['apex_height_yards']:.1f} yards")
+        print(f"  Flight time: {result['flight_time_seconds']:.2f}s")
+
+        if args.report:
+            report_interpolation_error(surface, samples=args.samples)
+
+    print("\n" + "=" * 60)
@@ -4,6 +4,7 @@ Recommends clubs based on distance, conditions, and player history
 """
 
 from shot_tracker import ShotTracker
+from carry_surface import CarrySurface, get_carry_surface
 from typing import Dict, List, Optional
 import math
 
@@ -11,9 +12,12 @@ import math
 class ClubSelector:
     """Provides intelligent club recommendations"""
 
-    def __init__(self, shot_tracker: ShotTracker):
+    def __init__(self, shot_tracker: ShotTracker, carry_surface: Optional[CarrySurface] = None):
         self.tracker = shot_tracker
 
+        # Physics lookup surface for wind adjustment (rule of thumb if not generated)
+        self.carry_surface = carry_surface if carry_surface is not None else get_carry_surface()
+
         # Standard club distances for beginners (fallback if no data)
         self.default_distances = {
             'Driver': 220,
@@ -92,8 +96,10 @@ class ClubSelector:
         """
         adjusted = distance
 
-        # Wind adjustment (rule of thumb: 1 mph wind = 1 yard per 10 yards distance)
-        if wind_speed != 0:
+        if wind_speed != 0 and self.carry_surface is not None:
+            adjusted = self._physics_wind_adjustment(distance, wind_speed, wind_direction)
+        elif wind_speed != 0:
+            # Wind adjustment (rule of thumb: 1 mph wind = 1 yard per 10 yards distance)
             wind_effect = (wind_speed * distance / 10) * math.cos(math.radians(wind_direction))
             adjusted += wind_effect
 
@@ -113,6 +119,35 @@ class ClubSelector:
 
         return adjusted
 
+    def _physics_wind_adjustment(self, distance: float, wind_speed: float,
+                                 wind_direction: float) -> float:
+        """
+        "Plays like" distance from the precomputed carry surface
+
+        Finds the calm-air ball speed that carries the target distance with a
+        neutral launch, then scales the target by how much the wind shortens
+        or stretches that carry.
+
+        Args:
+            distance: Base distance in yards
+            wind_speed: Wind speed in mph (positive = headwind, negative = tailwind)
+            wind_direction: Wind direction in degrees (0 = straight ahead)
+
+        Returns:
+            Adjusted distance in yards
+        """
+        # Surface convention: non-negative speed, 0° = headwind, 180° = tailwind
+        direction = wind_direction if wind_speed > 0 else wind_direction + 180
+
+        speed = self.carry_surface.speed_for_carry(distance)
+        calm = self.carry_surface.query(speed, 12, 2500, 0)['carry_distance_yards']
+        windy = self.carry_surface.query(speed, 12, 2500, 0, abs(wind_speed), direction)['carry_distance_yards']
+
+        if windy <= 0:
+            return distance
+
+        return distance * calm / windy
+
     def _get_condition_summary(self, wind: float, elevation: float, lie: str) -> str:
         """Generates human-readable condition summary"""
         conditions = []
@@ -0,0 +1,639 @@
+"""
+Compiled Course Geometry
+
+Spatial index over the polygons returned by OSMGolfFetcher.get_course_details:
+1. Project every green, tee, fairway, bunker and water outline into local
+   east/north meters around the course
+2. Pack the polygon bounding boxes into a static R-tree (Sort-Tile-Recursive)
+3. Answer point-in-polygon and nearest-feature queries for whole arrays of
+   points by descending the tree level by level and testing only the
+   candidate polygons' edges
+
+Hole paths (golf=hole ways, tee to green) get their own segment tree, so a
+GPS fix snaps to the current hole and distance along it the same way.
+
+Build once per course (see OSMGolfFetcher.get_course_geometry); each query
+then costs O(log n) tree levels per point instead of a scan over every
+feature.
+"""
+
+import math
+import numpy as np
+
+from gps_converter import get_projection
+
+
+# Feature lists in get_course_details that are closed outlines
+POLYGON_KINDS = ("greens", "tees", "fairways", "bunkers", "water")
+
+# Children per tree node
+NODE_CAPACITY = 8
+
+# Lie categories, highest priority first (a bunker inside a fairway polygon
+# is a bunker); points outside every polygon are in the rough
+LIE_CATEGORIES = ("water", "bunker", "green", "tee", "fairway", "rough")
+_KIND_LIES = {"water": "water", "bunkers": "bunker", "greens": "green",
+              "tees": "tee", "fairways": "fairway"}
+
+# Hole snapping: farther than this from every hole path is "not on a hole"
+MAX_HOLE_OFFSET_M = 120.0
+# Extra distance charged to holes other than the previous one and the next,
+# so parallel holes don't flicker between location updates
+HOLE_SWITCH_PENALTY_M = 25.0
+
+
+def _ramp(counts):
+    """0..count-1 for each group, concatenated (counts must be positive)"""
+    starts = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(starts, counts)
+
+
+def _segment_distance(px, py, a, b):
+    """
+    Distance from points to segments a-b (row-aligned arrays).
+
+    Returns:
+        (distance, t) with t in [0, 1] the closest position along each segment
+    """
+    d = b - a
+    length_sq = np.maximum((d ** 2).sum(axis=1), 1e-12)
+    t = np.clip(((px - a[:, 0]) * d[:, 0] + (py - a[:, 1]) * d[:, 1]) / length_sq, 0, 1)
+    distance = np.hypot(a[:, 0] + t * d[:, 0] - px, a[:, 1] + t * d[:, 1] - py)
+    return distance, t
+
+
+class STRTree:
+    """
+    Static bounding-box tree packed with Sort-Tile-Recursive.
+
+    Items are sorted into vertical slices by box center x, then by center y
+    inside each slice, and grouped NODE_CAPACITY at a time; upper levels group
+    consecutive nodes the same way. Children of node i are therefore always
+    entries [i * capacity, (i + 1) * capacity) of the level below, so no
+    pointers are stored.
+    """
+
+    def __init__(self, boxes, ids=None, capacity=NODE_CAPACITY):
+        """
+        Args:
+            boxes: (N, 4) array of [min_x, min_y, max_x, max_y]
+            ids: Item ids returned by queries (default: 0..N-1)
+            capacity: Children per node
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        ids = np.arange(len(boxes)) if ids is None else np.asarray(ids)
+        self.capacity = capacity
+
+        # Sort-Tile-Recursive leaf order
+        n = len(boxes)
+        center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+        center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+        slices = max(1, math.ceil(math.sqrt(math.ceil(n / capacity)))) if n else 1
+        by_x = np.argsort(center_x, kind="stable")
+        slice_id = np.arange(n) // (slices * capacity)
+        order = by_x[np.lexsort((center_y[by_x], slice_id))]
+
+        self.ids = ids[order]
+        level = boxes[order]
+        self.levels = [level]
+        while len(level) > capacity:
+            starts = np.arange(0, len(level), capacity)
+            level = np.column_stack([
+                np.minimum.reduceat(level[:, 0], starts),
+                np.minimum.reduceat(level[:, 1], starts),
+                np.maximum.reduceat(level[:, 2], starts),
+                np.maximum.reduceat(level[:, 3], starts),
+            ])
+            self.levels.append(level)
+        self.levels.reverse()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def depth(self):
+        return len(self.levels)
+
+    def _descend(self, x, y, prune):
+        """
+        Walk the tree for many points at once.
+
+        Args:
+            x, y: (N,) query coordinates
+            prune: prune(point_index, boxes) -> mask of (point, box) pairs to keep
+
+        Returns:
+            (point_index, item_id) candidate pairs
+        """
+        top = len(self.levels[0])
+        point = np.repeat(np.arange(len(x)), top)
+        node = np.tile(np.arange(top), len(x))
+
+        for depth, boxes in enumerate(self.levels):
+            if depth > 0:
+                # Expand surviving nodes to their children one level down
+                counts = np.minimum(self.capacity, len(boxes) - node * self.capacity)
+                node = np.repeat(node * self.capacity, counts) + _ramp(counts)
+                point = np.repeat(point, counts)
+            keep = prune(point, boxes[node])
+            point, node = point[keep], node[keep]
+
+        return point, self.ids[node]
+
+    def query_points(self, x, y):
+        """
+        Items whose boxes contain each point.
+
+        Returns:
+            (point_index, item_id) pairs
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        def inside(point, boxes):
+            px, py = x[point], y[point]
+            return (boxes[:, 0] <= px) & (px <= boxes[:, 2]) & (boxes[:, 1] <= py) & (py <= boxes[:, 3])
+
+        return self._descend(x, y, inside)
+
+    def query_nearest(self, x, y, slack=0.0):
+        """
+        Items that may be nearest to each point.
+
+        A box's farthest corner bounds the distance to whatever it contains,
+        so any box whose nearest side is beyond the best such bound for its
+        point is skipped.
+
+        Args:
+            x, y: (N,) query coordinates
+            slack: Also keep items up to this much farther than the bound
+                (for callers that re-rank candidates by a penalized distance)
+
+        Returns:
+            (point_index, item_id) candidate pairs
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        def closer(point, boxes):
+            px, py = x[point], y[point]
+            dx = np.maximum(np.maximum(boxes[:, 0] - px, px - boxes[:, 2]), 0)
+            dy = np.maximum(np.maximum(boxes[:, 1] - py, py - boxes[:, 3]), 0)
+            far_x = np.maximum(np.abs(boxes[:, 0] - px), np.abs(boxes[:, 2] - px))
+            far_y = np.maximum(np.abs(boxes[:, 1] - py), np.abs(boxes[:, 3] - py))
+
+            bound = np.full(len(x), np.inf)
+            np.minimum.at(bound, point, far_x ** 2 + far_y ** 2)
+            if slack:
+                return np.hypot(dx, dy) <= np.sqrt(bound[point]) + slack
+            return dx ** 2 + dy ** 2 <= bound[point]
+
+        return self._descend(x, y, closer)
+
+
+class CourseGeometry:
+    """
+    Projected course polygons with an STR-tree index.
+
+    Polygons are numbered in POLYGON_KINDS order; polygon_kind and
+    feature_index map a polygon back to its entry in the features dict.
+    """
+
+    def __init__(self, features, origin=None):
+        """
+        Args:
+            features: Dict from OSMGolfFetcher.get_course_details
+            origin: (lat, lon) of the projection origin (default: mean vertex)
+        """
+        self.features = features
+
+        rings, kinds, indices = [], [], []
+        for kind_index, kind in enumerate(POLYGON_KINDS):
+            for feature_index, feature in enumerate(features.get(kind, [])):
+                coords = np.asarray(feature.get('coords') or [], dtype=np.float64).reshape(-1, 2)
+                # OSM closed ways repeat the first node at the end
+                if len(coords) > 1 and np.array_equal(coords[0], coords[-1]):
+                    coords = coords[:-1]
+                if len(coords) < 3:
+                    continue
+                rings.append(coords)
+                kinds.append(kind_index)
+                indices.append(feature_index)
+
+        # Hole paths (tee to green), numbered by their ref tag
+        paths, hole_numbers, self.hole_feature_index = [], [], []
+        for index, hole in enumerate(features.get('holes', [])):
+            coords = np.asarray(hole.get('coords') or [], dtype=np.float64).reshape(-1, 2)
+            if len(coords) < 2:
+                continue
+            ref = str(hole.get('ref') or '')
+            paths.append(coords)
+            hole_numbers.append(int(ref) if ref.isdigit() else index + 1)
+            self.hole_feature_index.append(index)
+
+        if origin is None:
+            vertices = rings + paths
+            origin = np.concatenate(vertices).mean(axis=0) if vertices else (0.0, 0.0)
+        self.projection = get_projection(round(float(origin[0]), 6), round(float(origin[1]), 6))
+
+        self.polygon_kind = np.array(kinds, dtype=np.int64)
+        self.feature_index = np.array(indices, dtype=np.int64)
+
+        # Edge arrays: polygon p owns edges [edge_offsets[p], edge_offsets[p + 1])
+        counts = np.array([len(ring) for ring in rings], dtype=np.int64)
+        self.edge_offsets = np.concatenate([[0], np.cumsum(counts)])
+        if rings:
+            lat, lon = np.concatenate(rings).T
+            east, north = self.projection.gps_to_enu(lat, lon)
+            start = np.column_stack([east, north])
+            # Each ring's last vertex connects back to its first
+            following = np.arange(len(start)) + 1
+            following[self.edge_offsets[1:] - 1] = self.edge_offsets[:-1]
+            self.edge_start, self.edge_end = start, start[following]
+            boxes = np.column_stack([
+                np.minimum.reduceat(east, self.edge_offsets[:-1]),
+                np.minimum.reduceat(north, self.edge_offsets[:-1]),
+                np.maximum.reduceat(east, self.edge_offsets[:-1]),
+                np.maximum.reduceat(north, self.edge_offsets[:-1]),
+            ])
+        else:
+            self.edge_start = self.edge_end = np.zeros((0, 2))
+            boxes = np.zeros((0, 4))
+        self.boxes = boxes
+
+        # One tree over everything plus one per kind for filtered lookups
+        self._trees = {None: STRTree(boxes)}
+        for kind_index, kind in enumerate(POLYGON_KINDS):
+            mask = self.polygon_kind == kind_index
+            self._trees[kind] = STRTree(boxes[mask], ids=np.flatnonzero(mask))
+
+        self._compile_holes(paths, hole_numbers)
+
+    def _compile_holes(self, paths, hole_numbers):
+        """Segment arrays and tree over the hole paths"""
+        self.hole_numbers = np.array(hole_numbers, dtype=np.int64)
+        self.hole_lengths = np.zeros(len(paths))
+
+        starts, ends, owners, along = [], [], [], []
+        for hole, path in enumerate(paths):
+            east, north = self.projection.gps_to_enu(path[:, 0], path[:, 1])
+            vertices = np.column_stack([east, north])
+            lengths = np.hypot(*np.diff(vertices, axis=0).T)
+            starts.append(vertices[:-1])
+            ends.append(vertices[1:])
+            owners.append(np.full(len(lengths), hole))
+            along.append(np.cumsum(lengths) - lengths)
+            self.hole_lengths[hole] = lengths.sum()
+
+        if paths:
+            self.segment_start, self.segment_end = np.concatenate(starts), np.concatenate(ends)
+            self.segment_hole = np.concatenate(owners)
+            self.segment_along = np.concatenate(along)
+        else:
+            self.segment_start = self.segment_end = np.zeros((0, 2))
+            self.segment_hole = np.zeros(0, dtype=np.int64)
+            self.segment_along = np.zeros(0)
+
+        self._hole_tree = STRTree(np.column_stack([
+            np.minimum(self.segment_start, self.segment_end),
+            np.maximum(self.segment_start, self.segment_end)
+        ]))
+
+    def __len__(self):
+        return len(self.polygon_kind)
+
+    def feature(self, polygon):
+        """Original feature dict for a polygon index"""
+        return self.features[POLYGON_KINDS[self.polygon_kind[polygon]]][self.feature_index[polygon]]
+
+    def hole_feature(self, hole_index):
+        """Original golf=hole feature dict for a compiled path index"""
+        return self.features['holes'][self.hole_feature_index[hole_index]]
+
+    def to_local(self, lat, lon):
+        """GPS to (east, north) meters in the course frame"""
+        return self.projection.gps_to_enu(np.atleast_1d(lat), np.atleast_1d(lon))
+
+    def _tree(self, kind):
+        if kind not in self._trees:
+            raise ValueError(f"Unknown feature kind: {kind}. Available: {', '.join(POLYGON_KINDS)}")
+        return self._trees[kind]
+
+    def _pair_edges(self, x, y, point, polygon):
+        """Expand (point, polygon) pairs to one row per polygon edge"""
+        counts = self.edge_offsets[polygon + 1] - self.edge_offsets[polygon]
+        edge = np.repeat(self.edge_offsets[polygon], counts) + _ramp(counts)
+        starts = np.cumsum(counts) - counts
+        return np.repeat(x[point], counts), np.repeat(y[point], counts), edge, starts
+
+    def _inside_pairs(self, x, y, point, polygon):
+        """Even-odd ray casting for each (point, polygon) pair"""
+        if len(point) == 0:
+            return np.zeros(0, dtype=bool)
+        px, py, edge, starts = self._pair_edges(x, y, point, polygon)
+        x1, y1 = self.edge_start[edge].T
+        x2, y2 = self.edge_end[edge].T
+
+        straddles = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        crosses = straddles & (px < crossing_x)
+        return np.add.reduceat(crosses.astype(np.int64), starts) % 2 == 1
+
+    def _edge_distances(self, x, y, point, polygon):
+        """Distance from each point to the closest edge of its paired polygon"""
+        px, py, edge, starts = self._pair_edges(x, y, point, polygon)
+        distance, _ = _segment_distance(px, py, self.edge_start[edge], self.edge_end[edge])
+        return np.minimum.reduceat(distance, starts)
+
+    def locate(self, lat, lon, kind=None):
+        """
+        Find every polygon containing each point.
+
+        Args:
+            lat, lon: Scalars or (N,) arrays
+            kind: Restrict to one of POLYGON_KINDS (default: all)
+
+        Returns:
+            (point_index, polygon_index) arrays, one entry per containing polygon
+        """
+        x, y = self.to_local(lat, lon)
+        point, polygon = self._tree(kind).query_points(x, y)
+        inside = self._inside_pairs(x, y, point, polygon)
+        return point[inside], polygon[inside]
+
+    def contains(self, lat, lon, kind=None):
+        """
+        Check whether each point lies inside any polygon (of a kind).
+
+        Returns:
+            (N,) bool array
+        """
+        point, _ = self.locate(lat, lon, kind)
+        result = np.zeros(np.size(lat), dtype=bool)
+        result[point] = True
+        return result
+
+    def kinds_at(self, lat, lon):
+        """
+        Feature kinds covering each point.
+
+        Returns:
+            (N, len(POLYGON_KINDS)) bool array, columns in POLYGON_KINDS order
+        """
+        point, polygon = self.locate(lat, lon)
+        result = np.zeros((np.size(lat), len(POLYGON_KINDS)), dtype=bool)
+        result[point, self.polygon_kind[polygon]] = True
+        return result
+
+    def nearest(self, lat, lon, kind=None):
+        """
+        Nearest polygon to each point.
+
+        Args:
+            lat, lon: Scalars or (N,) arrays
+            kind: Restrict to one of POLYGON_KINDS (default: all)
+
+        Returns:
+            (polygon_index, distance_m) arrays of length N. Distance is 0
+            inside a polygon; index is -1 when there are no polygons.
+        """
+        x, y = self.to_local(lat, lon)
+        polygon_index = np.full(len(x), -1, dtype=np.int64)
+        distance = np.full(len(x), np.inf)
+
+        point, polygon = self._tree(kind).query_nearest(x, y)
+        if len(point) == 0:
+            return polygon_index, distance
+
+        pair_distance = self._edge_distances(x, y, point, polygon)
+        pair_distance[self._inside_pairs(x, y, point, polygon)] = 0.0
+
+        # Closest candidate per point
+        order = np.lexsort((pair_distance, point))
+        first = np.unique(point[order], return_index=True)[1]
+        best = order[first]
+        polygon_index[point[best]] = polygon[best]
+        distance[point[best]] = pair_distance[best]
+        return polygon_index, distance
+
+    def classify_lies(self, lat, lon):
+        """
+        Lie category of each point.
+
+        Args:
+            lat, lon: Scalars or (N,) arrays
+
+        Returns:
+            (N,) int array of indices into LIE_CATEGORIES
+        """
+        kinds = self.kinds_at(lat, lon)
+
+        # Columns reordered by lie priority, plus an always-true rough column
+        columns = [POLYGON_KINDS.index(kind) for kind, lie in _KIND_LIES.items()]
+        ranked = np.column_stack([kinds[:, columns], np.ones(len(kinds), dtype=bool)])
+        priority = [LIE_CATEGORIES.index(lie) for lie in _KIND_LIES.values()] + [len(LIE_CATEGORIES) - 1]
+        return np.asarray(priority)[np.argmax(ranked, axis=1)]
+
+    def lie_probabilities(self, lat, lon, groups=None, num_groups=None):
+        """
+        Fraction of points in each lie, e.g. per archetype of a landing ensemble.
+
+        Args:
+            lat, lon: (N,) arrays
+            groups: (N,) group index per point (default: one group)
+            num_groups: Number of groups (default: max(groups) + 1)
+
+        Returns:
+            (num_groups, len(LIE_CATEGORIES)) array, rows sum to 1 (0 if empty)
+        """
+        lies = self.classify_lies(lat, lon)
+        groups = np.zeros(len(lies), dtype=np.int64) if groups is None else np.asarray(groups)
+        num_groups = num_groups or (int(groups.max()) + 1 if len(groups) else 1)
+
+        counts = np.bincount(groups * len(LIE_CATEGORIES) + lies,
+                             minlength=num_groups * len(LIE_CATEGORIES))
+        counts = counts.reshape(num_groups, len(LIE_CATEGORIES)).astype(np.float64)
+        return counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+    def locate_hole(self, lat, lon, previous_hole=None):
+        """
+        Snap GPS fixes to the most likely current hole.
+
+        Each fix goes to the nearest hole path segment. Holes other than
+        previous_hole and the one after it are charged HOLE_SWITCH_PENALTY_M,
+        so a player between parallel holes stays on the hole being played.
+        The next hole wraps around the course (18 -> 1, or 9 -> 1 on a
+        nine-hole course), with the hole count taken as the highest number.
+
+        Args:
+            lat, lon: Scalars or (N,) arrays
+            previous_hole: Last known hole number (scalar or per fix), optional
+
+        Returns:
+            Dict of (N,) arrays:
+                hole: Hole number (-1 if no path within MAX_HOLE_OFFSET_M)
+                hole_index: Compiled path index (see hole_feature), -1 if none
+                distance_along_m: Distance from the tee along the hole path
+                distance_to_green_m: Remaining distance along the path
+                offset_m: Distance from the hole path
+        """
+        x, y = self.to_local(lat, lon)
+        n = len(x)
+        result = {
+            'hole': np.full(n, -1, dtype=np.int64),
+            'hole_index': np.full(n, -1, dtype=np.int64),
+            'distance_along_m': np.full(n, np.nan),
+            'distance_to_green_m': np.full(n, np.nan),
+            'offset_m': np.full(n, np.inf)
+        }
+
+        point, segment = self._hole_tree.query_nearest(
+            x, y, slack=HOLE_SWITCH_PENALTY_M if previous_hole is not None else 0.0
+        )
+        if len(point) == 0:
+            return result
+
+        a, b = self.segment_start[segment], self.segment_end[segment]
+        offset, t = _segment_distance(x[point], y[point], a, b)
+        hole = self.segment_hole[segment]
+
+        score = offset
+        if previous_hole is not None:
+            previous = np.broadcast_to(np.asarray(previous_hole, dtype=np.int64), (n,))[point]
+            number = self.hole_numbers[hole]
+            following = previous % self.hole_numbers.max() + 1
+            score = offset + HOLE_SWITCH_PENALTY_M * ((number != previous) & (number != following))
+
+        # Best-scoring segment per fix
+        order = np.lexsort((score, point))
+        best = order[np.unique(point[order], return_index=True)[1]]
+        fix, hole, segment = point[best], hole[best], segment[best]
+
+        along = self.segment_along[segment] + t[best] * np.hypot(*(b[best] - a[best]).T)
+        on_hole = offset[best] <= MAX_HOLE_OFFSET_M
+
+        result['offset_m'][fix] = offset[best]
+        fix, hole, along = fix[on_hole], hole[on_hole], along[on_hole]
+        result['hole'][fix] = self.hole_numbers[hole]
+        result['hole_index'][fix] = hole
+        result['distance_along_m'][fix] = along
+        result['distance_to_green_m'][fix] = self.hole_lengths[hole] - along
+        return result
+
+    def summary(self):
+        """Polygon counts and index shape"""
+        counts = np.bincount(self.polygon_kind, minlength=len(POLYGON_KINDS))
+        return {
+            'polygons': len(self),
+            'edges': len(self.edge_start),
+            'holes': len(self.hole_numbers),
+            'tree_depth': self._trees[None].depth,
+            **{kind: int(count) for kind, count in zip(POLYGON_KINDS, counts)}
+        }
+
+
+if __name__ == "__main__":
+    """Benchmark the tree against a linear scan on a synthetic course"""
+    import time
+
+    print("Course Geometry Test")
+    print("=" * 60)
+
+    # Synthetic 18-hole course: a row of holes, each with tee, fairway, green, bunkers
+    rng = np.random.default_rng(7)
+    base = get_projection(36.5725, -121.9486)
+
+    def outline(east, north, radius_e, radius_n, vertices=24):
+        angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+        wobble = 1 + 0.1 * rng.standard_normal(vertices)
+        lat, lon = base.enu_to_gps(east + radius_e * wobble * np.cos(angles),
+                                   north + radius_n * wobble * np.sin(angles))
+        return {'coords': list(zip(lat, lon))}
+
+    features = {kind: [] for kind in POLYGON_KINDS + ('pins', 'holes')}
+    for hole in range(18):
+        east = (hole % 6) * 120.0
+        north = (hole // 6) * 450.0
+        features['tees'].append(outline(east, north, 8, 12))
+        hole_lat, hole_lon = base.enu_to_gps(np.array([east, east + 5, east]),
+                                             np.array([north, north + 220, north + 380]))
+        features['holes'].append({'coords': list(zip(hole_lat, hole_lon)), 'ref': str(hole + 1)})
+        features['fairways'].append(outline(east, north + 220, 25, 110, vertices=48))
+        features['greens'].append(outline(east, north + 380, 15, 15, vertices=32))
+        for side in (-1, 1):
+            features['bunkers'].append(outline(east + side * 22, north + 360, 6, 8))
+    features['water'].append(outline(330, 700, 40, 60, vertices=64))
+
+    start_time = time.perf_counter()
+    geometry = CourseGeometry(features)
+    build_ms = (time.perf_counter() - start_time) * 1000
+    print(f"Built in {build_ms:.2f} ms: {geometry.summary()}")
+
+    # Landing points spread over the whole property
+    n = 10000
+    lat, lon = base.enu_to_gps(rng.uniform(-50, 700, n), rng.uniform(-50, 1300, n))
+
+    start_time = time.perf_counter()
+    kinds = geometry.kinds_at(lat, lon)
+    query_ms = (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    green, green_distance = geometry.nearest(lat, lon, kind='greens')
+    nearest_ms = (time.perf_counter() - start_time) * 1000
+
+    # Linear reference: test every polygon against every point
+    start_time = time.perf_counter()
+    x, y = geometry.to_local(lat, lon)
+    reference = np.zeros_like(kinds)
+    for polygon in range(len(geometry)):
+        inside = geometry._inside_pairs(x, y, np.arange(n), np.full(n, polygon))
+        reference[inside, geometry.polygon_kind[polygon]] = True
+    linear_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f"\n{n} points:")
+    print(f"  Point-in-polygon (tree):   {query_ms:7.2f} ms")
+    print(f"  Point-in-polygon (linear): {linear_ms:7.2f} ms "
+          f"({'match' if np.array_equal(kinds, reference) else 'MISMATCH'})")
+    print(f"  Nearest green:             {nearest_ms:7.2f} ms")
+
+    for kind, fraction in zip(POLYGON_KINDS, kinds.mean(axis=0)):
+        print(f"    {kind:9s} {fraction * 100:5.1f}% of points")
+    print(f"  Median distance to nearest green: {np.median(green_distance):.1f} m")
+
+    # Lies of a landing ensemble: 2000 members around each of three targets
+    targets = [(0, 220), (0, 370), (22, 360)]
+    east = np.concatenate([t[0] + rng.normal(0, 12, 2000) for t in targets])
+    north = np.concatenate([t[1] + rng.normal(0, 15, 2000) for t in targets])
+    lat, lon = base.enu_to_gps(east, north)
+
+    start_time = time.perf_counter()
+    probabilities = geometry.lie_probabilities(lat, lon, np.repeat(np.arange(3), 2000))
+    lie_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f"\nLie probabilities for {len(lat)} ensemble members ({lie_ms:.2f} ms):")
+    for name, row in zip(["fairway", "green", "greenside bunker"], probabilities):
+        print(f"  {name:17s} " + ", ".join(
+            f"{lie} {p * 100:.0f}%" for lie, p in zip(LIE_CATEGORIES, row) if p >= 0.005))
+
+    # Current hole for many players at once, then one player on hole 2 walking
+    # across towards hole 1 (the paths are 120m apart)
+    lat, lon = base.enu_to_gps(rng.uniform(-50, 700, n), rng.uniform(-50, 1300, n))
+    start_time = time.perf_counter()
+    snapped = geometry.locate_hole(lat, lon)
+    hole_ms = (time.perf_counter() - start_time) * 1000
+    print(f"\nCurrent hole for {n} GPS fixes: {hole_ms:.2f} ms "
+          f"({(snapped['hole'] > 0).mean() * 100:.0f}% on a hole)")
+
+    walk_east = np.array([120, 90, 70, 60, 50, 30, 0])
+    lat, lon = base.enu_to_gps(walk_east, np.full(len(walk_east), 150.0))
+    free = geometry.locate_hole(lat, lon)['hole']
+    sticky, hole = [], 2
+    for fix_lat, fix_lon in zip(lat, lon):
+        hole = int(geometry.locate_hole(fix_lat, fix_lon, previous_hole=hole)['hole'][0])
+        sticky.append(hole)
+    print(f"  Walking west through east = {walk_east.tolist()} m, 150m from the tees:")
+    print(f"    nearest path:        {free.tolist()}")
+    print(f"    with previous hole:  {sticky}")
+
+    print("\n" + "=" * 60)
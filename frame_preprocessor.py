@@ -0,0 +1,323 @@
+"""
+Shared Frame Preprocessing
+
+One preprocessing pipeline for every ball detector (BallDetector,
+HybridBallDetector, ONNXBallDetector):
+1. Hough input, in three profiles (see PREPROCESSING_PROFILES):
+   - fast:     percentile contrast stretch (256-entry LUT) -> 5x5 box blur
+   - balanced: CLAHE -> wider Gaussian blur (7x7, sigma 2)
+   - quality:  CLAHE -> bilateral filter -> Gaussian blur
+2. YOLO input: letterbox resize -> normalize to [0, 1] -> HWC to CHW, written
+   straight into a preallocated NCHW batch tensor
+
+The CLAHE object is created once, and every intermediate image lives in a
+buffer cached per resolution and written with OpenCV's dst= arguments, so
+steady-state frames allocate nothing. Returned arrays are those buffers:
+they are overwritten by the next call, so copy anything that must outlive it.
+Use one instance per detector. Buffers are not thread-safe: a detector
+shared across threads must hold a lock from the fill until it is done
+reading the result (see HybridBallDetector).
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+YOLO_INPUT_SIZE = 640  # YOLOv8 expects 640x640
+LETTERBOX_FILL = 114   # Gray padding, as used when training YOLOv8
+
+# Buffers kept, least recently used evicted first (ROI and motion-gate
+# crops vary in size; the full-frame buffers stay hot)
+MAX_CACHED_BUFFERS = 32
+
+# Hough preprocessing profiles, cheapest first
+PREPROCESSING_PROFILES = ("fast", "balanced", "quality")
+DEFAULT_PROFILE = "quality"
+
+# Gray levels below/above these percentiles are clipped by the fast stretch
+STRETCH_PERCENTILES = (1.0, 99.0)
+
+
+class FramePreprocessor:
+    """Preprocessing with cached filters and reusable per-resolution buffers."""
+
+    def __init__(self, clip_limit=2.0, tile_grid_size=(8, 8),
+                 bilateral_d=5, bilateral_sigma=75, blur_ksize=(5, 5), blur_sigma=1.0):
+        """
+        Args:
+            clip_limit: CLAHE contrast limit
+            tile_grid_size: CLAHE tile grid
+            bilateral_d: Bilateral filter neighbourhood diameter
+            bilateral_sigma: Bilateral filter color and space sigma
+            blur_ksize: Gaussian blur kernel
+            blur_sigma: Gaussian blur sigma
+        """
+        self.clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size)
+        self.bilateral_d = bilateral_d
+        self.bilateral_sigma = bilateral_sigma
+        self.blur_ksize = blur_ksize
+        self.blur_sigma = blur_sigma
+
+        self._buffers = OrderedDict()
+        self._levels = np.arange(256, dtype=np.float32)
+        self._lut_float = np.empty(256, dtype=np.float32)
+        self._lut = np.empty(256, dtype=np.uint8)
+        self._histogram = np.empty((256, 1), dtype=np.float32)
+        self._cdf = np.empty(256, dtype=np.float32)
+        self._tensor = np.empty((0, 3, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE), dtype=np.float32)
+
+    def _buffer(self, name, shape, dtype=np.uint8):
+        """Get (or create) the reusable buffer for a stage and shape"""
+        key = (name, shape, dtype)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            if len(self._buffers) >= MAX_CACHED_BUFFERS:
+                self._buffers.popitem(last=False)  # Least recently used
+            buffer = self._buffers[key] = np.empty(shape, dtype=dtype)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer
+
+    def grayscale(self, frame):
+        """
+        BGR frame (or ROI view) to grayscale.
+
+        Returns:
+            Reused uint8 buffer
+        """
+        gray = self._buffer("gray", frame.shape[:2])
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+
+    def blur(self, frame, ksize=(7, 7), sigma=1.5):
+        """
+        Grayscale plus Gaussian blur only (the cheap Hough input).
+
+        Returns:
+            Reused uint8 buffer
+        """
+        gray = self.grayscale(frame)
+        return cv2.GaussianBlur(gray, ksize, sigma, dst=gray)
+
+    def enhance(self, frame):
+        """
+        Full Hough input: grayscale -> CLAHE -> bilateral -> Gaussian blur.
+
+        Args:
+            frame: BGR frame or ROI view
+
+        Returns:
+            Reused uint8 buffer
+        """
+        shape = frame.shape[:2]
+        gray = self.grayscale(frame)
+        equalized = self.clahe.apply(gray, dst=self._buffer("clahe", shape))
+
+        # Bilateral can't run in place; the blur can, back into the CLAHE buffer
+        filtered = cv2.bilateralFilter(equalized, self.bilateral_d, self.bilateral_sigma,
+                                       self.bilateral_sigma, dst=self._buffer("bilateral", shape))
+        return cv2.GaussianBlur(filtered, self.blur_ksize, self.blur_sigma, dst=equalized)
+
+    def stretch(self, frame):
+        """
+        Grayscale with a percentile contrast stretch through a 256-entry LUT.
+
+        Costs a histogram and a table lookup, a fraction of CLAHE.
+
+        Returns:
+            Reused uint8 buffer
+        """
+        gray = self.grayscale(frame)
+        cv2.calcHist([gray], [0], None, [256], [0, 256], hist=self._histogram)
+        np.cumsum(self._histogram[:, 0], out=self._cdf)
+
+        total = self._cdf[-1]
+        low = int(np.searchsorted(self._cdf, total * STRETCH_PERCENTILES[0] / 100))
+        high = int(np.searchsorted(self._cdf, total * STRETCH_PERCENTILES[1] / 100))
+        if high <= low:
+            return gray  # Flat image, nothing to stretch
+
+        np.subtract(self._levels, low, out=self._lut_float)
+        np.multiply(self._lut_float, 255.0 / (high - low), out=self._lut_float)
+        np.clip(self._lut_float, 0, 255, out=self._lut_float)
+        np.copyto(self._lut, self._lut_float, casting="unsafe")
+        return cv2.LUT(gray, self._lut, dst=self._buffer("stretch", gray.shape))
+
+    def preprocess(self, frame, profile=DEFAULT_PROFILE):
+        """
+        Hough input for a preprocessing profile.
+
+        Args:
+            frame: BGR frame or ROI view
+            profile: One of PREPROCESSING_PROFILES
+
+        Returns:
+            Reused uint8 buffer
+        """
+        if profile == "quality":
+            return self.enhance(frame)
+
+        if profile == "balanced":
+            # A wider blur stands in for the bilateral filter's noise suppression
+            equalized = self.clahe.apply(self.grayscale(frame), dst=self._buffer("clahe", frame.shape[:2]))
+            return cv2.GaussianBlur(equalized, (7, 7), 2.0, dst=equalized)
+
+        if profile == "fast":
+            stretched = self.stretch(frame)
+            return cv2.blur(stretched, (5, 5), dst=self._buffer("box", frame.shape[:2]))
+
+        raise ValueError(f"Unknown preprocessing profile: {profile}. "
+                         f"Available: {', '.join(PREPROCESSING_PROFILES)}")
+
+    def tensor(self, batch_size):
+        """
+        NCHW float32 YOLO input for a batch, grown to the largest batch seen.
+
+        Returns:
+            View of the first batch_size slots
+        """
+        if len(self._tensor) < batch_size:
+            self._tensor = np.empty((batch_size, 3, YOLO_INPUT_SIZE, YOLO_INPUT_SIZE), dtype=np.float32)
+        return self._tensor[:batch_size]
+
+    def letterbox(self, frame, index):
+        """
+        Resize a frame (aspect preserved) into slot `index` of the tensor.
+
+        Call tensor(batch_size) first.
+
+        Returns:
+            (scale, pad_x, pad_y) to map model coordinates back to the frame
+        """
+        original_h, original_w = frame.shape[:2]
+        scale = min(YOLO_INPUT_SIZE / original_w, YOLO_INPUT_SIZE / original_h)
+        new_w, new_h = round(original_w * scale), round(original_h * scale)
+        pad_x, pad_y = (YOLO_INPUT_SIZE - new_w) // 2, (YOLO_INPUT_SIZE - new_h) // 2
+
+        resized = cv2.resize(frame, (new_w, new_h), dst=self._buffer("resized", (new_h, new_w, 3)))
+        normalized = cv2.multiply(resized, 1 / 255.0, dtype=cv2.CV_32F,
+                                  dst=self._buffer("normalized", (new_h, new_w, 3), np.float32))
+
+        slot = self._tensor[index]
+        slot.fill(LETTERBOX_FILL / 255.0)
+        region = slot[:, pad_y:pad_y + new_h, pad_x:pad_x + new_w]
+        np.copyto(region, normalized.transpose(2, 0, 1))  # HWC to CHW
+
+        return scale, pad_x, pad_y
+
+
+def benchmark_profiles(frames, detect, truth=None, tolerance_px=8,
+                       profiles=PREPROCESSING_PROFILES, preprocessor=None):
+    """
+    Measure per-frame cost and detection rate of each preprocessing profile.
+
+    Args:
+        frames: BGR frames (or ROI crops)
+        detect: detect(gray) -> (x, y) or None, e.g. a HoughCircles call
+        truth: Optional true (x, y) per frame; detections farther than
+            tolerance_px count as misses
+        tolerance_px: Allowed detection error
+        profiles: Profiles to compare
+        preprocessor: FramePreprocessor (default: new instance)
+
+    Returns:
+        Dict of profile -> {"preprocess_ms", "total_ms", "detection_rate"}
+    """
+    import time
+
+    preprocessor = preprocessor or FramePreprocessor()
+    report = {}
+
+    for profile in profiles:
+        preprocessor.preprocess(frames[0], profile)  # Warm the buffers
+        preprocess_time = total_time = 0.0
+        hits = 0
+
+        for i, frame in enumerate(frames):
+            start_time = time.perf_counter()
+            gray = preprocessor.preprocess(frame, profile)
+            preprocess_time += time.perf_counter() - start_time
+            found = detect(gray)
+            total_time += time.perf_counter() - start_time
+
+            if found is not None and (truth is None or
+                                      np.hypot(found[0] - truth[i][0], found[1] - truth[i][1]) <= tolerance_px):
+                hits += 1
+
+        report[profile] = {
+            "preprocess_ms": preprocess_time * 1000 / len(frames),
+            "total_ms": total_time * 1000 / len(frames),
+            "detection_rate": hits / len(frames)
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    """Check the output matches the per-call pipeline and measure allocations"""
+    import time
+    import tracemalloc
+
+    print("Frame Preprocessor Test")
+    print("=" * 60)
+
+    frame = np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    preprocessor = FramePreprocessor()
+
+    def reference(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        gray = cv2.bilateralFilter(gray, 5, 75, 75)
+        return cv2.GaussianBlur(gray, (5, 5), 1.0)
+
+    match = np.array_equal(preprocessor.enhance(frame), reference(frame))
+    print(f"Hough input matches per-call pipeline: {match}")
+
+    for name, run in [("per-call", lambda: reference(frame)),
+                      ("preprocessor", lambda: preprocessor.enhance(frame)),
+                      ("letterbox", lambda: (preprocessor.tensor(1), preprocessor.letterbox(frame, 0)))]:
+        run()  # Warm the buffers
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        for _ in range(20):
+            run()
+        elapsed_ms = (time.perf_counter() - start_time) * 1000 / 20
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:13s} {elapsed_ms:6.2f} ms/frame, peak traced allocation {peak / 1024:8.1f} KB")
+
+    # Profile report: 1280x720 grass-textured frames with a ball in flight,
+    # full-frame (acquisition) and 100x100 crops around it (ROI tracking).
+    # The fast stretch amplifies the grass texture into thousands of Hough
+    # circles on a full frame (seconds per frame), so it's only measured on
+    # ROI crops, which is what it's for.
+    rng = np.random.default_rng(1)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, (720, 1280), dtype=np.uint8), (0, 0), 3)
+    frames, truth = [], []
+    for i in range(30):
+        frame = np.dstack([texture // 8 + 40, texture // 6 + 80, texture // 8 + 40]).astype(np.uint8)
+        center = (200 + 30 * i, 600 - 15 * i)
+        cv2.circle(frame, center, 7, (235, 235, 235), -1)
+        noise = rng.normal(0, 6, frame.shape)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+        truth.append(center)
+
+    def hough(gray, max_radius):
+        circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, dp=1.2, minDist=20, param1=45,
+                                   param2=18, minRadius=2, maxRadius=max_radius)
+        return None if circles is None else circles[0, 0, :2]
+
+    crops = [frame[cy - 50:cy + 50, cx - 50:cx + 50] for frame, (cx, cy) in zip(frames, truth)]
+    phases = [
+        ("Acquisition (1280x720)", frames, truth, 60, ("balanced", "quality")),
+        ("ROI tracking (100x100)", crops, [(50, 50)] * len(crops), 40, PREPROCESSING_PROFILES)
+    ]
+    for title, images, centers, max_radius, profiles in phases:
+        report = benchmark_profiles(images, lambda gray: hough(gray, max_radius), centers, profiles=profiles)
+        print(f"\n{title}:")
+        for profile, stats in report.items():
+            print(f"  {profile:9s} preprocess {stats['preprocess_ms']:6.2f} ms, "
+                  f"total {stats['total_ms']:6.2f} ms, detected {stats['detection_rate'] * 100:5.1f}%")
+
+    print("\n" + "=" * 60)
@@ -6,18 +6,15 @@ Exports to JSON for instant AR overlay rendering
 
 import json
 import math
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+import os
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, Tuple, Optional
 from pathlib import Path
-
-
-@dataclass
-class TrajectoryPoint:
-    """Single point in a trajectory."""
-    x: float  # meters (forward)
-    y: float  # meters (height)
-    z: float  # meters (lateral curve)
-    t: float  # seconds
+from archetype_table_format import encode_binary_tables
+from trajectory_array import TrajectoryArray
 
 
 @dataclass
@@ -50,6 +47,27 @@ ARCHETYPES = [
 ]
 
 
+# Speed variants as percent of the archetype's typical ball speed
+SPEED_PERCENTAGES = [60, 70, 80, 90, 100, 110, 120]
+
+# Integration step (seconds)
+DEFAULT_DT = 0.02
+
+# Physics constants used by calculate_trajectory
+PHYSICS_CONSTANTS = {
+    "gravity": 9.81,          # m/s²
+    "air_density": 1.225,     # kg/m³
+    "ball_mass": 0.0459,      # kg
+    "ball_radius": 0.02135,   # meters
+    "drag_coefficient": 0.25,
+    "lift_coefficient": 0.15,  # Magnus
+}
+
+# Bump when calculate_trajectory changes in a way the inputs don't capture,
+# so every cached variant is recomputed on the next build
+PHYSICS_MODEL_VERSION = 1
+
+
 def mph_to_ms(mph: float) -> float:
     """Convert miles per hour to meters per second."""
     return mph * 0.44704
@@ -58,8 +76,9 @@ def mph_to_ms(mph: float) -> float:
 def calculate_trajectory(
     archetype: ShotArchetype,
     speed_multiplier: float = 1.0,
-    dt: float = 0.02
-) -> List[TrajectoryPoint]:
+    dt: float = DEFAULT_DT,
+    physics: Optional[Dict] = None
+) -> TrajectoryArray:
     """
     Calculate full trajectory for a shot archetype.
     
@@ -67,7 +86,12 @@ def calculate_trajectory(
     - Gravity
     - Air resistance (drag)
     - Magnus effect (spin-induced curve)
+    
+    Returns:
+        TrajectoryArray with x (forward), y (height), z (lateral curve)
+        in meters and t in seconds
     """
+    physics = physics or PHYSICS_CONSTANTS
     
     # Initial conditions
     v0 = mph_to_ms(archetype.ball_speed * speed_multiplier)
@@ -81,25 +105,25 @@ def calculate_trajectory(
     t = 0.0
     
     # Physics constants
-    g = 9.81  # gravity (m/s²)
-    rho = 1.225  # air density (kg/m³)
+    g = physics["gravity"]
+    rho = physics["air_density"]
     
     # Golf ball properties
-    mass = 0.0459  # kg
-    radius = 0.02135  # meters
+    mass = physics["ball_mass"]
+    radius = physics["ball_radius"]
     area = math.pi * radius ** 2
-    cd = 0.25  # drag coefficient
-    cl = 0.15  # lift coefficient (Magnus)
+    cd = physics["drag_coefficient"]
+    cl = physics["lift_coefficient"]
     
     # Spin effects
     spin_rad_s = archetype.spin_rate * 2 * math.pi / 60  # convert RPM to rad/s
     spin_axis_rad = math.radians(archetype.spin_axis)
     
-    trajectory = []
+    rows = []
     
     while y >= 0 or t < 0.1:  # Continue until ball lands
         # Record point
-        trajectory.append(TrajectoryPoint(x=x, y=y, z=z, t=t))
+        rows.append((x, y, z, t))
         
         # Calculate velocity magnitude
         v = math.sqrt(vx**2 + vy**2 + vz**2)
@@ -140,7 +164,7 @@ def calculate_trajectory(
         if t > 15:
             break
     
-    return trajectory
+    return TrajectoryArray.from_array(rows, ("x", "y", "z", "t"))
 
 
 def meters_to_yards(m: float) -> float:
@@ -148,50 +172,126 @@ def meters_to_yards(m: float) -> float:
     return m * 1.09361
 
 
+def variant_hash(
+    archetype: ShotArchetype,
+    speed_pct: int,
+    dt: float = DEFAULT_DT,
+    physics: Optional[Dict] = None
+) -> str:
+    """
+    Content hash of everything a speed variant is computed from.
+    
+    Covers the archetype parameters, speed level, physics constants,
+    time step and PHYSICS_MODEL_VERSION.
+    """
+    inputs = {
+        "archetype": asdict(archetype),
+        "speed_pct": speed_pct,
+        "dt": dt,
+        "physics": physics or PHYSICS_CONSTANTS,
+        "model_version": PHYSICS_MODEL_VERSION
+    }
+    encoded = json.dumps(inputs, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def compute_variant(
+    archetype: ShotArchetype,
+    speed_pct: int,
+    dt: float = DEFAULT_DT,
+    physics: Optional[Dict] = None
+) -> Dict:
+    """
+    Compute one archetype speed variant (runs in worker processes).
+    
+    Returns:
+        Serializable variant entry, tagged with its input_hash
+    """
+    multiplier = speed_pct / 100.0
+    trajectory = calculate_trajectory(archetype, multiplier, dt, physics)
+    
+    # Convert to serializable format
+    points = trajectory.to_dicts(decimals=3)
+    
+    # Calculate summary stats
+    max_height = float(trajectory.y.max())
+    total_distance = float(trajectory.x[-1]) if len(trajectory) else 0
+    total_curve = float(trajectory.z[-1]) if len(trajectory) else 0
+    flight_time = float(trajectory.t[-1]) if len(trajectory) else 0
+    
+    return {
+        "speed_mph": round(archetype.ball_speed * multiplier, 1),
+        "carry_yards": round(meters_to_yards(total_distance), 1),
+        "max_height_yards": round(meters_to_yards(max_height), 1),
+        "curve_yards": round(meters_to_yards(abs(total_curve)), 1),
+        "curve_direction": "right" if total_curve > 0 else "left" if total_curve < 0 else "straight",
+        "flight_time_seconds": round(flight_time, 2),
+        "input_hash": variant_hash(archetype, speed_pct, dt, physics),
+        "points": points
+    }
+
+
+def _compute_variant_task(task: Tuple) -> Tuple:
+    """Process pool entry point: (name, pct, archetype, dt, physics) -> (name, pct, variant)."""
+    name, speed_pct, archetype, dt, physics = task
+    return name, speed_pct, compute_variant(archetype, speed_pct, dt, physics)
+
+
 def generate_speed_variants(archetype: ShotArchetype) -> Dict:
     """
     Generate trajectory tables for different club speeds.
     Covers range from 60% to 120% of typical speed.
     """
     
-    variants = {}
+    return {
+        f"{speed_pct}pct": compute_variant(archetype, speed_pct)
+        for speed_pct in SPEED_PERCENTAGES
+    }
+
+
+def load_previous_variants(path: Path) -> Dict[str, Dict]:
+    """
+    Index the variants of a previous build by input hash.
     
-    for speed_pct in [60, 70, 80, 90, 100, 110, 120]:
-        multiplier = speed_pct / 100.0
-        trajectory = calculate_trajectory(archetype, multiplier)
-        
-        # Convert to serializable format
-        points = [
-            {
-                "x": round(p.x, 3),
-                "y": round(p.y, 3),
-                "z": round(p.z, 3),
-                "t": round(p.t, 3)
-            }
-            for p in trajectory
-        ]
-        
-        # Calculate summary stats
-        max_height = max(p.y for p in trajectory)
-        total_distance = trajectory[-1].x if trajectory else 0
-        total_curve = trajectory[-1].z if trajectory else 0
-        flight_time = trajectory[-1].t if trajectory else 0
-        
-        variants[f"{speed_pct}pct"] = {
-            "speed_mph": round(archetype.ball_speed * multiplier, 1),
-            "carry_yards": round(meters_to_yards(total_distance), 1),
-            "max_height_yards": round(meters_to_yards(max_height), 1),
-            "curve_yards": round(meters_to_yards(abs(total_curve)), 1),
-            "curve_direction": "right" if total_curve > 0 else "left" if total_curve < 0 else "straight",
-            "flight_time_seconds": round(flight_time, 2),
-            "points": points
-        }
+    Returns:
+        Dict of input_hash -> variant (empty if no usable previous build)
+    """
+    if not path.exists():
+        return {}
     
-    return variants
+    try:
+        with open(path, 'r') as f:
+            previous = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Could not read previous tables ({e}), rebuilding everything")
+        return {}
+    
+    cached = {}
+    for archetype_data in previous.get("archetypes", {}).values():
+        for variant in archetype_data.get("variants", {}).values():
+            if "input_hash" in variant:
+                cached[variant["input_hash"]] = variant
+    return cached
 
 
-def generate_all_lookup_tables() -> Dict:
-    """Generate complete lookup tables for all archetypes."""
+def generate_all_lookup_tables(
+    previous_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    dt: float = DEFAULT_DT,
+    report: Optional[Dict] = None
+) -> Dict:
+    """
+    Generate complete lookup tables for all archetypes.
+    
+    Variants whose input hash matches the previous build are reused; the
+    rest fan out over a process pool.
+    
+    Args:
+        previous_path: Previous archetype_lookup_tables.json to reuse from
+        workers: Worker processes (default: CPU count, 1 = serial)
+        dt: Integration step in seconds
+        report: Optional dict filled with computed/reused counts and timings
+    """
     
     tables = {
         "version": "1.0",
@@ -206,11 +306,40 @@ def generate_all_lookup_tables() -> Dict:
         "archetypes": {}
     }
     
+    start_time = time.perf_counter()
+    cached = load_previous_variants(previous_path) if previous_path else {}
+    
+    # Reuse unchanged variants, queue the rest
+    variants = {archetype.name: {} for archetype in ARCHETYPES}
+    tasks = []
+    for archetype in ARCHETYPES:
+        for speed_pct in SPEED_PERCENTAGES:
+            key = variant_hash(archetype, speed_pct, dt)
+            if key in cached:
+                variants[archetype.name][speed_pct] = cached[key]
+            else:
+                tasks.append((archetype.name, speed_pct, archetype, dt, PHYSICS_CONSTANTS))
+    
+    reused = sum(len(v) for v in variants.values())
+    print(f"Reusing {reused} variants, computing {len(tasks)}...")
+    
+    compute_start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for done, (name, speed_pct, variant) in enumerate(
+                    pool.map(_compute_variant_task, tasks, chunksize=chunksize), 1):
+                variants[name][speed_pct] = variant
+                print(f"  [{done}/{len(tasks)}] {name} {speed_pct}%")
+    else:
+        for done, task in enumerate(tasks, 1):
+            name, speed_pct, variant = _compute_variant_task(task)
+            variants[name][speed_pct] = variant
+            print(f"  [{done}/{len(tasks)}] {name} {speed_pct}%")
+    compute_time = time.perf_counter() - compute_start
+    
     for archetype in ARCHETYPES:
-        print(f"Generating: {archetype.name}...")
-        
-        variants = generate_speed_variants(archetype)
-        
         tables["archetypes"][archetype.name] = {
             "display_name": archetype.name.replace("_", " ").title(),
             "typical_spin_rpm": archetype.spin_rate,
@@ -218,12 +347,42 @@ def generate_all_lookup_tables() -> Dict:
             "typical_launch_angle": archetype.launch_angle,
             "typical_ball_speed_mph": archetype.ball_speed,
             "curve_type": "slice" if archetype.curve_factor > 0 else "hook" if archetype.curve_factor < 0 else "straight",
-            "variants": variants
+            "variants": {
+                f"{speed_pct}pct": variants[archetype.name][speed_pct]
+                for speed_pct in SPEED_PERCENTAGES
+            }
         }
     
+    if report is not None:
+        report.update({
+            "computed": len(tasks),
+            "reused": reused,
+            "workers": workers if len(tasks) > 1 else 1,
+            "compute_seconds": compute_time,
+            "total_seconds": time.perf_counter() - start_time
+        })
+    
     return tables
 
 
+def write_if_changed(path: Path, content) -> bool:
+    """
+    Write a file only when its content differs from what is on disk.
+    
+    Args:
+        path: Output path
+        content: str (written as text) or bytes
+    
+    Returns:
+        True if the file was written
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
 def generate_ar_color_scheme() -> Dict:
     """Generate color scheme for AR trajectory visualization."""
     
@@ -251,11 +410,22 @@ def generate_ar_color_scheme() -> Dict:
     }
 
 
-def main():
-    """Generate and save all lookup tables."""
+def main(output_dir: str = "models", workers: Optional[int] = None,
+         force: bool = False, dt: float = DEFAULT_DT):
+    """
+    Generate and save all lookup tables.
     
-    output_dir = Path("models")
+    Args:
+        output_dir: Directory for the JSON tables
+        workers: Worker processes (default: CPU count, 1 = serial)
+        force: Recompute every variant instead of reusing the previous build
+        dt: Integration step in seconds
+    """
+    
+    build_start = time.perf_counter()
+    output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
+    output_path = output_dir / "archetype_lookup_tables.json"
     
     print("""
 ╔════════════════════════════════════════════════════════════════╗
@@ -266,18 +436,28 @@ def main():
 ╚════════════════════════════════════════════════════════════════╝
 """)
     
-    # Generate main lookup tables
-    tables = generate_all_lookup_tables()
+    # Generate main lookup tables (reusing unchanged variants)
+    report = {}
+    tables = generate_all_lookup_tables(
+        previous_path=None if force else output_path,
+        workers=workers,
+        dt=dt,
+        report=report
+    )
     
     # Add color scheme
     tables["colors"] = generate_ar_color_scheme()
     
-    # Save to JSON
-    output_path = output_dir / "archetype_lookup_tables.json"
-    with open(output_path, 'w') as f:
-        json.dump(tables, f, indent=2)
+    # Save to JSON (untouched if nothing changed)
+    if write_if_changed(output_path, json.dumps(tables, indent=2)):
+        print(f"\n✅ Lookup tables saved to: {output_path}")
+    else:
+        print(f"\n✅ Lookup tables unchanged: {output_path}")
     
-    print(f"\n✅ Lookup tables saved to: {output_path}")
+    # Same tables as float32 arrays with an offset index (numpy.memmap)
+    binary_path = output_dir / "archetype_lookup_tables.bin"
+    write_if_changed(binary_path, encode_binary_tables(tables))
+    print(f"✅ Binary lookup tables saved to: {binary_path}")
     
     # Generate summary
     print("\n📊 ARCHETYPE SUMMARY (at 100% speed):")
@@ -315,13 +495,32 @@ def main():
         }
     
     minimal_path = output_dir / "archetype_tables_mobile.json"
-    with open(minimal_path, 'w') as f:
-        json.dump(minimal_tables, f)
+    write_if_changed(minimal_path, json.dumps(minimal_tables))
     
     print(f"✅ Mobile-optimized tables saved to: {minimal_path}")
     print(f"   Full: {output_path.stat().st_size / 1024:.1f} KB")
+    print(f"   Binary: {binary_path.stat().st_size / 1024:.1f} KB")
     print(f"   Mobile: {minimal_path.stat().st_size / 1024:.1f} KB")
+    
+    # Build report
+    print("\n⏱️  BUILD REPORT:")
+    print("━" * 60)
+    print(f"  Variants computed: {report['computed']} ({report['workers']} worker(s))")
+    print(f"  Variants reused:   {report['reused']}")
+    print(f"  Compute time:      {report['compute_seconds']:.2f}s")
+    print(f"  Total time:        {time.perf_counter() - build_start:.2f}s")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate shot archetype lookup tables")
+    parser.add_argument("--output-dir", default="models", help="Output directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompute every variant instead of reusing the previous build")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT, help="Integration step (s)")
+    args = parser.parse_args()
+    
+    main(output_dir=args.output_dir, workers=args.workers, force=args.force, dt=args.dt)
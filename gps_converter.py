@@ -3,10 +3,16 @@ GPS Coordinate Conversion Utilities
 
 Converts trajectory coordinates (meters) to GPS lat/lon using:
 - Haversine formula for geospatial calculations
-- Flat-earth approximation for short distances (<500m)
+- Flat-earth approximation for short distances (<500m): a local
+  tangent-plane projection cached per origin, converting whole arrays
 """
 
 import math
+from functools import lru_cache
+import numpy as np
+
+
+EARTH_RADIUS = 6378137  # meters (spherical model used throughout)
 
 
 def calculate_new_gps(start_lat, start_lon, distance_meters, bearing_degrees):
@@ -48,45 +54,162 @@ def calculate_new_gps(start_lat, start_lon, distance_meters, bearing_degrees):
     return math.degrees(lat2), math.degrees(lon2)
 
 
-def trajectory_to_gps(trajectory_points, start_lat, start_lon, initial_bearing_deg):
+class LocalProjection:
+    """
+    Local tangent-plane (east-north-up) projection around an origin.
+    
+    Meters-per-degree scale factors are computed once per origin, so whole
+    arrays of points convert with a few multiply-adds. Within 500m of the
+    origin the result matches the spherical formulas (calculate_new_gps)
+    to about a centimeter.
+    """
+    
+    def __init__(self, origin_lat, origin_lon):
+        """
+        Args:
+            origin_lat: Origin latitude (decimal degrees), e.g. the tee
+            origin_lon: Origin longitude (decimal degrees)
+        """
+        self.origin_lat = float(origin_lat)
+        self.origin_lon = float(origin_lon)
+        self.meters_per_deg_lat = math.radians(EARTH_RADIUS)
+        self.meters_per_deg_lon = math.radians(EARTH_RADIUS) * math.cos(math.radians(origin_lat))
+    
+    def enu_to_gps(self, east, north):
+        """
+        Convert east/north offsets in meters to GPS.
+        
+        Returns:
+            (lat, lon) arrays shaped like the inputs
+        """
+        lat = self.origin_lat + np.asarray(north, dtype=np.float64) / self.meters_per_deg_lat
+        lon = self.origin_lon + np.asarray(east, dtype=np.float64) / self.meters_per_deg_lon
+        return lat, lon
+    
+    def gps_to_enu(self, lat, lon):
+        """
+        Convert GPS to east/north offsets in meters.
+        
+        Returns:
+            (east, north) arrays shaped like the inputs
+        """
+        east = (np.asarray(lon, dtype=np.float64) - self.origin_lon) * self.meters_per_deg_lon
+        north = (np.asarray(lat, dtype=np.float64) - self.origin_lat) * self.meters_per_deg_lat
+        return east, north
+    
+    def shot_to_gps(self, x, y, bearing_deg):
+        """
+        Convert shot-frame points to GPS.
+        
+        Args:
+            x: Forward distances in meters (along bearing_deg)
+            y: Lateral distances in meters (positive = right)
+            bearing_deg: Shot direction (degrees from North)
+            
+        Returns:
+            (lat, lon) arrays shaped like the inputs
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        sin_b, cos_b = math.sin(math.radians(bearing_deg)), math.cos(math.radians(bearing_deg))
+        return self.enu_to_gps(x * sin_b + y * cos_b, x * cos_b - y * sin_b)
+    
+    def gps_to_shot(self, lat, lon, bearing_deg):
+        """
+        Convert GPS to shot-frame [forward, lateral right] offsets in meters.
+        
+        Returns:
+            (x, y) arrays shaped like the inputs
+        """
+        east, north = self.gps_to_enu(lat, lon)
+        sin_b, cos_b = math.sin(math.radians(bearing_deg)), math.cos(math.radians(bearing_deg))
+        return east * sin_b + north * cos_b, east * cos_b - north * sin_b
+    
+    def circle(self, center_east, center_north, radius_meters, num_points=8):
+        """
+        GPS points on a circle around an ENU center (clockwise from North).
+        
+        Returns:
+            (lat, lon) arrays of length num_points
+        """
+        angles = np.radians(np.arange(num_points) * (360.0 / num_points))
+        return self.enu_to_gps(center_east + radius_meters * np.sin(angles),
+                               center_north + radius_meters * np.cos(angles))
+
+
+@lru_cache(maxsize=256)
+def get_projection(origin_lat, origin_lon):
+    """Get the cached LocalProjection for an origin (e.g. a tee position)"""
+    return LocalProjection(origin_lat, origin_lon)
+
+
+def local_to_gps_arrays(x, y, start_lat, start_lon, initial_bearing_deg):
+    """
+    Vectorized calculate_new_gps for many local points at once.
+    
+    High-precision (spherical) reference for LocalProjection; use
+    trajectory_to_gps(..., precise=True) to validate projected output.
+    
+    Args:
+        x: Array of forward distances in meters
+        y: Array of lateral distances in meters (positive = right)
+        start_lat: Starting GPS latitude
+        start_lon: Starting GPS longitude
+        initial_bearing_deg: Direction of +x (degrees from North)
+        
+    Returns:
+        (lat, lon) arrays; points within 0.1m of the start map to the start
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    R = EARTH_RADIUS
+    lat1 = math.radians(start_lat)
+    lon1 = math.radians(start_lon)
+    
+    # Same spherical formulas as calculate_new_gps, one pass over all points
+    angular = np.hypot(x, y) / R
+    bearing = math.radians(initial_bearing_deg) + np.arctan2(y, x)
+    
+    lat2 = np.arcsin(math.sin(lat1) * np.cos(angular) +
+                     math.cos(lat1) * np.sin(angular) * np.cos(bearing))
+    lon2 = lon1 + np.arctan2(np.sin(bearing) * np.sin(angular) * math.cos(lat1),
+                             np.cos(angular) - math.sin(lat1) * np.sin(lat2))
+    
+    near = angular * R < 0.1  # Very close to start
+    lat = np.where(near, start_lat, np.degrees(lat2))
+    lon = np.where(near, start_lon, np.degrees(lon2))
+    return lat, lon
+
+
+def trajectory_to_gps(trajectory_points, start_lat, start_lon, initial_bearing_deg,
+                      precise=False):
     """
     Convert a trajectory (list of [x, y, z] points in meters) to GPS coordinates.
     
     Args:
-        trajectory_points: List of [x, y, z] in meters (x=forward, y=lateral, z=height)
+        trajectory_points: List of [x, y, z] in meters (x=forward, y=lateral, z=height),
+            (N, 3) array, or TrajectoryArray
         start_lat: Starting GPS latitude
         start_lon: Starting GPS longitude
         initial_bearing_deg: Initial shot direction (degrees from North)
+        precise: Use the spherical formulas instead of the cached
+            tangent-plane projection (for validation)
         
     Returns:
         List of [lat, lon, elevation_meters] points
     """
-    gps_trajectory = []
-    
-    for point in trajectory_points:
-        x, y, z = point
-        
-        # Calculate distance and bearing for this point
-        # x = distance forward, y = distance lateral (positive = right)
-        distance = math.sqrt(x**2 + y**2)
-        
-        if distance < 0.1:  # Very close to start
-            gps_trajectory.append([start_lat, start_lon, z])
-            continue
-        
-        # Calculate bearing offset from lateral displacement
-        # atan2(y, x) gives angle from forward direction
-        lateral_angle = math.degrees(math.atan2(y, x))
-        
-        # Combine with initial bearing
-        bearing = initial_bearing_deg + lateral_angle
-        
-        # Calculate GPS coordinates
-        new_lat, new_lon = calculate_new_gps(start_lat, start_lon, distance, bearing)
-        
-        gps_trajectory.append([new_lat, new_lon, z])
+    if hasattr(trajectory_points, "xyz"):
+        trajectory_points = trajectory_points.xyz
+    points = np.asarray(trajectory_points, dtype=np.float64).reshape(-1, 3)
     
-    return gps_trajectory
+    if precise:
+        lat, lon = local_to_gps_arrays(points[:, 0], points[:, 1], start_lat, start_lon, initial_bearing_deg)
+    else:
+        lat, lon = get_projection(start_lat, start_lon).shot_to_gps(
+            points[:, 0], points[:, 1], initial_bearing_deg
+        )
+    return np.column_stack([lat, lon, points[:, 2]]).tolist()
 
 
 def calculate_distance_between_gps(lat1, lon1, lat2, lon2):
@@ -100,7 +223,7 @@ def calculate_distance_between_gps(lat1, lon1, lat2, lon2):
     Returns:
         Distance in meters
     """
-    R = 6378137  # Earth radius in meters
+    R = EARTH_RADIUS
     
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
@@ -154,10 +277,8 @@ def create_search_zone(landing_gps, radius_meters=15):
     lat, lon = landing_gps[:2]
     
     # Create circle points (8 points around perimeter)
-    circle_points = []
-    for angle in range(0, 360, 45):
-        point_lat, point_lon = calculate_new_gps(lat, lon, radius_meters, angle)
-        circle_points.append([point_lat, point_lon])
+    circle_lat, circle_lon = get_projection(lat, lon).circle(0, 0, radius_meters, num_points=8)
+    circle_points = np.column_stack([circle_lat, circle_lon]).tolist()
     
     return {
         "center": {"lat": lat, "lon": lon},
@@ -167,6 +288,48 @@ def create_search_zone(landing_gps, radius_meters=15):
     }
 
 
+def create_ellipse_search_zone(start_lat, start_lon, initial_bearing_deg, ellipse, num_points=16):
+    """
+    Create an elliptical search zone from a fitted landing ellipse.
+    
+    Args:
+        start_lat: Starting GPS latitude (tee)
+        start_lon: Starting GPS longitude (tee)
+        initial_bearing_deg: Initial shot direction (degrees from North)
+        ellipse: dict from landing_ensemble.fit_landing_ellipse (meters,
+                 relative to the shot: x = forward, y = lateral)
+        num_points: Number of perimeter points
+        
+    Returns:
+        dict with search zone parameters (same keys as create_search_zone,
+        radius = semi-major axis, plus ellipse shape)
+    """
+    cx, cy = ellipse["center_x"], ellipse["center_y"]
+    a, b = ellipse["semi_major_m"], ellipse["semi_minor_m"]
+    rotation = math.radians(ellipse["orientation_deg"])
+    
+    # Ellipse perimeter in shot coordinates
+    t = 2 * np.pi * np.arange(num_points) / num_points
+    px, py = a * np.cos(t), b * np.sin(t)
+    local_x = np.append(cx + px * math.cos(rotation) - py * math.sin(rotation), cx)
+    local_y = np.append(cy + px * math.sin(rotation) + py * math.cos(rotation), cy)
+    
+    # Perimeter and center (last entry) in one projection
+    lat, lon = get_projection(start_lat, start_lon).shot_to_gps(local_x, local_y, initial_bearing_deg)
+    
+    return {
+        "center": {"lat": float(lat[-1]), "lon": float(lon[-1])},
+        "radius_meters": a,
+        "radius_yards": a * 1.09361,
+        "perimeter_points": np.column_stack([lat[:-1], lon[:-1]]).tolist(),
+        "shape": "ellipse",
+        "semi_major_meters": a,
+        "semi_minor_meters": b,
+        "orientation_deg": (initial_bearing_deg + ellipse["orientation_deg"]) % 360,
+        "confidence": ellipse.get("confidence")
+    }
+
+
 if __name__ == "__main__":
     """Test GPS conversion"""
     print("GPS Conversion Test")
@@ -203,4 +366,25 @@ if __name__ == "__main__":
     print(f"  Radius: {search_zone['radius_yards']:.1f} yards")
     print(f"  Perimeter points: {len(search_zone['perimeter_points'])}")
     
+    # Test 4: Tangent-plane projection vs spherical reference
+    import time
+    rng = np.random.default_rng(0)
+    points = np.column_stack([
+        rng.uniform(0, 300, 9 * 300), rng.uniform(-60, 60, 9 * 300), rng.uniform(0, 40, 9 * 300)
+    ])
+    
+    start_time = time.perf_counter()
+    projected = np.array(trajectory_to_gps(points, tee_lat, tee_lon, 30))
+    projected_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    precise = np.array(trajectory_to_gps(points, tee_lat, tee_lon, 30, precise=True))
+    precise_time = time.perf_counter() - start_time
+    
+    error = max(calculate_distance_between_gps(p[0], p[1], q[0], q[1])
+                for p, q in zip(projected, precise))
+    print(f"\nProjection of {len(points)} points (9 archetypes x 300):")
+    print(f"  Tangent plane: {projected_time * 1000:.2f} ms, spherical: {precise_time * 1000:.2f} ms")
+    print(f"  Max difference: {error * 100:.2f} cm")
+    
     print("\n" + "=" * 60)
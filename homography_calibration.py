@@ -118,6 +118,32 @@ class HomographyCalibrator:
         else:
             raise ValueError("Not calibrated! Call calibrate_* method first.")
     
+    def meters_to_pixels(self, points, use_homography=True):
+        """
+        Project real-world coordinates back into the image (vectorized).
+        
+        Inverse of pixel_to_meters for any number of points at once.
+        
+        Args:
+            points: Array of shape (..., 2) with (X, Y) in meters
+            use_homography: Use full perspective transform if available
+            
+        Returns:
+            Array of shape (..., 2) with (x, y) in pixels
+        """
+        points = np.asarray(points, dtype=np.float64)
+        
+        if use_homography and self.homography_matrix is not None:
+            inverse = np.linalg.inv(np.asarray(self.homography_matrix, dtype=np.float64))
+            projected = points @ inverse[:, :2].T + inverse[:, 2]
+            return projected[..., :2] / projected[..., 2:3]
+        
+        elif self.pixels_per_meter is not None:
+            return points * self.pixels_per_meter
+        
+        else:
+            raise ValueError("Not calibrated! Call calibrate_* method first.")
+    
     def calculate_real_world_distance(self, point1_px, point2_px):
         """
         Calculate real-world distance between two pixel points.
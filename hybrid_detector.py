@@ -11,6 +11,10 @@ Handles lost ball re-acquisition when tracking fails.
 import cv2
 import numpy as np
 import os
+import threading
+
+from frame_preprocessor import FramePreprocessor, PREPROCESSING_PROFILES, DEFAULT_PROFILE
+from motion_gate import MotionGate
 
 # Try to import onnxruntime, but allow graceful fallback if DLL fails
 try:
@@ -23,16 +27,144 @@ except (ImportError, OSError) as e:
     ort = None
 
 
+BALL_CLASS_ID = 32     # COCO "sports ball"
+NMS_IOU_THRESHOLD = 0.45
+NMS_TOP_K = 100        # Highest-scoring candidates considered by NMS
+
+
+def non_max_suppression(boxes, scores, iou_threshold=NMS_IOU_THRESHOLD):
+    """
+    Matrix NMS: drop every box overlapping a higher-scoring box.
+    
+    One IoU matrix, no Python loop. Unlike greedy NMS, a box that is itself
+    suppressed still suppresses weaker ones, which is slightly stricter.
+    
+    Args:
+        boxes: (K, 4) array of [x1, y1, x2, y2]
+        scores: (K,) array
+        iou_threshold: Maximum overlap with any stronger box
+        
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    order = np.argsort(-scores, kind="stable")
+    if len(order) < 2:
+        return order
+    
+    b = boxes[order]
+    area = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    inter_w = np.clip(np.minimum(b[:, None, 2], b[None, :, 2]) - np.maximum(b[:, None, 0], b[None, :, 0]), 0, None)
+    inter_h = np.clip(np.minimum(b[:, None, 3], b[None, :, 3]) - np.maximum(b[:, None, 1], b[None, :, 1]), 0, None)
+    inter = inter_w * inter_h
+    iou = inter / np.maximum(area[:, None] + area[None, :] - inter, 1e-9)
+    
+    # Column j: overlap with every stronger box i < j
+    return order[np.triu(iou, k=1).max(axis=0) <= iou_threshold]
+
+
+def decode_yolo_output(predictions, letterbox, confidence_threshold,
+                       max_candidates=1, iou_threshold=NMS_IOU_THRESHOLD):
+    """
+    Ball candidates from one image's YOLOv8 output, without per-row Python.
+    
+    Args:
+        predictions: (4 + classes, num_detections) array [cx, cy, w, h, class scores...]
+        letterbox: (scale, pad_x, pad_y) used to build the model input
+        confidence_threshold: Minimum sports-ball score
+        max_candidates: 1 = best box only (argmax), more = top boxes after NMS
+        iou_threshold: NMS overlap threshold
+        
+    Returns:
+        List of ((x, y, w, h), score) in frame pixels, highest score first
+    """
+    if predictions.shape[0] <= 4 + BALL_CLASS_ID:
+        return []
+    scores = predictions[4 + BALL_CLASS_ID]
+    
+    if max_candidates == 1:
+        best = int(np.argmax(scores))
+        keep = np.array([best]) if scores[best] > confidence_threshold else np.array([], dtype=np.int64)
+    else:
+        keep = np.flatnonzero(scores > confidence_threshold)
+        if len(keep) > NMS_TOP_K:
+            keep = keep[np.argpartition(-scores[keep], NMS_TOP_K)[:NMS_TOP_K]]
+        cx, cy, w, h = predictions[:4, keep]
+        corners = np.column_stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+        keep = keep[non_max_suppression(corners, scores[keep], iou_threshold)][:max_candidates]
+    
+    # Undo the letterbox padding and scale (truncating like int())
+    scale, pad_x, pad_y = letterbox
+    cx, cy, w, h = predictions[:4, keep]
+    boxes = np.column_stack([
+        (cx - w / 2 - pad_x) / scale,
+        (cy - h / 2 - pad_y) / scale,
+        w / scale,
+        h / scale
+    ]).astype(np.int64)
+    
+    return [(tuple(int(v) for v in box), float(score)) for box, score in zip(boxes, scores[keep])]
+
+
+class TrackingState:
+    """
+    Tracking state of one detection session (a live stream or one burst).
+    
+    detect_ball continues the detector's own session; detect_batch runs
+    each burst on a fresh state, so concurrent requests sharing a detector
+    never see each other's ROI, miss counter or motion model.
+    """
+    
+    def __init__(self, motion_gate=None):
+        self.roi = None  # Current region of interest
+        self.consecutive_misses = 0
+        self.frame_count = 0
+        self.yolo_candidates = []  # [((x, y, w, h), score), ...] from the last YOLO pass
+        self.motion_gate = motion_gate  # MotionGate for this session (None = ungated)
+        self.motion_regions = None  # Crops from the last gate update (None = full frame)
+    
+    def reset(self):
+        """Start a new session."""
+        self.roi = None
+        self.consecutive_misses = 0
+        self.frame_count = 0
+        self.yolo_candidates = []
+        self.motion_regions = None
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+
 class HybridBallDetector:
-    def __init__(self, yolo_model_path=None, confidence_threshold=0.3):
+    def __init__(self, yolo_model_path=None, confidence_threshold=0.3,
+                 max_candidates=1, nms_iou_threshold=NMS_IOU_THRESHOLD,
+                 acquisition_profile=DEFAULT_PROFILE, tracking_profile=DEFAULT_PROFILE,
+                 motion_gating=False):
         """
         Initialize hybrid detector.
         
         Args:
             yolo_model_path: Path to YOLOv8 ONNX model (optional)
             confidence_threshold: Minimum confidence for detections
+            max_candidates: Ball hypotheses kept per YOLO pass (1 = most
+                confident only; more runs NMS and lets tracking pick the one
+                nearest the current ROI)
+            nms_iou_threshold: Overlap above which weaker boxes are dropped
+            acquisition_profile: Hough preprocessing for full-frame search
+                (see frame_preprocessor.PREPROCESSING_PROFILES)
+            tracking_profile: Hough preprocessing inside the ROI ("fast" is
+                meant for this phase only)
+            motion_gating: While there is no ROI, search only crops around
+                moving blobs and drop YOLO candidates that aren't moving (see
+                motion_gate); reset() starts a new session
         """
+        for profile in (acquisition_profile, tracking_profile):
+            if profile not in PREPROCESSING_PROFILES:
+                raise ValueError(f"Unknown preprocessing profile: {profile}. "
+                                 f"Available: {', '.join(PREPROCESSING_PROFILES)}")
+        self.acquisition_profile = acquisition_profile
+        self.tracking_profile = tracking_profile
         self.confidence_threshold = confidence_threshold
+        self.max_candidates = max_candidates
+        self.nms_iou_threshold = nms_iou_threshold
         self.yolo_session = None
         self.yolo_available = False
         
@@ -48,78 +180,148 @@ class HybridBallDetector:
         else:
             print("[INFO] No YOLO model - using Hough-only mode")
         
-        # Tracking state
-        self.roi = None  # Current region of interest
-        self.consecutive_misses = 0
+        # Tracking (detect_ball's session; bursts get their own)
         self.max_misses = 3  # Trigger YOLO re-scan after 3 misses
-        self.frame_count = 0
         self.yolo_frequency = 5  # Run YOLO every 5 frames when tracking
+        self.motion_gating = motion_gating
+        self.tracking = TrackingState(MotionGate() if motion_gating else None)
+        
+        # Shared preprocessing: cached CLAHE, reusable buffers and NCHW tensor
+        # (one instance; the API serves concurrent requests from one detector,
+        # so each fill-and-consume section of the buffers holds the lock)
+        self.preprocessor = FramePreprocessor()
+        self._preprocess_lock = threading.Lock()
+        self._fixed_batch = False
+        if self.yolo_available:
+            # Models exported with a static batch of 1 get one run per frame
+            self._fixed_batch = self.yolo_session.get_inputs()[0].shape[0] == 1
         
         print("HybridBallDetector initialized")
     
-    def _detect_with_yolo(self, frame):
+    def _detect_with_yolo_batch(self, frames):
         """
-        Stage 1: Use YOLO to find ball.
+        Stage 1 for many frames: one ONNX inference over a letterboxed batch.
         
         Returns:
-            (x, y, w, h) bounding box or None
+            List of candidate lists [((x, y, w, h), score), ...], one per frame
         """
-        if not self.yolo_available:
-            return None
+        if not self.yolo_available or not frames:
+            return [[] for _ in frames]
         
         try:
-            # Prepare input (YOLOv8 expects 640x640)
-            input_size = 640
-            original_h, original_w = frame.shape[:2]
-            
-            # Resize and normalize
-            resized = cv2.resize(frame, (input_size, input_size))
-            blob = resized.astype(np.float32) / 255.0
-            blob = np.transpose(blob, (2, 0, 1))  # HWC to CHW
-            blob = np.expand_dims(blob, axis=0)  # Add batch dimension
-            
-            # Run inference
-            input_name = self.yolo_session.get_inputs()[0].name
-            outputs = self.yolo_session.run(None, {input_name: blob})
-            
-            # Parse outputs (YOLOv8 format: [batch, 4+classes, num_detections])
-            predictions = outputs[0][0]  # Remove batch dimension
+            with self._preprocess_lock:
+                batch = self.preprocessor.tensor(len(frames))
+                letterboxes = [self.preprocessor.letterbox(frame, i) for i, frame in enumerate(frames)]
+                
+                # Run inference
+                input_name = self.yolo_session.get_inputs()[0].name
+                if self._fixed_batch:
+                    predictions = [
+                        self.yolo_session.run(None, {input_name: batch[i:i + 1]})[0][0]
+                        for i in range(len(frames))
+                    ]
+                else:
+                    # Output shape: [batch, 4+classes, num_detections]
+                    predictions = self.yolo_session.run(None, {input_name: batch})[0]
             
-            # Filter for sports ball class (class 32 in COCO)
-            # YOLOv8 output format: [x, y, w, h, conf_class0, conf_class1, ...]
-            best_detection = None
-            best_confidence = 0
-            
-            for detection in predictions.T:  # Transpose to iterate over detections
-                # Assuming detection format: [cx, cy, w, h, class_confidences...]
-                if len(detection) > 36:  # Ensure we have class 32
-                    ball_confidence = detection[36]  # Class 32 (sports ball)
-                    
-                    if ball_confidence > best_confidence and ball_confidence > self.confidence_threshold:
-                        best_confidence = ball_confidence
-                        cx, cy, w, h = detection[:4]
-                        
-                        # Scale back to original image size
-                        x = int((cx - w/2) * original_w / input_size)
-                        y = int((cy - h/2) * original_h / input_size)
-                        w = int(w * original_w / input_size)
-                        h = int(h * original_h / input_size)
-                        
-                        best_detection = (x, y, w, h)
-            
-            return best_detection
+            return [
+                decode_yolo_output(p, lb, self.confidence_threshold,
+                                   self.max_candidates, self.nms_iou_threshold)
+                for p, lb in zip(predictions, letterboxes)
+            ]
             
         except Exception as e:
             print(f"YOLO detection error: {e}")
+            return [[] for _ in frames]
+    
+    def _detect_with_yolo(self, frame):
+        """
+        Stage 1: Use YOLO to find ball candidates.
+        
+        Returns:
+            List of ((x, y, w, h), score), highest score first
+        """
+        return self._detect_with_yolo_batch([frame])[0]
+    
+    def _choose_candidate(self, candidates, roi=None):
+        """
+        Pick the YOLO hypothesis to track.
+        
+        While tracking, the candidate closest to the current ROI wins (a
+        second ball or a bright divot scoring higher shouldn't steal the
+        track); otherwise the most confident one.
+        
+        Args:
+            candidates: [((x, y, w, h), score), ...], highest score first
+            roi: Current (x, y, w, h) region of interest, None if not tracking
+            
+        Returns:
+            (x, y, w, h) bounding box or None
+        """
+        if not candidates:
             return None
+        if roi is None or len(candidates) == 1:
+            return candidates[0][0]
+        
+        roi_x, roi_y, roi_w, roi_h = roi
+        boxes = np.array([bbox for bbox, _ in candidates], dtype=np.float64)
+        distance = np.hypot(boxes[:, 0] + boxes[:, 2] / 2 - (roi_x + roi_w / 2),
+                            boxes[:, 1] + boxes[:, 3] / 2 - (roi_y + roi_h / 2))
+        return candidates[int(np.argmin(distance))][0]
+    
+    def _gate_candidates(self, candidates, motion_regions):
+        """
+        Keep the YOLO candidates overlapping a moving blob.
+        
+        Static "sports balls" (logos, tee markers, a ball lying in the
+        rough) are dropped. Without a motion model all candidates pass.
+        
+        Args:
+            candidates: [((x, y, w, h), score), ...]
+            motion_regions: Crops from MotionGate.update (None = no model)
+            
+        Returns:
+            Filtered candidate list, order preserved
+        """
+        if motion_regions is None:
+            return candidates
+        
+        return [
+            (bbox, score) for bbox, score in candidates
+            if any(bbox[0] < rx + rw and rx < bbox[0] + bbox[2] and
+                   bbox[1] < ry + rh and ry < bbox[1] + bbox[3]
+                   for rx, ry, rw, rh in motion_regions)
+        ]
     
-    def _detect_with_hough(self, frame, roi=None):
+    def _detect_in_motion(self, frame, motion_regions, profiles=None):
+        """
+        Stage 2 without an ROI: Hough over each moving-blob crop.
+        
+        Falls back to a full-frame search when there is no motion model.
+        
+        Returns:
+            ((x, y), radius) or (None, 0)
+        """
+        if motion_regions is None:
+            return self._detect_with_hough(frame, None, profiles)
+        
+        # Crops are ROI-sized, so they get the tracking preprocessing
+        for region in motion_regions:
+            center, radius = self._detect_with_hough(frame, region, profiles)
+            if center:
+                return center, radius
+        
+        return None, 0
+    
+    def _detect_with_hough(self, frame, roi=None, profiles=None):
         """
         Stage 2: Use Hough circles to find ball (fast).
         
         Args:
             frame: Input frame
             roi: Optional (x, y, w, h) to search only in this region
+            profiles: Optional (acquisition, tracking) preprocessing profiles
+                overriding the detector's defaults
             
         Returns:
             ((x, y), radius) or (None, 0)
@@ -144,28 +346,22 @@ class HybridBallDetector:
             search_frame = frame
             x, y = 0, 0
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(search_frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply CLAHE for better contrast
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray = clahe.apply(gray)
-        
-        # Bilateral filter for noise reduction
-        gray = cv2.bilateralFilter(gray, 5, 75, 75)
-        gray = cv2.GaussianBlur(gray, (5, 5), 1.0)
-        
-        # Detect circles
-        circles = cv2.HoughCircles(
-            gray,
-            cv2.HOUGH_GRADIENT,
-            dp=1.2,
-            minDist=20,
-            param1=45,
-            param2=18,
-            minRadius=2,
-            maxRadius=60 if not roi else 40,  # Smaller max radius in ROI
-        )
+        # Grayscale, contrast and denoising per profile (into reused buffers)
+        acquisition_profile, tracking_profile = profiles or (self.acquisition_profile, self.tracking_profile)
+        with self._preprocess_lock:
+            gray = self.preprocessor.preprocess(search_frame, tracking_profile if roi else acquisition_profile)
+            
+            # Detect circles
+            circles = cv2.HoughCircles(
+                gray,
+                cv2.HOUGH_GRADIENT,
+                dp=1.2,
+                minDist=20,
+                param1=45,
+                param2=18,
+                minRadius=2,
+                maxRadius=60 if not roi else 40,  # Smaller max radius in ROI
+            )
         
         if circles is None:
             return None, 0
@@ -183,79 +379,143 @@ class HybridBallDetector:
         
         return None, 0
     
-    def detect_ball(self, frame):
+    def detect_ball(self, frame, profiles=None):
         """
         Main detection method - orchestrates 3-stage pipeline.
         
+        Args:
+            frame: Input frame
+            profiles: Optional (acquisition, tracking) preprocessing profiles
+                for this call, e.g. ("balanced", "fast") for live preview
+            
+        Returns:
+            ((x, y), radius) or (None, 0)
+        """
+        return self._track(frame, self._detect_with_yolo, self.tracking, profiles)
+    
+    def detect_batch(self, frames, profiles=None, motion_gating=None):
+        """
+        Detect the ball in a sequence of frames (e.g. one capture burst).
+        
+        YOLO runs once over all frames as a single batch; the tracking logic
+        then consumes the frames in order exactly as detect_ball would,
+        taking YOLO results from the batch whenever it asks for them.
+        
+        The burst is its own session on a fresh TrackingState: the
+        detector's live-stream state is neither used nor modified, so
+        concurrent bursts can share one detector.
+        
+        Args:
+            frames: List of BGR frames in capture order
+            profiles: Optional (acquisition, tracking) preprocessing profiles
+            motion_gating: True/False to gate this burst with its own fresh
+                motion model, None for the detector's setting. Gating drops
+                anything static, including a ball at address in the first
+                frames
+            
+        Returns:
+            List of ((x, y), radius) or (None, 0), one per frame
+        """
+        frames = list(frames)
+        candidates = self._detect_with_yolo_batch(frames)
+        
+        if motion_gating is None:
+            motion_gating = self.motion_gating
+        state = TrackingState(MotionGate() if motion_gating else None)
+        
+        return [
+            self._track(frame, lambda _, found=found: found, state, profiles)
+            for frame, found in zip(frames, candidates)
+        ]
+    
+    def _track(self, frame, detect_with_yolo, state, profiles=None):
+        """
+        Run the 3-stage pipeline on one frame.
+        
+        Args:
+            frame: Input frame
+            detect_with_yolo: Callable returning the YOLO candidates for this frame
+            state: TrackingState of this frame's session (updated in place)
+            profiles: Optional (acquisition, tracking) preprocessing profiles
+            
         Returns:
             ((x, y), radius) or (None, 0)
         """
-        self.frame_count += 1
+        state.frame_count += 1
+        
+        # Motion model sees every frame so the background stays current
+        state.motion_regions = state.motion_gate.update(frame) if state.motion_gate else None
         
         # Stage 1: YOLO Acquisition (initial or re-acquisition)
         should_run_yolo = (
             self.yolo_available and (
-                self.roi is None or  # No ROI yet (initial)
-                self.consecutive_misses > self.max_misses or  # Lost ball
-                self.frame_count % self.yolo_frequency == 0  # Periodic validation
+                state.roi is None or  # No ROI yet (initial)
+                state.consecutive_misses > self.max_misses or  # Lost ball
+                state.frame_count % self.yolo_frequency == 0  # Periodic validation
             )
         )
         
         if should_run_yolo:
-            bbox = self._detect_with_yolo(frame)
+            state.yolo_candidates = self._gate_candidates(detect_with_yolo(frame), state.motion_regions)
+            bbox = self._choose_candidate(state.yolo_candidates, state.roi)
             
             if bbox:
                 # Expand bbox to ROI with margin
                 x, y, w, h = bbox
                 margin = 20
-                self.roi = (
+                state.roi = (
                     max(0, x - margin),
                     max(0, y - margin),
                     w + 2 * margin,
                     h + 2 * margin
                 )
-                print(f"[FOUND] YOLO found ball, ROI set: {self.roi}")
+                print(f"[FOUND] YOLO found ball, ROI set: {state.roi}")
         
-        # Stage 2: Hough Tracking (in ROI if available)
-        center, radius = self._detect_with_hough(frame, self.roi)
+        # Stage 2: Hough Tracking (in ROI if available, else where things move)
+        if state.roi:
+            center, radius = self._detect_with_hough(frame, state.roi, profiles)
+        else:
+            center, radius = self._detect_in_motion(frame, state.motion_regions, profiles)
         
         if center:
             # Detection successful
-            self.consecutive_misses = 0
+            state.consecutive_misses = 0
             
             # Update ROI to follow the ball
-            if self.roi:
+            if state.roi:
                 cx, cy = center
                 new_x = max(0, cx - 50)
                 new_y = max(0, cy - 50)
-                self.roi = (new_x, new_y, 100, 100)
+                state.roi = (new_x, new_y, 100, 100)
             
             return center, radius
         else:
             # Detection failed
-            self.consecutive_misses += 1
+            state.consecutive_misses += 1
             
-            if self.consecutive_misses > self.max_misses:
-                print(f"[WARNING] Ball lost for {self.consecutive_misses} frames")
-                self.roi = None  # Reset ROI to trigger full YOLO scan
+            if state.consecutive_misses > self.max_misses:
+                print(f"[WARNING] Ball lost for {state.consecutive_misses} frames")
+                state.roi = None  # Reset ROI to trigger full YOLO scan
             
             return None, 0
     
     def reset(self):
         """Reset tracking state."""
-        self.roi = None
-        self.consecutive_misses = 0
-        self.frame_count = 0
+        self.tracking.reset()
         print("[RESET] Detector reset")
     
     def get_debug_info(self):
-        """Get debug information for visualization."""
+        """Get debug information for visualization (detect_ball's session)."""
+        state = self.tracking
         return {
             "yolo_available": self.yolo_available,
-            "roi": self.roi,
-            "consecutive_misses": self.consecutive_misses,
-            "frame_count": self.frame_count,
-            "tracking_mode": "ROI" if self.roi else "FULL_FRAME"
+            "roi": state.roi,
+            "consecutive_misses": state.consecutive_misses,
+            "yolo_candidates": state.yolo_candidates,
+            "frame_count": state.frame_count,
+            "tracking_mode": "ROI" if state.roi else ("FULL_FRAME" if state.motion_regions is None else "MOTION"),
+            "motion_regions": state.motion_regions,
+            "preprocessing": {"acquisition": self.acquisition_profile, "tracking": self.tracking_profile}
         }
 
 
@@ -278,7 +538,28 @@ if __name__ == "__main__":
     print(f"  Confidence threshold: {detector.confidence_threshold}")
     print(f"  Max consecutive misses: {detector.max_misses}")
     
+    # Post-processing cost on a synthetic YOLOv8 output (84 x 8400)
+    import time
+    rng = np.random.default_rng(0)
+    predictions = rng.uniform(0, 0.2, (84, 8400)).astype(np.float32)
+    predictions[:4] = rng.uniform(10, 630, (4, 8400))
+    predictions[2:4] = rng.uniform(4, 20, (2, 8400))
+    for i, (cx, cy) in enumerate([(200, 300), (203, 301), (450, 120)]):
+        predictions[:5, i] = [cx, cy, 12, 12, 0]
+        predictions[4 + BALL_CLASS_ID, i] = 0.9 - 0.1 * i
+    letterbox = (1.0, 0, 80)
+    
+    for max_candidates in (1, 5):
+        start_time = time.perf_counter()
+        for _ in range(100):
+            candidates = decode_yolo_output(predictions, letterbox, 0.3, max_candidates)
+        elapsed_us = (time.perf_counter() - start_time) * 1e4
+        print(f"\nDecode (max_candidates={max_candidates}): {elapsed_us:.0f} us")
+        for bbox, score in candidates:
+            print(f"  {bbox} score {score:.2f}")
+    
     print("\n" + "=" * 60)
     print("\nTo use with YOLO:")
     print("1. Download YOLOv8-nano ONNX model")
     print("2. detector = HybridBallDetector('path/to/yolov8n.onnx')")
+    print("3. detector.detect_batch(frames)  # one YOLO inference per capture burst")
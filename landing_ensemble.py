@@ -0,0 +1,239 @@
+"""
+Monte Carlo Landing Ensemble
+
+Turns uncertain launch measurements into landing probability zones:
+1. Sample thousands of launch parameter sets around the measured values
+2. Integrate them all in one vectorized TrajectorySimulator batch
+3. Summarize each archetype's landings as a fitted ellipse and/or density grid
+
+Replaces the fixed-radius search circle with one that reflects how well the
+launch was actually measured.
+"""
+
+import math
+import time
+import numpy as np
+from trajectory_physics import TrajectorySimulator
+from ball_rollout import simulate_rollout, DEFAULT_LIE
+
+
+# Default 1-sigma measurement uncertainty when the caller has no better estimate
+DEFAULT_UNCERTAINTY = {
+    "speed_mph_std": 8.0,       # LaunchVectorCalculator is roughly ±10 mph
+    "launch_angle_std": 2.0,    # degrees
+    "backspin_rpm_std": 300.0,  # archetype spin is a typical value, not measured
+    "spin_axis_std": 3.0,       # degrees
+    "direction_std": 3.0,       # degrees of launch bearing
+    "wind_speed_std": 2.0,      # mph
+}
+
+
+def simulate_landing_ensemble(archetypes, launch_speed_mph, uncertainty=None,
+                              wind_speed_mph=0, wind_direction_deg=0,
+                              samples=10000, simulator=None, seed=None,
+                              time_step=0.02, include_rollout=False, lie=DEFAULT_LIE,
+                              surface=None, ground_height=None):
+    """
+    Simulate a Monte Carlo ensemble of landings for each shot archetype.
+
+    Samples are split evenly across archetypes and integrated together in a
+    single simulate_batch call without recording trajectory points. Cost is
+    roughly 40 ms plus 20 ms per 1000 samples (rollout adds a few ms), so
+    10000 samples take about 230 ms.
+
+    Args:
+        archetypes: Dict of key -> archetype data (e.g. SHOT_TYPES)
+        launch_speed_mph: Measured ball speed
+        uncertainty: Dict of 1-sigma values (keys as DEFAULT_UNCERTAINTY)
+        wind_speed_mph: Wind speed
+        wind_direction_deg: Wind direction relative to shot (0 = headwind)
+        samples: Total ensemble size across all archetypes
+        simulator: TrajectorySimulator (default: new instance)
+        seed: Random seed for reproducible ensembles
+        time_step: Integration step; 20ms keeps landing error well below the
+            ensemble spread at half the cost of the default 10ms
+        include_rollout: Bounce and roll every member to its final rest
+            position (see ball_rollout.simulate_rollout)
+        lie: Landing surface for the rollout: name, per-member names, or a
+            callable (M, 2) landings -> per-member names (e.g. classified
+            against the course polygons) called with the bearing-rotated
+            landings
+        surface: Optional CarrySurface; members are interpolated from it
+            (CarrySurface.query_batch) instead of integrated. It stores no
+            landing velocity or spin, so it can't be combined with rollout
+        ground_height: Optional callable (x, y) -> ground height relative to
+            the tee at shot-frame positions (e.g. a bound
+            ElevationModel.relative_height); members land on that terrain,
+            each along its own perturbed bearing, instead of flat ground
+
+    Returns:
+        Dict of key -> (M, 2) array of landing (or rest) [x, y] in meters
+        (x = forward along launch bearing, y = lateral, positive right)
+    """
+    if surface is not None and include_rollout:
+        raise ValueError("Rollout needs simulated landing velocity and spin; "
+                         "the carry surface only stores landing positions")
+    if surface is not None and ground_height is not None:
+        raise ValueError("The carry surface is computed on flat ground; "
+                         "terrain landings must be simulated")
+    
+    sigma = {**DEFAULT_UNCERTAINTY, **(uncertainty or {})}
+    rng = np.random.default_rng(seed)
+
+    keys = list(archetypes)
+    per_archetype = max(1, samples // len(keys))
+    n = per_archetype * len(keys)
+
+    # Archetype nominal values repeated per member
+    angle = np.repeat([archetypes[k]["launch_angle"] for k in keys], per_archetype)
+    backspin = np.repeat([archetypes[k]["backspin_rpm"] for k in keys], per_archetype)
+    spin_axis = np.repeat([archetypes[k]["side_spin_axis"] for k in keys], per_archetype)
+
+    # Perturb by the measurement uncertainty
+    speed = np.maximum(rng.normal(launch_speed_mph, sigma["speed_mph_std"], n), 1.0)
+    angle = angle + rng.normal(0, sigma["launch_angle_std"], n)
+    backspin = np.maximum(backspin + rng.normal(0, sigma["backspin_rpm_std"], n), 0.0)
+    spin_axis = spin_axis + rng.normal(0, sigma["spin_axis_std"], n)
+    wind_speed = np.maximum(rng.normal(wind_speed_mph, sigma["wind_speed_std"], n), 0.0)
+    direction = np.radians(rng.normal(0, sigma["direction_std"], n))
+    cos_d, sin_d = np.cos(direction), np.sin(direction)
+
+    if surface is not None:
+        # Multilinear lookups, no integration (and no landing velocity or spin)
+        outcome = surface.query_batch(speed, angle, backspin, spin_axis,
+                                      wind_speed, wind_direction_deg)
+        landings = np.column_stack([outcome["landing_x_m"], outcome["landing_y_m"]])
+        landing_velocity = landing_spin = None
+    else:
+        member_ground = None
+        if ground_height is not None:
+            # Terrain under each member along its own (perturbed) bearing
+            def member_ground(x, y, ids):
+                return ground_height(x * cos_d[ids] - y * sin_d[ids], x * sin_d[ids] + y * cos_d[ids])
+        
+        simulator = simulator or TrajectorySimulator()
+        batch = simulator.simulate_batch(
+            speed, angle, backspin, spin_axis,
+            wind_speed_mph=wind_speed,
+            wind_direction_deg=wind_direction_deg,
+            record_points=False,
+            time_step=time_step,
+            ground_height=member_ground
+        )
+        landings = batch["landing"][:, :2]
+        landing_velocity = batch["landing_velocity"]
+        landing_spin = batch["final_spin_rpm"]
+
+    # Rotate each landing by its launch bearing error (positive = right)
+    x, y = landings[:, 0], landings[:, 1]
+    landings = np.column_stack([x * cos_d - y * sin_d, x * sin_d + y * cos_d])
+
+    if include_rollout:
+        # Roll along the rotated bearing from the lie where each member landed
+        vx, vy, vz = landing_velocity.T
+        velocity = np.column_stack([vx * cos_d - vy * sin_d, vx * sin_d + vy * cos_d, vz])
+        member_lie = lie(landings) if callable(lie) else lie
+        landings = simulate_rollout(landings, velocity, landing_spin, member_lie)["rest"]
+    
+    return {
+        key: landings[i * per_archetype:(i + 1) * per_archetype]
+        for i, key in enumerate(keys)
+    }
+
+
+def fit_landing_ellipse(landings, confidence=0.9):
+    """
+    Fit a confidence ellipse to landing samples (Gaussian approximation).
+
+    Args:
+        landings: (M, 2) array of landing [x, y] in meters
+        confidence: Probability mass inside the ellipse
+
+    Returns:
+        dict with center_x, center_y, semi_major_m, semi_minor_m,
+        orientation_deg (major axis, degrees right of forward) and confidence
+    """
+    center = landings.mean(axis=0)
+
+    if len(landings) < 3:
+        return {
+            "center_x": float(center[0]),
+            "center_y": float(center[1]),
+            "semi_major_m": 0.0,
+            "semi_minor_m": 0.0,
+            "orientation_deg": 0.0,
+            "confidence": confidence
+        }
+
+    covariance = np.cov(landings, rowvar=False)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)  # Ascending order
+
+    # Chi-square quantile with 2 degrees of freedom
+    scale = math.sqrt(-2 * math.log(1 - confidence))
+    minor, major = np.sqrt(np.maximum(eigenvalues, 0)) * scale
+    major_axis = eigenvectors[:, 1]
+
+    # Axis direction is ambiguous, report it in [-90, 90)
+    orientation = (math.degrees(math.atan2(major_axis[1], major_axis[0])) + 90) % 180 - 90
+
+    return {
+        "center_x": float(center[0]),
+        "center_y": float(center[1]),
+        "semi_major_m": float(major),
+        "semi_minor_m": float(minor),
+        "orientation_deg": float(orientation),
+        "confidence": confidence
+    }
+
+
+def landing_density_grid(landings, cell_size_m=5.0):
+    """
+    Bin landing samples into a probability grid.
+
+    Args:
+        landings: (M, 2) array of landing [x, y] in meters
+        cell_size_m: Grid cell size in meters
+
+    Returns:
+        dict with origin [x, y] of cell (0, 0), cell_size_m and
+        probabilities (rows = x bins, columns = y bins, sums to 1)
+    """
+    lower = np.floor(landings.min(axis=0) / cell_size_m) * cell_size_m
+    upper = np.ceil(landings.max(axis=0) / cell_size_m) * cell_size_m + cell_size_m
+
+    x_edges = np.arange(lower[0], upper[0] + cell_size_m / 2, cell_size_m)
+    y_edges = np.arange(lower[1], upper[1] + cell_size_m / 2, cell_size_m)
+    counts, _, _ = np.histogram2d(landings[:, 0], landings[:, 1], bins=[x_edges, y_edges])
+
+    return {
+        "origin": [float(lower[0]), float(lower[1])],
+        "cell_size_m": cell_size_m,
+        "probabilities": counts / max(len(landings), 1)
+    }
+
+
+if __name__ == "__main__":
+    """Test the landing ensemble"""
+    from shot_archetypes import SHOT_TYPES
+
+    print("Monte Carlo Landing Ensemble Test")
+    print("=" * 60)
+
+    start_time = time.perf_counter()
+    ensemble = simulate_landing_ensemble(SHOT_TYPES, launch_speed_mph=140, samples=10000, seed=1)
+    elapsed = time.perf_counter() - start_time
+
+    total = sum(len(v) for v in ensemble.values())
+    print(f"\n{total} trajectories in {elapsed * 1000:.0f} ms")
+
+    for key, landings in ensemble.items():
+        ellipse = fit_landing_ellipse(landings)
+        print(f"\n{key}:")
+        print(f"  Center: {ellipse['center_x']:.1f}m forward, {ellipse['center_y']:.1f}m lateral")
+        print(f"  90% ellipse: {ellipse['semi_major_m']:.1f}m x {ellipse['semi_minor_m']:.1f}m "
+              f"at {ellipse['orientation_deg']:.0f}°")
+
+    grid = landing_density_grid(ensemble["straight"])
+    print(f"\nStraight density grid: {grid['probabilities'].shape} cells of {grid['cell_size_m']}m")
+
+    print("\n" + "=" * 60)
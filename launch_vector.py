@@ -59,16 +59,122 @@ class LaunchVectorCalculator:
         # Calculate confidence
         confidence = self._calculate_confidence(launch_frames, speed_result, angle_result)
         
+        # Estimate measurement uncertainty (for landing ensembles)
+        uncertainty = self._estimate_uncertainty(speed_result, angle_result, confidence)
+        
         return {
             "speed_mph": speed_result["speed_mph"],
             "speed_ms": speed_result["speed_ms"],
             "launch_angle": angle_result["angle"],
             "direction": direction_result["direction"],
             "confidence": confidence,
+            "uncertainty": uncertainty,
             "frames_used": len(launch_frames),
             "method": "trajectory_analysis"
         }
     
+    def fit_launch_vector(self, trajectory_points, gyro_data=None, compass_heading=0,
+                          fps=30, backspin_rpm=2500, measurement_std_px=2.0):
+        """
+        Fit launch speed and angle to every tracked point with the physics engine.
+        
+        Runs TrajectorySimulator.fit_launch_parameters on all (Kalman-smoothed)
+        points, projecting simulated flights into the image through the
+        calibrator. The calibrated plane is taken to be the plane of flight
+        seen side-on: image x along the shot, image y pointing down.
+        
+        Falls back to calculate_launch_vector (first/last point estimate)
+        without calibration, with fewer than 4 points, or when the fit
+        lands outside realistic launch conditions.
+        
+        Args:
+            trajectory_points: List of dicts with 'x', 'y', 'timestamp' (or 'frame')
+            gyro_data: Phone gyroscope data (tilt angle in degrees)
+            compass_heading: Phone compass heading in degrees
+            fps: Frames per second (if timestamps not available)
+            backspin_rpm: Assumed backspin during the fit
+            measurement_std_px: Expected tracking noise in pixels
+            
+        Returns:
+            dict in the calculate_launch_vector format, with method
+            "inverse_fit" and a "fit" summary when the fit was used
+        """
+        from trajectory_physics import TrajectorySimulator
+        
+        estimate = self.calculate_launch_vector(
+            trajectory_points, gyro_data=gyro_data,
+            compass_heading=compass_heading, fps=fps
+        )
+        
+        if (len(trajectory_points) < 4 or self.calibrator is None
+                or not self.calibrator.is_calibrated()):
+            return estimate
+        
+        first = trajectory_points[0]
+        if all('timestamp' in p for p in trajectory_points):
+            times = np.array([p['timestamp'] - first['timestamp'] for p in trajectory_points])
+        else:
+            times = np.array([(p.get('frame', i) - first.get('frame', 0)) / fps
+                              for i, p in enumerate(trajectory_points)])
+        
+        if np.any(np.diff(times) <= 0):
+            return estimate
+        
+        observed = np.array([[p['x'], p['y']] for p in trajectory_points], dtype=np.float64)
+        
+        # Launch point and travel direction in the calibrated plane
+        origin = np.array(self.calibrator.pixel_to_meters(observed[0]), dtype=np.float64)
+        end = np.array(self.calibrator.pixel_to_meters(observed[-1]), dtype=np.float64)
+        heading = 1.0 if end[0] >= origin[0] else -1.0
+        
+        # Camera roll: the image shows the flight rotated by -tilt
+        tilt = math.radians(gyro_data or 0)
+        cos_t, sin_t = math.cos(tilt), math.sin(tilt)
+        
+        def project(positions):
+            forward = positions[..., 0] * cos_t + positions[..., 2] * sin_t
+            up = -positions[..., 0] * sin_t + positions[..., 2] * cos_t
+            plane = np.stack([origin[0] + heading * forward, origin[1] - up], axis=-1)
+            return self.calibrator.meters_to_pixels(plane)
+        
+        fit = TrajectorySimulator().fit_launch_parameters(
+            times, observed, project,
+            initial_speed_mph=min(max(estimate['speed_mph'], 50), 200),
+            initial_angle_deg=estimate['launch_angle'],
+            backspin_rpm=backspin_rpm,
+            measurement_std=measurement_std_px
+        )
+        
+        if not (1 < fit['speed_mph'] < 250 and 0 <= fit['launch_angle'] <= 45):
+            print(f"[WARNING] Launch fit unrealistic ({fit['speed_mph']:.0f} mph, "
+                  f"{fit['launch_angle']:.1f}°), using point estimate")
+            return estimate
+        
+        speed_result = {"speed_mph": fit['speed_mph'], "speed_ms": fit['speed_mph'] / 2.237}
+        angle_result = {"angle": fit['launch_angle'], "method": "calculated"}
+        confidence = self._calculate_confidence(trajectory_points, speed_result, angle_result)
+        
+        # Fit covariance, floored at what tracking noise alone can't resolve
+        uncertainty = dict(estimate['uncertainty'])
+        uncertainty["speed_mph_std"] = max(fit['std']['speed_mph'], 2.0)
+        uncertainty["launch_angle_std"] = max(fit['std']['launch_angle'], 0.5)
+        
+        return {
+            **estimate,
+            "speed_mph": speed_result["speed_mph"],
+            "speed_ms": speed_result["speed_ms"],
+            "launch_angle": angle_result["angle"],
+            "confidence": confidence,
+            "uncertainty": uncertainty,
+            "frames_used": len(trajectory_points),
+            "method": "inverse_fit",
+            "fit": {
+                "rms_error_px": fit['rms_error'],
+                "iterations": fit['iterations'],
+                "converged": fit['converged']
+            }
+        }
+    
     def _calculate_speed(self, points, fps=30):
         """
         Calculate ball speed from trajectory points.
@@ -263,6 +369,39 @@ class LaunchVectorCalculator:
         
         return max(0.0, min(1.0, confidence))
     
+    def _estimate_uncertainty(self, speed_result, angle_result, confidence):
+        """
+        Estimate 1-sigma uncertainty of the launch vector.
+        
+        Baseline errors grow as confidence drops; angles that fell back to
+        the typical default are treated as unmeasured.
+        
+        Args:
+            speed_result: Speed calculation result
+            angle_result: Angle calculation result
+            confidence: Overall confidence (0-1)
+            
+        Returns:
+            dict of 1-sigma values (see landing_ensemble.DEFAULT_UNCERTAINTY)
+        """
+        doubt = 1.0 - confidence
+        speed_mph = speed_result.get("speed_mph", 0)
+        
+        # Speed: ~5% at full confidence, up to ~25% when unreliable
+        speed_std = max(speed_mph * (0.05 + 0.20 * doubt), 3.0)
+        
+        # Angle: defaults cover the whole typical 8-16° window
+        if angle_result.get("method") == "calculated":
+            angle_std = 1.5 + 2.0 * doubt
+        else:
+            angle_std = 3.0
+        
+        return {
+            "speed_mph_std": speed_std,
+            "launch_angle_std": angle_std,
+            "direction_std": 2.0 + 6.0 * doubt
+        }
+    
     def _calculate_linearity(self, positions):
         """
         Calculate how linear a set of points is (0-1).
@@ -327,6 +466,24 @@ if __name__ == "__main__":
     print(f"  Confidence: {result['confidence']:.2f}")
     print(f"  Frames Used: {result['frames_used']}")
     
+    # Inverse fit on a synthetic track (150 mph, 14°) seen at 50 px/m
+    from homography_calibration import HomographyCalibrator
+    from trajectory_physics import TrajectorySimulator
+    
+    calibrator = HomographyCalibrator()
+    calibrator.pixels_per_meter = 50.0
+    times = np.arange(6) / 30
+    flight = TrajectorySimulator().positions_at_times(times, 150, 14, 2500, 0)[0]
+    fit_trajectory = [
+        {'x': 100 + x * 50, 'y': 400 - z * 50, 'timestamp': t}
+        for (x, _, z), t in zip(flight, times)
+    ]
+    
+    fitted = LaunchVectorCalculator(calibrator).fit_launch_vector(fit_trajectory)
+    print("\nInverse Fit (true: 150 mph, 14°):")
+    print(f"  Speed: {fitted['speed_mph']:.1f} mph, Launch Angle: {fitted['launch_angle']:.1f}°")
+    print(f"  Method: {fitted['method']}, RMS: {fitted['fit']['rms_error_px']:.2f} px")
+    
     print("\n" + "=" * 60)
     print("\n✅ Launch vector calculation working!")
     print("\nNote: Add homography calibration for accurate speed!")
@@ -9,6 +9,7 @@ from typing import List, Tuple, Dict, Optional, Callable
 from collections import deque
 from ball_detector import BallDetector
 from trajectory_predictor import TrajectoryPredictor
+from trajectory_array import TrajectoryArray, PIXEL_FIELDS
 import time
 
 
@@ -34,7 +35,9 @@ class LiveBallTracer:
         self.predictor = TrajectoryPredictor(fps)
 
         # Tracking state
-        self.ball_trail = deque(maxlen=max_trail_length)  # Last N ball positions
+        # Last N ball positions (rolling, no per-frame allocation)
+        self.ball_trail = TrajectoryArray(PIXEL_FIELDS, capacity=2 * max_trail_length,
+                                          max_length=max_trail_length)
         self.is_tracking = False
         self.shot_start_time = None
         self.trajectory_calculated = False
@@ -113,10 +116,7 @@ class LiveBallTracer:
             self.shot_start_time = timestamp
             print("🏌️ Shot detected - Tracking started")
 
-        self.ball_trail.append({
-            'position': ball_center,
-            'timestamp': timestamp
-        })
+        self.ball_trail.append(t=timestamp, px=ball_center[0], py=ball_center[1])
 
     def _handle_ball_lost(self):
         """
@@ -145,11 +145,9 @@ class LiveBallTracer:
             return
 
         # Get first N positions for calculation
-        positions = [
-            (p['position'][0], p['position'][1],
-             p['timestamp'] - self.shot_start_time)
-            for p in list(self.ball_trail)[:min(10, len(self.ball_trail))]
-        ]
+        first = self.ball_trail[:10]
+        positions = [(px, py, t - self.shot_start_time)
+                     for px, py, t in first.to_list(("px", "py", "t"))]
 
         # Calculate physics
         (vx, vy), angle, speed = self.predictor.estimate_initial_velocity(positions)
@@ -159,7 +157,7 @@ class LiveBallTracer:
         self.launch_angle = angle
 
         # Generate predicted trajectory
-        x0, y0 = self.ball_trail[0]['position']
+        x0, y0 = self.ball_trail.pixels[0]
         traj_x, traj_y = self.predictor.calculate_trajectory(x0, y0, vx, vy)
 
         self.predicted_trajectory = list(zip(traj_x, traj_y))
@@ -188,7 +186,7 @@ class LiveBallTracer:
             return frame
 
         # Draw ball trail (actual path)
-        trail_points = [p['position'] for p in self.ball_trail]
+        trail_points = [tuple(p) for p in self.ball_trail.pixels.astype(int).tolist()]
 
         if len(trail_points) > 1:
             # Draw trail with gradient (newer = brighter)
@@ -310,8 +308,8 @@ class LiveBallTracer:
         return {
             'timestamp': self.shot_start_time,
             'ball_positions': [
-                {'x': p['position'][0], 'y': p['position'][1], 't': p['timestamp']}
-                for p in self.ball_trail
+                {'x': px, 'y': py, 't': t}
+                for px, py, t in self.ball_trail.to_list(("px", "py", "t"))
             ],
             'trajectory': [{'x': x, 'y': y} for x, y in self.predicted_trajectory],
             'stats': self.shot_stats
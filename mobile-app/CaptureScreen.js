@@ -5,6 +5,7 @@ import * as Location from 'expo-location';
 import { Magnetometer, Gyroscope } from 'expo-sensors';
 import { MaterialCommunityIcons, Ionicons } from '@expo/vector-icons';
 import axios from 'axios';
+import { decodeAnalysis } from './services/polyline';
 
 const API_URL = 'http://192.168.1.168:5000';
 
@@ -171,7 +172,8 @@ export default function CaptureScreen({ onAnalysisComplete, onCancel }) {
                 gps: gpsData,
                 compass_heading: compassHeading,
                 gyro_tilt: gyroTilt,
-                tracking_mode: trackingMode
+                tracking_mode: trackingMode,
+                output_format: 'polyline'  // ~10x smaller response
             }, {
                 timeout: 90000,  // 90 seconds
                 headers: {
@@ -182,7 +184,7 @@ export default function CaptureScreen({ onAnalysisComplete, onCancel }) {
             console.log('Server response received');
 
             if (response.data) {
-                onAnalysisComplete(response.data);
+                onAnalysisComplete(decodeAnalysis(response.data));
             } else {
                 Alert.alert('Error', 'No data from server');
             }
@@ -0,0 +1,81 @@
+// Encoded polyline decoding for /api/analyze_shot responses
+// (output_format: 'polyline', see polyline_codec.py on the server)
+
+// ===================
+// DECODING
+// ===================
+
+export const decodePolyline = (encoded, dims = 2, precision = 6) => {
+    const factor = Math.pow(10, precision);
+    const points = [];
+    const current = new Array(dims).fill(0);
+    let index = 0;
+
+    while (index < encoded.length) {
+        const point = new Array(dims);
+        for (let d = 0; d < dims; d++) {
+            let result = 0;
+            let shift = 0;
+            let chunk;
+            do {
+                chunk = encoded.charCodeAt(index++) - 63;
+                result |= (chunk & 0x1f) << shift;
+                shift += 5;
+            } while (chunk >= 0x20);
+
+            current[d] += (result & 1) ? ~(result >> 1) : (result >> 1);
+            point[d] = current[d] / factor;
+        }
+        points.push(point);
+    }
+
+    return points;
+};
+
+// Expand an encoded trajectory back to [[lat, lon, z], ...]
+const decodeGpsPoints = (encodedPoints, encoding) => {
+    const path = decodePolyline(encodedPoints.path, 2, encoding.precision);
+    const elevation = encodedPoints.elevation
+        ? decodePolyline(encodedPoints.elevation, 1, encoding.elevation_precision)
+        : [];
+
+    return path.map(([lat, lon], i) => [lat, lon, elevation[i] ? elevation[i][0] : 0]);
+};
+
+// ===================
+// RESPONSES
+// ===================
+
+// Convert a polyline-encoded analysis to the plain JSON shape the screens use
+export const decodeAnalysis = (data) => {
+    if (!data || !data.encoding || data.encoding.format !== 'polyline') {
+        return data;
+    }
+
+    const trajectories = {};
+    Object.entries(data.trajectories || {}).forEach(([key, trajectory]) => {
+        const { points_encoded, search_zone, ...rest } = trajectory;
+        const zone = { ...search_zone };
+
+        if (zone.perimeter_encoded !== undefined) {
+            zone.perimeter_points = decodePolyline(zone.perimeter_encoded, 2, data.encoding.precision);
+            delete zone.perimeter_encoded;
+        }
+
+        trajectories[key] = {
+            ...rest,
+            search_zone: zone,
+        };
+        // Landing-only analyses carry no flight points
+        if (points_encoded) {
+            trajectories[key].points = decodeGpsPoints(points_encoded, data.encoding);
+        }
+    });
+
+    return { ...data, trajectories, encoding: null };
+};
+
+export default {
+    decodePolyline,
+    decodeAnalysis,
+};
@@ -7,6 +7,8 @@ import cv2
 import numpy as np
 # import onnxruntime as ort  # Not needed yet
 
+from frame_preprocessor import FramePreprocessor
+
 class ONNXBallDetector:
     def __init__(self, threshold=0.3):
         """
@@ -16,6 +18,7 @@ class ONNXBallDetector:
         You can later add a proper ONNX model.
         """
         self.threshold = threshold
+        self.preprocessor = FramePreprocessor()
         print("ONNXBallDetector initialized (using Hough circles for now)")
         print("Note: For better accuracy, download a YOLOv8 ONNX model")
         
@@ -26,16 +29,8 @@ class ONNXBallDetector:
         Returns:
             (center, radius) tuple or (None, 0)
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply CLAHE for better contrast
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray = clahe.apply(gray)
-        
-        # Bilateral filter for noise reduction
-        gray = cv2.bilateralFilter(gray, 5, 75, 75)
-        gray = cv2.GaussianBlur(gray, (5, 5), 1.0)
+        # Grayscale, CLAHE, bilateral and Gaussian blur (into reused buffers)
+        gray = self.preprocessor.enhance(frame)
         
         # Detect circles
         circles = cv2.HoughCircles(
@@ -5,14 +5,24 @@ Queries OSM Overpass API for golf course features
 
 import requests
 import json
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
+from course_geometry import CourseGeometry
+
+
+# Compiled course geometries kept per fetcher (least recently used evicted)
+MAX_CACHED_GEOMETRIES = 32
+
 
 class OSMGolfFetcher:
     """Fetches golf course data from OpenStreetMap"""
 
     def __init__(self):
         self.overpass_url = "https://overpass-api.de/api/interpreter"
+        self._geometry_cache: "OrderedDict[tuple, CourseGeometry]" = OrderedDict()
+        self._geometry_lock = threading.Lock()
 
     def search_courses_by_name(self, course_name: str, country: str = "US") -> List[Dict]:
         """
@@ -158,6 +168,35 @@ class OSMGolfFetcher:
             print(f"Error fetching course details: {e}")
             return {'greens': [], 'tees': [], 'fairways': [], 'bunkers': [], 'water': [], 'pins': [], 'holes': []}
 
+    def get_course_geometry(self, lat: float, lon: float, radius: int = 1000) -> CourseGeometry:
+        """
+        Fetches course features once and compiles them into a spatial index
+
+        Args:
+            lat: Latitude of course center
+            lon: Longitude of course center
+            radius: Search radius in meters (default: 1000)
+
+        Returns:
+            CourseGeometry, cached per course location (~100m grid) and radius;
+            at most MAX_CACHED_GEOMETRIES are kept, least recently used first out
+        """
+        key = (round(lat, 3), round(lon, 3), radius)
+        with self._geometry_lock:
+            if key in self._geometry_cache:
+                self._geometry_cache.move_to_end(key)
+                return self._geometry_cache[key]
+
+        geometry = CourseGeometry(self.get_course_details(lat, lon, radius), origin=(lat, lon))
+
+        # Don't cache failed fetches, so the next call retries
+        if len(geometry) > 0 or len(geometry.hole_numbers) > 0:
+            with self._geometry_lock:
+                self._geometry_cache[key] = geometry
+                if len(self._geometry_cache) > MAX_CACHED_GEOMETRIES:
+                    self._geometry_cache.popitem(last=False)
+        return geometry
+
     def visualize_osm_course(self, course_name: str, output_file: str = "osm_course.html"):
         """
         Searches for a course and creates an interactive map
@@ -0,0 +1,177 @@
+"""
+Encoded Polyline Wire Format
+
+Compact encoding for GPS trajectories and search zones in API responses:
+1. Scale coordinates to integers (1e-6 degrees = 11 cm by default)
+2. Delta-encode consecutive points
+3. Write each delta in Google's encoded-polyline alphabet (5 bits per
+   printable character, zig-zag signed)
+
+Elevation travels as a separate one-dimensional polyline (decimeters by
+default), so standard polyline decoders still read the lat/lon path.
+"""
+
+import numpy as np
+
+
+DEFAULT_PRECISION = 6            # lat/lon decimals (Google uses 5, OSRM 6)
+DEFAULT_ELEVATION_PRECISION = 1  # elevation decimals (0.1 m)
+
+# Enough 5-bit chunks for any 32-bit zig-zag value
+_MAX_CHUNKS = 7
+
+
+def encode_values(values):
+    """
+    Encode signed integers (already delta-coded) as polyline characters.
+
+    Args:
+        values: 1D array of integers
+
+    Returns:
+        ASCII string
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if values.size == 0:
+        return ""
+
+    # Zig-zag: sign moves to the lowest bit
+    zigzag = np.where(values < 0, ~(values << 1), values << 1)
+
+    # Split into 5-bit chunks, least significant first
+    shifts = 5 * np.arange(_MAX_CHUNKS)
+    chunks = (zigzag[:, None] >> shifts) & 0x1F
+    count = np.maximum(1, (np.floor(np.log2(np.maximum(zigzag, 1))).astype(np.int64) // 5) + 1)
+    used = np.arange(_MAX_CHUNKS) < count[:, None]
+
+    # All chunks but the last of each value carry the continuation bit
+    last = np.arange(_MAX_CHUNKS) == (count - 1)[:, None]
+    chars = chunks + np.where(last, 0, 0x20) + 63
+
+    return chars[used].astype(np.uint8).tobytes().decode("ascii")
+
+
+def decode_values(encoded):
+    """
+    Decode polyline characters back to the signed integers.
+
+    Args:
+        encoded: String from encode_values
+
+    Returns:
+        1D int64 array
+    """
+    values = []
+    result = shift = 0
+    for byte in encoded.encode("ascii"):
+        chunk = byte - 63
+        result |= (chunk & 0x1F) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+    return np.array(values, dtype=np.int64)
+
+
+def encode_polyline(points, precision=DEFAULT_PRECISION):
+    """
+    Encode (N, D) coordinates (e.g. [lat, lon]) as one polyline string.
+
+    Args:
+        points: (N, D) array-like of floats
+        precision: Decimal places kept
+
+    Returns:
+        Encoded string (dimensions interleaved per point, as Google's format)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points[:, None]
+    scaled = np.round(points * 10 ** precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, scaled.shape[1]), dtype=np.int64))
+    return encode_values(deltas.reshape(-1))
+
+
+def decode_polyline(encoded, dims=2, precision=DEFAULT_PRECISION):
+    """
+    Decode a polyline string.
+
+    Args:
+        encoded: String from encode_polyline
+        dims: Values per point
+        precision: Decimal places used when encoding
+
+    Returns:
+        (N, dims) float array
+    """
+    deltas = decode_values(encoded).reshape(-1, dims)
+    return np.cumsum(deltas, axis=0) / 10 ** precision
+
+
+def encode_gps_points(points, precision=DEFAULT_PRECISION,
+                      elevation_precision=DEFAULT_ELEVATION_PRECISION):
+    """
+    Encode [lat, lon] or [lat, lon, elevation] points for the wire.
+
+    Args:
+        points: (N, 2) or (N, 3) array-like
+        precision: lat/lon decimal places
+        elevation_precision: elevation decimal places
+
+    Returns:
+        dict with "path" (lat/lon polyline) and, for 3D input, "elevation"
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+    encoded = {"path": encode_polyline(points[:, :2], precision)}
+    if points.shape[1] > 2:
+        encoded["elevation"] = encode_polyline(points[:, 2], elevation_precision)
+    return encoded
+
+
+def encoding_info(precision=DEFAULT_PRECISION, elevation_precision=DEFAULT_ELEVATION_PRECISION):
+    """Describe the encoding so clients can decode responses."""
+    return {
+        "format": "polyline",
+        "precision": precision,
+        "elevation_precision": elevation_precision
+    }
+
+
+if __name__ == "__main__":
+    """Compare polyline and JSON float encodings"""
+    import json
+    import time
+    from trajectory_physics import TrajectorySimulator
+    from gps_converter import trajectory_to_gps
+
+    print("Encoded Polyline Test")
+    print("=" * 60)
+
+    # Reference string from Google's polyline documentation
+    google = encode_polyline([[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]], precision=5)
+    print(f"Google example: {google} ({'ok' if google == '_p~iF~ps|U_ulLnnqC_mqNvxq`@' else 'MISMATCH'})")
+
+    points = trajectory_to_gps(TrajectorySimulator().simulate_flight(145, 12, 2500, 10)["points"],
+                               34.05, -118.24, 30)
+
+    start_time = time.perf_counter()
+    as_json = json.dumps(points)
+    json_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    encoded = encode_gps_points(points)
+    as_polyline = json.dumps(encoded)
+    polyline_time = time.perf_counter() - start_time
+
+    decoded = decode_polyline(encoded["path"])
+    elevation = decode_polyline(encoded["elevation"], dims=1, precision=DEFAULT_ELEVATION_PRECISION)
+    error_m = np.abs(decoded - np.array(points)[:, :2]).max() * 111_000
+
+    print(f"\n{len(points)} points:")
+    print(f"  JSON floats: {len(as_json):6d} bytes, {json_time * 1000:.2f} ms")
+    print(f"  Polyline:    {len(as_polyline):6d} bytes, {polyline_time * 1000:.2f} ms "
+          f"({len(as_json) / len(as_polyline):.1f}x smaller)")
+    print(f"  Max position error: {error_m * 100:.1f} cm, "
+          f"elevation {np.abs(elevation[:, 0] - np.array(points)[:, 2]).max() * 100:.1f} cm")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,359 @@
+"""
+Terrain Elevation Model
+
+Course ground heights from a local digital elevation model (DEM):
+1. DEM grids are stored as .npy rasters with a small JSON sidecar
+   (bounds and resolution) and opened memory-mapped, so only touched
+   tiles of a large region are ever read
+2. Heights are bilinearly interpolated for whole arrays of lat/lon at once
+3. Trajectories are intersected with the terrain surface in one vectorized
+   pass to find where uphill and downhill shots really land
+
+A DEM is registered per course by dropping <name>.npy + <name>.json into
+models/terrain/ (see save_elevation_model).
+"""
+
+import json
+import math
+from pathlib import Path
+import numpy as np
+from gps_converter import get_projection, EARTH_RADIUS
+
+
+DEFAULT_TERRAIN_DIR = Path("models") / "terrain"
+
+
+class ElevationModel:
+    """
+    Regular lat/lon elevation grid with bilinear interpolation.
+
+    Row 0 is the northern edge and column 0 the western edge; heights are
+    in meters above sea level.
+    """
+
+    def __init__(self, heights, north, west, cell_size_lat_deg, cell_size_lon_deg, name=None):
+        """
+        Args:
+            heights: (rows, cols) array (a numpy.memmap for large regions)
+            north: Latitude of row 0 (cell centers)
+            west: Longitude of column 0 (cell centers)
+            cell_size_lat_deg: Latitude spacing between rows
+            cell_size_lon_deg: Longitude spacing between columns
+            name: Optional course/region name
+        """
+        if heights.ndim != 2 or min(heights.shape) < 2:
+            raise ValueError("DEM must be a 2-D grid of at least 2x2 cells")
+        if cell_size_lat_deg <= 0 or cell_size_lon_deg <= 0:
+            raise ValueError("DEM cell sizes must be positive")
+
+        self.heights = heights
+        self.north = north
+        self.west = west
+        self.cell_size_lat_deg = cell_size_lat_deg
+        self.cell_size_lon_deg = cell_size_lon_deg
+        self.name = name
+
+    @property
+    def south(self):
+        return self.north - (self.heights.shape[0] - 1) * self.cell_size_lat_deg
+
+    @property
+    def east(self):
+        return self.west + (self.heights.shape[1] - 1) * self.cell_size_lon_deg
+
+    def contains(self, lat, lon):
+        """Check whether a point lies inside the grid."""
+        return self.south <= lat <= self.north and self.west <= lon <= self.east
+
+    def elevation_at(self, lat, lon):
+        """
+        Ground elevation at arbitrary points (clamped to the grid edges).
+
+        Args:
+            lat, lon: Scalars or arrays of the same shape
+
+        Returns:
+            Elevation in meters (float for scalars, array otherwise)
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        rows, cols = self.heights.shape
+
+        r = np.clip((self.north - lat) / self.cell_size_lat_deg, 0, rows - 1)
+        c = np.clip((lon - self.west) / self.cell_size_lon_deg, 0, cols - 1)
+        r0 = np.minimum(r.astype(np.int64), rows - 2)
+        c0 = np.minimum(c.astype(np.int64), cols - 2)
+        fr = r - r0
+        fc = c - c0
+
+        # Fancy indexing only pages in the cells that are touched
+        h00 = self.heights[r0, c0]
+        h01 = self.heights[r0, c0 + 1]
+        h10 = self.heights[r0 + 1, c0]
+        h11 = self.heights[r0 + 1, c0 + 1]
+
+        top = h00 + (h01 - h00) * fc
+        bottom = h10 + (h11 - h10) * fc
+        result = top + (bottom - top) * fr
+
+        return float(result) if result.ndim == 0 else result
+
+    def local_to_gps(self, points, start_lat, start_lon, bearing_deg):
+        """
+        Convert shot-frame points to lat/lon (flat-earth, vectorized).
+
+        Args:
+            points: (N, 2+) array of [x forward, y lateral right, ...] in meters
+            start_lat, start_lon: Tee position
+            bearing_deg: Shot direction (degrees from North)
+
+        Returns:
+            (lat, lon) arrays of length N
+        """
+        points = np.asarray(points, dtype=np.float64)
+        return get_projection(start_lat, start_lon).shot_to_gps(points[:, 0], points[:, 1], bearing_deg)
+
+    def relative_height(self, x, y, start_lat, start_lon, bearing_deg, tee_elevation=None):
+        """
+        Ground height relative to the tee under shot-frame positions.
+
+        Args:
+            x, y: (N,) forward and lateral (right) offsets in meters
+            start_lat, start_lon: Tee position
+            bearing_deg: Shot direction (degrees from North)
+            tee_elevation: Tee elevation (default: from the DEM)
+
+        Returns:
+            (N,) ground height in meters (positive = above the tee)
+        """
+        if tee_elevation is None:
+            tee_elevation = self.elevation_at(start_lat, start_lon)
+        lat, lon = get_projection(start_lat, start_lon).shot_to_gps(
+            np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), bearing_deg
+        )
+        return np.asarray(self.elevation_at(lat, lon)) - tee_elevation
+
+    def lowest_relative_height(self, start_lat, start_lon, radius_m=400):
+        """
+        Lowest ground within radius_m of the tee, relative to the tee.
+
+        Used as the simulator's ground_level_m so flights keep integrating
+        until they can have met the terrain.
+        """
+        tee = self.elevation_at(start_lat, start_lon)
+        d_lat = math.degrees(radius_m / EARTH_RADIUS)
+        d_lon = math.degrees(radius_m / (EARTH_RADIUS * math.cos(math.radians(start_lat))))
+
+        rows, cols = self.heights.shape
+        r0 = int(np.clip((self.north - (start_lat + d_lat)) / self.cell_size_lat_deg, 0, rows - 1))
+        r1 = int(np.clip((self.north - (start_lat - d_lat)) / self.cell_size_lat_deg, 0, rows - 1))
+        c0 = int(np.clip((start_lon - d_lon - self.west) / self.cell_size_lon_deg, 0, cols - 1))
+        c1 = int(np.clip((start_lon + d_lon - self.west) / self.cell_size_lon_deg, 0, cols - 1))
+
+        window = self.heights[r0:r1 + 1, c0:c1 + 1]
+        return float(np.min(window)) - tee
+
+    def find_landing(self, points, start_lat, start_lon, bearing_deg, tee_elevation=None):
+        """
+        Intersect a trajectory with the terrain.
+
+        Every point's ground height is looked up in one vectorized call; the
+        landing is the first point after the tee on or below the ground,
+        linearly interpolated with the point before it. Ground rising above
+        the ball's first step (a bank right in front of the tee) is an
+        immediate landing at the tee.
+
+        Args:
+            points: (N, 3) trajectory [x, y, z] in meters, z relative to the tee
+            start_lat, start_lon: Tee position
+            bearing_deg: Shot direction (degrees from North)
+            tee_elevation: Tee elevation (default: from the DEM)
+
+        Returns:
+            dict with landing [x, y, z] (z relative to the tee), landing_index
+            (points before the landing), landing_step (fractional point index
+            of the landing, i.e. time / step), landing_gps, ground_elevation_m,
+            elevation_change_m and carry_distance_yards, or None if the
+            trajectory ends before it meets the terrain
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(points) < 2:
+            return None
+
+        if tee_elevation is None:
+            tee_elevation = self.elevation_at(start_lat, start_lon)
+
+        ground = self.relative_height(points[:, 0], points[:, 1], start_lat, start_lon,
+                                      bearing_deg, tee_elevation)
+        clearance = points[:, 2] - ground
+
+        # The tee sits on the ground; the ball can't pass through the terrain,
+        # so the first later point on or below it ends the flight
+        below = np.flatnonzero(clearance[1:] <= 0)
+        if below.size == 0:
+            return None
+        i = int(below[0])
+
+        fraction = clearance[i] / (clearance[i] - clearance[i + 1]) if clearance[i] > 0 else 0.0
+        landing = points[i] + fraction * (points[i + 1] - points[i])
+        landing_lat, landing_lon = self.local_to_gps(landing[None, :], start_lat, start_lon, bearing_deg)
+        ground_elevation = self.elevation_at(landing_lat[0], landing_lon[0])
+
+        return {
+            "landing": [float(landing[0]), float(landing[1]), float(ground_elevation - tee_elevation)],
+            "landing_index": i + 1,
+            "landing_step": float(i + fraction),
+            "landing_gps": {"lat": float(landing_lat[0]), "lon": float(landing_lon[0])},
+            "ground_elevation_m": float(ground_elevation),
+            "elevation_change_m": float(ground_elevation - tee_elevation),
+            "carry_distance_yards": float(math.hypot(landing[0], landing[1]) * 1.09361)
+        }
+
+
+def save_elevation_model(heights, north, west, cell_size_lat_deg, cell_size_lon_deg,
+                         name, terrain_dir=DEFAULT_TERRAIN_DIR):
+    """
+    Store a DEM grid as <name>.npy (float32) plus <name>.json metadata.
+
+    Returns:
+        Path of the .npy file
+    """
+    terrain_dir = Path(terrain_dir)
+    terrain_dir.mkdir(parents=True, exist_ok=True)
+
+    grid_path = terrain_dir / f"{name}.npy"
+    np.save(grid_path, np.asarray(heights, dtype=np.float32))
+
+    with open(terrain_dir / f"{name}.json", 'w') as f:
+        json.dump({
+            "north": north,
+            "west": west,
+            "cell_size_lat_deg": cell_size_lat_deg,
+            "cell_size_lon_deg": cell_size_lon_deg,
+            "rows": int(np.shape(heights)[0]),
+            "cols": int(np.shape(heights)[1])
+        }, f, indent=2)
+
+    return grid_path
+
+
+def load_elevation_model(grid_path):
+    """
+    Open a DEM memory-mapped (nothing is read until cells are touched).
+
+    Args:
+        grid_path: Path to <name>.npy with a <name>.json sidecar
+
+    Returns:
+        ElevationModel
+    """
+    grid_path = Path(grid_path)
+    with open(grid_path.with_suffix(".json"), 'r') as f:
+        meta = json.load(f)
+
+    heights = np.load(grid_path, mmap_mode="r")
+    return ElevationModel(
+        heights,
+        north=meta["north"],
+        west=meta["west"],
+        cell_size_lat_deg=meta["cell_size_lat_deg"],
+        cell_size_lon_deg=meta["cell_size_lon_deg"],
+        name=grid_path.stem
+    )
+
+
+class TerrainService:
+    """Finds the DEM covering a location among the registered course grids."""
+
+    def __init__(self, terrain_dir=DEFAULT_TERRAIN_DIR):
+        self.terrain_dir = Path(terrain_dir)
+        self._bounds = None   # name -> (south, north, west, east, path)
+        self._models = {}     # name -> ElevationModel (opened on first use)
+
+    def _scan(self):
+        """Read the JSON sidecars only; grids are mapped on demand."""
+        self._bounds = {}
+        if not self.terrain_dir.exists():
+            return
+
+        for meta_path in self.terrain_dir.glob("*.json"):
+            grid_path = meta_path.with_suffix(".npy")
+            if not grid_path.exists():
+                continue
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            south = meta["north"] - (meta["rows"] - 1) * meta["cell_size_lat_deg"]
+            east = meta["west"] + (meta["cols"] - 1) * meta["cell_size_lon_deg"]
+            self._bounds[meta_path.stem] = (south, meta["north"], meta["west"], east, grid_path)
+
+    def get_model(self, lat, lon):
+        """
+        Get the elevation model covering a point.
+
+        Returns:
+            ElevationModel, or None if no registered DEM covers the point
+        """
+        if self._bounds is None:
+            self._scan()
+
+        for name, (south, north, west, east, grid_path) in self._bounds.items():
+            if south <= lat <= north and west <= lon <= east:
+                if name not in self._models:
+                    self._models[name] = load_elevation_model(grid_path)
+                return self._models[name]
+        return None
+
+
+# Singleton instance
+_terrain_service = None
+
+
+def get_terrain_service(terrain_dir=DEFAULT_TERRAIN_DIR):
+    """Get or create the terrain service singleton"""
+    global _terrain_service
+    if _terrain_service is None:
+        _terrain_service = TerrainService(terrain_dir)
+    return _terrain_service
+
+
+if __name__ == "__main__":
+    """Test terrain-aware landing on a synthetic hillside"""
+    import tempfile
+    import time
+    from trajectory_physics import TrajectorySimulator
+
+    print("Terrain Model Test")
+    print("=" * 60)
+
+    # 2km x 2km synthetic course at ~1m resolution, sloping up to the north
+    start_lat, start_lon = 34.05, -118.24
+    rows = cols = 2000
+    cell_lat = 1 / 111320
+    cell_lon = 1 / (111320 * math.cos(math.radians(start_lat)))
+    north = start_lat + rows / 2 * cell_lat
+    west = start_lon - cols / 2 * cell_lon
+    slope = np.linspace(20, -20, rows, dtype=np.float32)[:, None] * np.ones(cols, dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as terrain_dir:
+        save_elevation_model(100 + slope, north, west, cell_lat, cell_lon, "hillside", terrain_dir)
+
+        start_time = time.perf_counter()
+        model = TerrainService(terrain_dir).get_model(start_lat, start_lon)
+        print(f"\nOpened {model.heights.shape} DEM in {(time.perf_counter() - start_time) * 1000:.2f} ms "
+              f"(memory-mapped: {isinstance(model.heights, np.memmap)})")
+
+        simulator = TrajectorySimulator()
+        floor = min(model.lowest_relative_height(start_lat, start_lon), 0) - 1
+        result = simulator.simulate_flight(145, 12, 2500, 0, ground_level_m=floor)
+        flat = simulator.simulate_flight(145, 12, 2500, 0)
+
+        for label, bearing in (("Uphill (north)", 0), ("Downhill (south)", 180)):
+            start_time = time.perf_counter()
+            landing = model.find_landing(result["points"], start_lat, start_lon, bearing)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            print(f"\n{label}:")
+            print(f"  Carry: {landing['carry_distance_yards']:.1f} yds "
+                  f"(flat: {flat['carry_distance_yards']:.1f} yds)")
+            print(f"  Elevation change: {landing['elevation_change_m']:+.1f} m ({elapsed:.2f} ms)")
+
+    print("\n" + "=" * 60)
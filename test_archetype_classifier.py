@@ -0,0 +1,110 @@
+"""
+Nearest-neighbour archetype classifier:
+- every archetype's own early flight ranks it first (or its side-on twin)
+- side-on ties are symmetric and merged into one entry
+- the index builds from the lookup tables too; bad inputs are rejected
+
+Run directly (python test_archetype_classifier.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from shot_archetypes import SHOT_TYPES
+from archetype_classifier import ArchetypeClassifier, chord_angles
+from archetype_table_format import load_binary_tables
+
+simulator = TrajectorySimulator()
+classifier = ArchetypeClassifier.from_simulator(SHOT_TYPES, simulator=simulator)
+
+# 14 tracked frames over the first 0.45 s, between the indexed speeds
+TIMES = np.linspace(0, 0.45, 14)
+
+
+def early_flight(key, speed_mph=137):
+    archetype = SHOT_TYPES[key]
+    return simulator.positions_at_times(TIMES, speed_mph, archetype["launch_angle"],
+                                        archetype["backspin_rpm"], archetype["side_spin_axis"])[0]
+
+
+def test_chord_angles():
+    """Elevation and azimuth of the chord from the launch point."""
+    elevation, azimuth = chord_angles([[10.0, 10.0, 10.0], [10.0, -10.0, 0.0]])
+
+    np.testing.assert_allclose(elevation, [45.0, 0.0])
+    np.testing.assert_allclose(azimuth, [45.0, -45.0])
+
+
+def test_ranks_own_archetype_first():
+    """With azimuth each archetype ranks first, up to its side-on twin."""
+    for key in SHOT_TYPES:
+        results = classifier.classify(TIMES, early_flight(key), k=3)
+        best = results[0]
+
+        assert len(results) == 3
+        assert sum(r["weight"] for r in results) == pytest.approx(1.0)
+        assert key == best["archetype"] or key in classifier.side_on_equivalents[best["archetype"]]
+        if not classifier.side_on_equivalents[key]:
+            assert best["archetype"] == key and best["weight"] > 0.9
+
+
+def test_side_on_ties_merge():
+    """Without azimuth tied archetypes are one entry listing the others."""
+    equivalents = classifier.side_on_equivalents
+    for key, tied in equivalents.items():
+        assert all(key in equivalents[other] for other in tied)
+    assert any(equivalents.values())
+
+    for key in SHOT_TYPES:
+        positions = early_flight(key)
+        positions[:, 1] = np.nan
+        results = classifier.classify(TIMES, positions, k=3)
+        best = results[0]
+
+        assert key == best["archetype"] or key in best["equivalent_archetypes"]
+        assert sorted(best["equivalent_archetypes"]) == sorted(equivalents[best["archetype"]])
+        named = [r["archetype"] for r in results] + [a for r in results for a in r["equivalent_archetypes"]]
+        assert len(named) == len(set(named))
+
+
+def test_speed_narrows_variant():
+    """A measured speed picks the nearest indexed speed variant."""
+    results = classifier.classify(TIMES, early_flight("high_balloon", 150), speed_mph=150, k=1)
+
+    assert results[0]["archetype"] == "high_balloon"
+    assert results[0]["variant"] == "150mph"
+
+
+def test_from_lookup_tables():
+    """The committed binary tables build an index over every variant."""
+    tables = load_binary_tables("models/archetype_lookup_tables.bin")
+    from_tables = ArchetypeClassifier.from_lookup_tables(tables)
+
+    assert set(from_tables.archetypes) == set(tables.archetypes)
+    assert len(from_tables.archetypes) == sum(len(tables.variants(a)) for a in tables.archetypes)
+    results = from_tables.classify(TIMES, early_flight("high_balloon"), k=2)
+    assert len(results) == 2
+
+
+def test_rejects_unusable_observations():
+    """Too few points, mismatched times or a too-short flight raise ValueError."""
+    positions = early_flight("straight")
+    with pytest.raises(ValueError):
+        classifier.classify(TIMES[:1], positions[:1])
+    with pytest.raises(ValueError):
+        classifier.classify(TIMES, positions[:-1])
+    with pytest.raises(ValueError):
+        classifier.classify(TIMES[:2], positions[:2])  # 0.035 s < first signature time
+
+    assert classifier.classify_points([{'x': 0, 'y': 0, 'frame': 0}], None) == []
+
+
+if __name__ == "__main__":
+    print("Archetype Classifier Test")
+    print("=" * 60)
+
+    for test in (test_chord_angles, test_ranks_own_archetype_first, test_side_on_ties_merge,
+                 test_speed_narrows_variant, test_from_lookup_tables, test_rejects_unusable_observations):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
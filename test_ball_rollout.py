@@ -0,0 +1,101 @@
+"""
+Bounce-and-roll rollout:
+- per-lie coefficients (names, per-ball names, unknown lies)
+- surface and backspin ordering of rollout distances
+- rolling along the direction of travel, per-ball lies in one pass
+
+Run directly (python test_ball_rollout.py) or under pytest.
+"""
+import math
+import numpy as np
+import pytest
+from ball_rollout import simulate_rollout, surface_arrays, SURFACE_COEFFICIENTS, DEFAULT_LIE
+
+# Typical driver landing: 130m out, 20 m/s forward, 15 m/s down, 2000 rpm
+LANDING = np.array([[130.0, 0.0]])
+VELOCITY = np.array([[20.0, 0.0, -15.0]])
+SPIN = 2000.0
+
+
+def test_surface_arrays():
+    """Names broadcast, per-ball names index the table, unknown lies use the default."""
+    single = surface_arrays("green", 3)
+    assert set(single) == set(SURFACE_COEFFICIENTS["green"])
+    np.testing.assert_array_equal(single["restitution"], [0.30] * 3)
+
+    mixed = surface_arrays(["sand", "mud", "green"], 3)
+    np.testing.assert_array_equal(mixed["rolling_resistance"], [
+        SURFACE_COEFFICIENTS["sand"]["rolling_resistance"],
+        SURFACE_COEFFICIENTS[DEFAULT_LIE]["rolling_resistance"],
+        SURFACE_COEFFICIENTS["green"]["rolling_resistance"]])
+
+    with pytest.raises(ValueError):
+        surface_arrays(["green", "sand"], 3)
+
+
+def test_surfaces_order_rollout():
+    """Firm, fast surfaces roll farthest; water stops the ball dead."""
+    rollout = {lie: simulate_rollout(LANDING, VELOCITY, SPIN, lie)["rollout_m"][0]
+               for lie in SURFACE_COEFFICIENTS}
+
+    assert rollout["water"] == 0.0
+    assert rollout["hardpan"] > rollout["fairway"] > rollout["rough_light"] > rollout["rough_heavy"]
+    assert rollout["sand"] < rollout["rough_light"]
+    assert all(distance >= 0 for distance in rollout.values())
+
+
+def test_backspin_shortens_rollout():
+    """More backspin bites harder on the bounces."""
+    low = simulate_rollout(LANDING, VELOCITY, 1000, "green")
+    high = simulate_rollout(LANDING, VELOCITY, 8000, "green")
+
+    assert high["rollout_m"][0] < low["rollout_m"][0]
+
+
+def test_rolls_along_direction_of_travel():
+    """The rest position follows the horizontal landing velocity."""
+    angle = math.radians(25)
+    velocity = [[20 * math.cos(angle), 20 * math.sin(angle), -15.0]]
+    straight = simulate_rollout(LANDING, VELOCITY, SPIN)
+    turned = simulate_rollout(LANDING, velocity, SPIN)
+
+    offset = turned["rest"][0] - LANDING[0]
+    assert turned["rollout_m"][0] == pytest.approx(straight["rollout_m"][0])
+    assert math.atan2(offset[1], offset[0]) == pytest.approx(angle)
+
+    vertical = simulate_rollout(LANDING, [[0.0, 0.0, -20.0]], SPIN)
+    np.testing.assert_array_equal(vertical["rest"], LANDING)
+
+
+def test_components_and_bounces():
+    """Rollout is bounce plus roll distance; hard landings bounce."""
+    result = simulate_rollout(LANDING, VELOCITY, SPIN, "fairway")
+
+    assert result["rollout_m"][0] == pytest.approx(result["bounce_distance_m"][0] + result["roll_distance_m"][0])
+    assert result["bounces"][0] >= 1
+    assert np.linalg.norm(result["rest"][0] - LANDING[0]) == pytest.approx(result["rollout_m"][0])
+
+
+def test_per_ball_lies_match_single_runs():
+    """One vectorized pass with mixed lies equals separate runs."""
+    lies = ["fairway", "green", "sand", "rough_heavy"]
+    landing = np.repeat(LANDING, 4, axis=0)
+    velocity = np.repeat(VELOCITY, 4, axis=0)
+    batch = simulate_rollout(landing, velocity, SPIN, lies)
+
+    for i, lie in enumerate(lies):
+        single = simulate_rollout(LANDING, VELOCITY, SPIN, lie)
+        np.testing.assert_allclose(batch["rest"][i], single["rest"][0])
+
+
+if __name__ == "__main__":
+    print("Ball Rollout Test")
+    print("=" * 60)
+
+    for test in (test_surface_arrays, test_surfaces_order_rollout, test_backspin_shortens_rollout,
+                 test_rolls_along_direction_of_travel, test_components_and_bounces,
+                 test_per_ball_lies_match_single_runs):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
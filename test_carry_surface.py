@@ -0,0 +1,119 @@
+"""
+Carry surface lookups against the batch engine, and its file format:
+- grid nodes reproduce simulate_flight, off-node queries stay close to it
+- scalar and batch queries agree, queries clamp to the grid
+- save/load round trip, outdated or missing files are refused
+
+Run directly (python test_carry_surface.py) or under pytest.
+"""
+import os
+import tempfile
+import numpy as np
+from trajectory_physics import TrajectorySimulator
+from carry_surface import generate_carry_surface, load_carry_surface, SURFACE_FIELDS
+
+simulator = TrajectorySimulator()
+
+# Small grid around the stock driver (3^6 = 729 nodes, ~0.1 s to build)
+SURFACE_AXES = {
+    "speed_mph": np.arange(130, 151, 10, dtype=np.float64),
+    "launch_angle_deg": np.arange(10, 15, 2, dtype=np.float64),
+    "backspin_rpm": np.arange(2000, 3001, 500, dtype=np.float64),
+    "spin_axis_deg": np.arange(-10, 11, 10, dtype=np.float64),
+    "headwind_mph": np.arange(-10, 11, 10, dtype=np.float64),
+    "crosswind_mph": np.arange(-10, 11, 10, dtype=np.float64),
+}
+
+surface = generate_carry_surface(simulator, SURFACE_AXES)
+
+# Off-node shots: (speed mph, launch angle, backspin rpm, spin axis, wind mph, wind direction)
+SHOTS = [(137, 11.3, 2330, 4, 7, 30), (143, 13.1, 2810, -6, 9, 200), (132, 10.4, 2150, 8, 3, 100)]
+
+
+def test_nodes_match_rk4():
+    """On a node only float32 storage error remains."""
+    node = simulator.simulate_flight(140, 12, 2500, 0)
+    query = surface.query(140, 12, 2500, 0)
+
+    assert abs(query["carry_distance_yards"] - node["carry_distance_yards"]) < 1e-3
+    assert abs(query["flight_time_seconds"] - node["flight_time_seconds"]) < 1e-5
+    landing = node["points"][-1]
+    assert abs(query["landing_x_m"] - landing[0]) < 1e-3
+    assert abs(query["landing_y_m"] - landing[1]) < 1e-3
+
+
+def test_interpolation_close_to_rk4():
+    """Between nodes the multilinear error stays within a yard."""
+    for shot in SHOTS:
+        exact = simulator.simulate_flight(*shot)
+        query = surface.query(*shot)
+        assert abs(query["carry_distance_yards"] - exact["carry_distance_yards"]) < 1.0
+        assert abs(query["curve_yards"] - exact["curve_yards"]) < 0.5
+        assert abs(query["flight_time_seconds"] - exact["flight_time_seconds"]) < 0.05
+
+
+def test_batch_matches_scalar():
+    """Scalar and batch queries share the same table."""
+    speed, angle, backspin, axis, wind, direction = np.array(SHOTS, dtype=float).T
+    batch = surface.query_batch(speed, angle, backspin, axis, wind, direction)
+
+    assert set(batch) == set(SURFACE_FIELDS)
+    for i, shot in enumerate(SHOTS):
+        for field, value in surface.query(*shot).items():
+            np.testing.assert_allclose(batch[field][i], value, rtol=1e-5, atol=1e-5)
+
+
+def test_queries_clamp_to_grid():
+    """Launches outside the grid get the edge value, not an extrapolation."""
+    edge = surface.query(150, 12, 2500, 0)
+    beyond = surface.query(180, 12, 2500, 0)
+
+    assert beyond == edge
+
+
+def test_speed_for_carry_inverts_carry():
+    """The inverse lookup returns the speed that carries the distance."""
+    carry = surface.query(137, 12, 2500, 0)["carry_distance_yards"]
+
+    assert abs(surface.speed_for_carry(carry) - 137) < 0.5
+
+
+def test_save_load_round_trip():
+    """A saved surface loads back with the same table."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "surface.npz")
+        surface.save(path)
+        loaded = load_carry_surface(path)
+
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded.values, surface.values)
+    assert loaded.query(*SHOTS[0]) == surface.query(*SHOTS[0])
+
+
+def test_refuses_missing_or_outdated_files():
+    """Files without the current version, or no file, load as None."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "surface.npz")
+        assert load_carry_surface(path) is None
+
+        np.savez_compressed(
+            path,
+            values=surface.values,
+            fields=np.array(SURFACE_FIELDS),
+            axis_names=np.array(surface.axis_names),
+            **{f"axis_{name}": grid for name, grid in zip(surface.axis_names, surface.axes)}
+        )
+        assert load_carry_surface(path) is None
+
+
+if __name__ == "__main__":
+    print("Carry Surface Test")
+    print("=" * 60)
+
+    for test in (test_nodes_match_rk4, test_interpolation_close_to_rk4, test_batch_matches_scalar,
+                 test_queries_clamp_to_grid, test_speed_for_carry_inverts_carry,
+                 test_save_load_round_trip, test_refuses_missing_or_outdated_files):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
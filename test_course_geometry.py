@@ -0,0 +1,259 @@
+"""
+Compiled course geometry on synthetic side-by-side holes:
+- the STR-tree returns what a brute-force scan does
+- point-in-polygon, kind filters and nearest-feature distances
+- closed OSM rings, empty courses and the fetcher's bounded geometry cache
+- lie classification by priority, lie probabilities and per-lie rollout
+- hole snapping: distances along the path, sticky previous hole, wrap-around
+
+Run directly (python test_course_geometry.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from gps_converter import get_projection
+from course_geometry import CourseGeometry, STRTree, POLYGON_KINDS, LIE_CATEGORIES, MAX_HOLE_OFFSET_M
+from ball_rollout import COURSE_LIE_SURFACES, SURFACE_COEFFICIENTS
+from landing_ensemble import simulate_landing_ensemble
+from shot_archetypes import SHOT_TYPES
+import osm_fetcher
+from osm_fetcher import OSMGolfFetcher
+
+BASE_LAT, BASE_LON = 36.5725, -121.9486
+base = get_projection(BASE_LAT, BASE_LON)
+HOLE_SPACING = 120.0
+
+
+def outline(east, north, radius_e, radius_n, vertices=64):
+    """Regular elliptical outline centered on (east, north) in meters."""
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    lat, lon = base.enu_to_gps(east + radius_e * np.cos(angles), north + radius_n * np.sin(angles))
+    return {'coords': list(zip(lat, lon))}
+
+
+def make_course(num_holes=2):
+    """Holes side by side running north: tee, fairway (with a bunker), green, greenside bunker."""
+    features = {kind: [] for kind in POLYGON_KINDS + ('pins', 'holes')}
+    for hole in range(num_holes):
+        east = hole * HOLE_SPACING
+        features['tees'].append(outline(east, 0, 8, 12))
+        features['fairways'].append(outline(east, 220, 25, 110))
+        features['greens'].append(outline(east, 380, 15, 15))
+        features['bunkers'].append(outline(east - 10, 250, 5, 5))
+        features['bunkers'].append(outline(east + 22, 360, 6, 8))
+        lat, lon = base.enu_to_gps(np.array([east, east]), np.array([0.0, 380.0]))
+        features['holes'].append({'coords': list(zip(lat, lon)), 'ref': str(hole + 1)})
+    features['water'].append(outline(-80, 200, 30, 30))
+    return features
+
+
+def at(east, north):
+    """GPS arrays for local points."""
+    return base.enu_to_gps(np.atleast_1d(np.asarray(east, dtype=np.float64)),
+                           np.atleast_1d(np.asarray(north, dtype=np.float64)))
+
+
+geometry = CourseGeometry(make_course(), origin=(BASE_LAT, BASE_LON))
+
+
+def test_str_tree_matches_brute_force():
+    """query_points finds exactly the containing boxes; query_nearest keeps the nearest."""
+    rng = np.random.default_rng(3)
+    corners = rng.uniform(0, 1000, (300, 2))
+    boxes = np.column_stack([corners, corners + rng.uniform(1, 40, (300, 2))])
+    x, y = rng.uniform(0, 1000, (2, 500))
+    tree = STRTree(boxes)
+
+    point, item = tree.query_points(x, y)
+    inside = ((boxes[None, :, 0] <= x[:, None]) & (x[:, None] <= boxes[None, :, 2])
+              & (boxes[None, :, 1] <= y[:, None]) & (y[:, None] <= boxes[None, :, 3]))
+    assert set(zip(point.tolist(), item.tolist())) == set(zip(*map(np.ndarray.tolist, np.nonzero(inside))))
+    assert tree.depth > 1
+
+    point, item = tree.query_nearest(x, y)
+    dx = np.maximum(np.maximum(boxes[None, :, 0] - x[:, None], x[:, None] - boxes[None, :, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[None, :, 1] - y[:, None], y[:, None] - boxes[None, :, 3]), 0)
+    nearest = np.argmin(np.hypot(dx, dy), axis=1)
+    candidates = set(zip(point.tolist(), item.tolist()))
+    assert all((i, int(box)) in candidates for i, box in enumerate(nearest))
+
+
+def test_locate_matches_linear_scan():
+    """kinds_at agrees with testing every polygon against every point."""
+    rng = np.random.default_rng(5)
+    lat, lon = at(rng.uniform(-120, 160, 3000), rng.uniform(-20, 400, 3000))
+    kinds = geometry.kinds_at(lat, lon)
+
+    x, y = geometry.to_local(lat, lon)
+    reference = np.zeros_like(kinds)
+    for polygon in range(len(geometry)):
+        inside = geometry._inside_pairs(x, y, np.arange(len(x)), np.full(len(x), polygon))
+        reference[inside, geometry.polygon_kind[polygon]] = True
+
+    np.testing.assert_array_equal(kinds, reference)
+    assert kinds.any(axis=0).all()
+
+
+def test_contains_and_kind_filter():
+    """contains honors the kind filter; unknown kinds raise ValueError."""
+    lat, lon = at([0, 0, HOLE_SPACING, 60], [0, 220, 380, 200])
+
+    np.testing.assert_array_equal(geometry.contains(lat, lon), [True, True, True, False])
+    np.testing.assert_array_equal(geometry.contains(lat, lon, kind='tees'), [True, False, False, False])
+    point, polygon = geometry.locate(lat[2], lon[2], kind='greens')
+    assert geometry.feature(polygon[0]) is geometry.features['greens'][1]
+    with pytest.raises(ValueError):
+        geometry.contains(lat, lon, kind='cart_paths')
+
+
+def test_nearest_distances():
+    """Distance to the nearest outline, zero inside it."""
+    lat, lon = at([50, 0, 0], [380, 380, 100])
+    polygon, distance = geometry.nearest(lat, lon, kind='greens')
+
+    assert distance[0] == pytest.approx(35.0, abs=0.1)
+    assert distance[1] == 0.0
+    assert distance[2] == pytest.approx(265.0, abs=0.1)
+    assert geometry.feature(polygon[0]) is geometry.features['greens'][0]
+
+
+def test_closed_rings_and_empty_course():
+    """A repeated closing vertex is dropped; an empty course answers every query."""
+    features = make_course(1)
+    for feature in features['greens']:
+        feature['coords'] = feature['coords'] + feature['coords'][:1]
+    features['tees'].append({'coords': features['tees'][0]['coords'][:2]})  # degenerate
+
+    closed = CourseGeometry(features, origin=(BASE_LAT, BASE_LON))
+    assert len(closed.edge_start) == 64 * len(closed)
+    assert closed.summary()['tees'] == 1
+
+    empty = CourseGeometry({})
+    lat, lon = at([0, 10], [0, 10])
+    assert len(empty) == 0
+    assert not empty.contains(lat, lon).any()
+    polygon, distance = empty.nearest(lat, lon)
+    assert (polygon == -1).all() and np.isinf(distance).all()
+    assert (empty.locate_hole(lat, lon)['hole'] == -1).all()
+
+
+class OfflineFetcher(OSMGolfFetcher):
+    """Fetcher serving the synthetic course instead of querying Overpass."""
+
+    def __init__(self, features):
+        super().__init__()
+        self.features = features
+        self.fetches = 0
+
+    def get_course_details(self, lat, lon, radius=1000):
+        self.fetches += 1
+        return self.features
+
+
+def test_geometry_cache_is_bounded_lru():
+    """Compiled geometries are reused, least recently used evicted, failures not cached."""
+    fetcher = OfflineFetcher(make_course(1))
+    first = fetcher.get_course_geometry(BASE_LAT, BASE_LON)
+    assert fetcher.get_course_geometry(BASE_LAT - 0.0001, BASE_LON) is first
+    assert fetcher.fetches == 1
+
+    for i in range(1, osm_fetcher.MAX_CACHED_GEOMETRIES + 1):
+        fetcher.get_course_geometry(BASE_LAT, BASE_LON, radius=1000 + i)
+        if i == 1:
+            fetcher.get_course_geometry(BASE_LAT, BASE_LON)  # refresh the first entry
+    assert len(fetcher._geometry_cache) == osm_fetcher.MAX_CACHED_GEOMETRIES
+    assert fetcher.get_course_geometry(BASE_LAT, BASE_LON) is first
+    fetches = fetcher.fetches
+    fetcher.get_course_geometry(BASE_LAT, BASE_LON, radius=1001)
+    assert fetcher.fetches == fetches + 1
+
+    failed = OfflineFetcher({})
+    failed.get_course_geometry(BASE_LAT, BASE_LON)
+    failed.get_course_geometry(BASE_LAT, BASE_LON)
+    assert failed.fetches == 2
+
+
+def test_classify_lies_by_priority():
+    """Overlaps resolve by lie priority; points outside every polygon are rough."""
+    lat, lon = at([0, 0, -10, 0, 22, -80, 60], [0, 220, 250, 380, 360, 200, 200])
+    lies = [LIE_CATEGORIES[i] for i in geometry.classify_lies(lat, lon)]
+
+    assert lies == ["tee", "fairway", "bunker", "green", "bunker", "water", "rough"]
+
+
+def test_lie_probabilities():
+    """Per-group lie fractions sum to one; empty groups are all zero."""
+    lat, lon = at([0, 0, 0, 60], [220, 221, 380, 200])
+    probabilities = geometry.lie_probabilities(lat, lon, groups=[0, 0, 1, 1], num_groups=3)
+
+    fairway, green, rough = (LIE_CATEGORIES.index(lie) for lie in ("fairway", "green", "rough"))
+    assert probabilities.shape == (3, len(LIE_CATEGORIES))
+    assert probabilities[0, fairway] == 1.0
+    assert probabilities[1, green] == probabilities[1, rough] == 0.5
+    np.testing.assert_array_equal(probabilities.sum(axis=1), [1.0, 1.0, 0.0])
+    assert geometry.lie_probabilities(lat, lon).sum() == pytest.approx(1.0)
+
+
+def test_rollout_on_classified_lies():
+    """Every lie has a rollout surface; a callable lie sees the rotated landings."""
+    assert set(COURSE_LIE_SURFACES) == set(LIE_CATEGORIES)
+    assert set(COURSE_LIE_SURFACES.values()) <= set(SURFACE_COEFFICIENTS)
+
+    seen = []
+
+    def water(landings):
+        seen.append(landings.copy())
+        return "water"
+
+    landings = simulate_landing_ensemble(SHOT_TYPES, 140, samples=90, seed=2)
+    rests = simulate_landing_ensemble(SHOT_TYPES, 140, samples=90, seed=2,
+                                      include_rollout=True, lie=water)
+
+    np.testing.assert_array_equal(seen[0], np.concatenate(list(landings.values())))
+    for key in SHOT_TYPES:
+        np.testing.assert_array_equal(rests[key], landings[key])
+
+
+def test_locate_hole_distances():
+    """Fixes snap to the nearest path with distances along it; far fixes are off course."""
+    lat, lon = at([3, HOLE_SPACING - 5, 0, -60 - MAX_HOLE_OFFSET_M], [100, 300, -50, 200])
+    snapped = geometry.locate_hole(lat, lon)
+
+    np.testing.assert_array_equal(snapped['hole'][:3], [1, 2, 1])
+    np.testing.assert_allclose(snapped['distance_along_m'][:3], [100, 300, 0], atol=0.01)
+    np.testing.assert_allclose(snapped['distance_to_green_m'][:3], [280, 80, 380], atol=0.01)
+    np.testing.assert_allclose(snapped['offset_m'][:3], [3, 5, 50], atol=0.01)
+    assert snapped['hole'][3] == -1 and snapped['hole_index'][3] == -1
+    assert np.isnan(snapped['distance_along_m'][3])
+    assert geometry.hole_feature(snapped['hole_index'][1]) is geometry.features['holes'][1]
+
+
+def test_previous_hole_is_sticky_and_wraps():
+    """The hole being played and the next one are preferred; the last hole's next is hole 1."""
+    three = CourseGeometry(make_course(3), origin=(BASE_LAT, BASE_LON))
+
+    # Between holes 2 and 3, 50m from hole 2 and 70m from hole 3
+    lat, lon = at(HOLE_SPACING + 50, 150)
+    assert three.locate_hole(lat, lon)['hole'][0] == 2
+    assert three.locate_hole(lat, lon, previous_hole=3)['hole'][0] == 3
+
+    # Between holes 1 and 2, 70m from hole 1: after hole 3 the player walks to hole 1
+    lat, lon = at(70, 150)
+    assert three.locate_hole(lat, lon)['hole'][0] == 2
+    assert three.locate_hole(lat, lon, previous_hole=3)['hole'][0] == 1
+    np.testing.assert_array_equal(three.locate_hole(np.repeat(lat, 2), np.repeat(lon, 2),
+                                                    previous_hole=[3, 1])['hole'], [1, 2])
+
+
+if __name__ == "__main__":
+    print("Course Geometry Test")
+    print("=" * 60)
+
+    for test in (test_str_tree_matches_brute_force, test_locate_matches_linear_scan,
+                 test_contains_and_kind_filter, test_nearest_distances, test_closed_rings_and_empty_course,
+                 test_geometry_cache_is_bounded_lru, test_classify_lies_by_priority, test_lie_probabilities,
+                 test_rollout_on_classified_lies, test_locate_hole_distances,
+                 test_previous_hole_is_sticky_and_wraps):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
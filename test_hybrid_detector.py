@@ -0,0 +1,194 @@
+"""
+Hybrid detector on a synthetic burst (static tee marker, moving ball):
+- detect_batch runs each burst on a fresh tracking state
+- motion gating is opt-in and keeps the tracker off the static marker
+- batched YOLO results drive tracking exactly as per-frame detect_ball
+- matrix NMS against greedy NMS, and YOLOv8 output decoding
+
+Run directly (python test_hybrid_detector.py) or under pytest.
+"""
+import cv2
+import numpy as np
+import pytest
+from hybrid_detector import (
+    HybridBallDetector, non_max_suppression, decode_yolo_output, BALL_CLASS_ID, NMS_TOP_K
+)
+
+MARKER = (500, 280)
+
+
+def make_burst(num_frames=12, seed=1):
+    """Textured 640x360 frames with a red marker and a white ball moving up and right."""
+    rng = np.random.default_rng(seed)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, (360, 640), dtype=np.uint8), (0, 0), 3)
+    background = np.dstack([texture // 8 + 40, texture // 6 + 80, texture // 8 + 40]).astype(np.uint8)
+    cv2.circle(background, MARKER, 10, (30, 30, 220), -1)
+
+    frames, truth = [], []
+    for i in range(num_frames):
+        frame = background.copy()
+        center = (100 + 25 * i, 300 - 15 * i)
+        cv2.circle(frame, center, 6, (235, 235, 235), -1)
+        frames.append(np.clip(frame + rng.normal(0, 4, frame.shape), 0, 255).astype(np.uint8))
+        truth.append(center)
+    return frames, truth
+
+
+FRAMES, TRUTH = make_burst()
+
+
+def on_ball(detections, truth, tolerance=3):
+    """Per frame, whether the detection is within tolerance pixels of the ball."""
+    return [center is not None and np.hypot(center[0] - x, center[1] - y) <= tolerance
+            for (center, _), (x, y) in zip(detections, truth)]
+
+
+class ScriptedYoloDetector(HybridBallDetector):
+    """Detector whose YOLO pass returns a box around the known ball position."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.yolo_available = True
+        self.yolo_frames = 0
+
+    def _detect_with_yolo_batch(self, frames):
+        self.yolo_frames += len(frames)
+        found = []
+        for frame in frames:
+            x, y = TRUTH[next(i for i, f in enumerate(FRAMES) if f is frame)]
+            found.append([((x - 8, y - 8, 16, 16), 0.9)])
+        return found
+
+
+def test_burst_leaves_live_session_alone():
+    """detect_batch neither reads nor modifies the detector's own tracking state."""
+    detector = HybridBallDetector()
+    detector.detect_ball(FRAMES[0])
+    state = dict(vars(detector.tracking))
+
+    first = detector.detect_batch(FRAMES)
+    second = detector.detect_batch(FRAMES)
+
+    assert vars(detector.tracking) == state
+    assert first == second
+
+
+def test_motion_gating_is_opt_in_per_burst():
+    """Ungated bursts lock onto the static marker; a gated burst follows the ball."""
+    detector = HybridBallDetector()
+    assert detector.motion_gating is False and detector.tracking.motion_gate is None
+
+    ungated = detector.detect_batch(FRAMES)
+    gated = detector.detect_batch(FRAMES, motion_gating=True)
+
+    assert ungated == detector.detect_batch(FRAMES, motion_gating=False)
+    assert not all(on_ball(ungated, TRUTH))
+    assert all(on_ball(gated, TRUTH))
+    assert detector.tracking.motion_gate is None
+
+    # A gated detector can still run an ungated burst
+    assert HybridBallDetector(motion_gating=True).detect_batch(FRAMES, motion_gating=False) == ungated
+
+
+def test_batch_matches_sequential_tracking():
+    """One batched YOLO pass gives the per-frame detect_ball results."""
+    batched = ScriptedYoloDetector()
+    sequential = ScriptedYoloDetector()
+
+    burst = batched.detect_batch(FRAMES)
+    frame_by_frame = [sequential.detect_ball(frame) for frame in FRAMES]
+
+    assert burst == frame_by_frame
+    assert sum(on_ball(burst, TRUTH)) >= len(TRUTH) - 1  # Hough in the ROI may pick texture once
+    assert batched.yolo_frames == len(FRAMES)
+    assert sequential.yolo_frames < len(FRAMES)  # Only on acquisition and periodic checks
+
+
+def iou(a, b):
+    """Intersection over union of two [x1, y1, x2, y2] boxes."""
+    inter = max(0, min(a[2], b[2]) - max(a[0], b[0])) * max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    area = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area - inter)
+
+
+def greedy_nms(boxes, scores, iou_threshold):
+    """Reference: keep the best remaining box, drop what it overlaps, repeat."""
+    kept = []
+    for i in np.argsort(-scores, kind="stable"):
+        if all(iou(boxes[i], boxes[j]) <= iou_threshold for j in kept):
+            kept.append(i)
+    return kept
+
+
+def test_nms_against_greedy():
+    """Matrix NMS keeps a score-ordered, non-overlapping subset of greedy NMS."""
+    rng = np.random.default_rng(4)
+    for _ in range(20):
+        corners = rng.uniform(0, 100, (30, 2))
+        boxes = np.column_stack([corners, corners + rng.uniform(10, 30, (30, 2))])
+        scores = rng.uniform(0, 1, 30)
+
+        kept = non_max_suppression(boxes, scores, 0.45)
+        greedy = greedy_nms(boxes, scores, 0.45)
+
+        assert kept[0] == greedy[0] == np.argmax(scores)
+        assert set(kept.tolist()) <= set(greedy)
+        assert list(scores[kept]) == sorted(scores[kept], reverse=True)
+        assert all(iou(boxes[i], boxes[j]) <= 0.45 for n, i in enumerate(kept) for j in kept[:n])
+
+
+def test_nms_overlap_chain():
+    """A suppressed box still suppresses weaker ones, unlike greedy NMS."""
+    boxes = np.array([[0, 0, 10, 10], [4, 0, 14, 10], [8, 0, 18, 10], [50, 50, 60, 60]], dtype=np.float64)
+    scores = np.array([0.9, 0.8, 0.7, 0.6])
+
+    assert greedy_nms(boxes, scores, 0.3) == [0, 2, 3]
+    assert non_max_suppression(boxes, scores, 0.3).tolist() == [0, 3]
+    assert non_max_suppression(boxes[:1], scores[:1]).tolist() == [0]
+    assert non_max_suppression(np.zeros((0, 4)), np.zeros(0)).tolist() == []
+
+
+def yolo_output(boxes, ball_scores):
+    """(4 + 80, N) YOLOv8 predictions with the given sports-ball scores."""
+    predictions = np.zeros((4 + 80, len(boxes)), dtype=np.float32)
+    predictions[:4] = np.asarray(boxes, dtype=np.float32).T
+    predictions[4 + BALL_CLASS_ID] = ball_scores
+    return predictions
+
+
+def test_decode_yolo_output():
+    """Boxes come back in frame pixels, best first, overlaps removed."""
+    # 640x640 input letterboxed from a 1280x720 frame: scale 0.5, 140 px bars
+    letterbox = (0.5, 0, 140)
+    predictions = yolo_output([[100, 300, 20, 20], [102, 300, 20, 20], [400, 200, 10, 10]], [0.6, 0.8, 0.5])
+
+    best = decode_yolo_output(predictions, letterbox, 0.3)
+    assert len(best) == 1
+    assert best[0][0] == (184, 300, 40, 40) and best[0][1] == pytest.approx(0.8)
+
+    top = decode_yolo_output(predictions, letterbox, 0.3, max_candidates=3)
+    assert [bbox for bbox, _ in top] == [(184, 300, 40, 40), (790, 110, 20, 20)]
+    assert [score for _, score in top] == sorted((score for _, score in top), reverse=True)
+    assert len(decode_yolo_output(predictions, letterbox, 0.3, max_candidates=3, iou_threshold=0.95)) == 3
+
+    assert decode_yolo_output(predictions, letterbox, 0.9) == []
+    assert decode_yolo_output(predictions, letterbox, 0.9, max_candidates=3) == []
+    # Only the NMS_TOP_K best candidates reach NMS
+    spread = yolo_output([[20 * i + 10, 10, 8, 8] for i in range(150)], np.linspace(0.4, 0.9, 150))
+    many = decode_yolo_output(spread, (1.0, 0, 0), 0.3, max_candidates=200)
+    assert len(many) == NMS_TOP_K and many[-1][1] == pytest.approx(np.linspace(0.4, 0.9, 150)[-NMS_TOP_K])
+
+    assert decode_yolo_output(np.ones((4 + 10, 3), dtype=np.float32), letterbox, 0.3) == []  # No ball class
+
+
+if __name__ == "__main__":
+    print("Hybrid Detector Test")
+    print("=" * 60)
+
+    for test in (test_burst_leaves_live_session_alone, test_motion_gating_is_opt_in_per_burst,
+                 test_batch_matches_sequential_tracking, test_nms_against_greedy, test_nms_overlap_chain,
+                 test_decode_yolo_output):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
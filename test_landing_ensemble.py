@@ -0,0 +1,123 @@
+"""
+Monte Carlo landing ensemble:
+- seeded, evenly split across archetypes, exact without uncertainty
+- rollout and carry surface combinations
+- ellipse fit and density grid summaries
+
+Run directly (python test_landing_ensemble.py) or under pytest.
+"""
+import math
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from shot_archetypes import SHOT_TYPES
+from landing_ensemble import (
+    simulate_landing_ensemble, fit_landing_ellipse, landing_density_grid, DEFAULT_UNCERTAINTY
+)
+
+simulator = TrajectorySimulator()
+
+# No measurement uncertainty: every member is its archetype's nominal shot
+EXACT = {key: 0.0 for key in DEFAULT_UNCERTAINTY}
+
+
+def test_seeded_and_split_evenly():
+    """Same seed, same ensemble; samples split evenly across archetypes."""
+    first = simulate_landing_ensemble(SHOT_TYPES, 140, samples=900, seed=3)
+    second = simulate_landing_ensemble(SHOT_TYPES, 140, samples=900, seed=3)
+
+    assert list(first) == list(SHOT_TYPES)
+    for key in SHOT_TYPES:
+        assert first[key].shape == (900 // len(SHOT_TYPES), 2)
+        np.testing.assert_array_equal(first[key], second[key])
+
+
+def test_exact_without_uncertainty():
+    """Zero uncertainty collapses each archetype onto its batch landing."""
+    ensemble = simulate_landing_ensemble(SHOT_TYPES, 140, uncertainty=EXACT,
+                                         samples=2 * len(SHOT_TYPES), seed=0)
+    keys = list(SHOT_TYPES)
+    batch = simulator.simulate_batch(
+        140,
+        [SHOT_TYPES[k]["launch_angle"] for k in keys],
+        [SHOT_TYPES[k]["backspin_rpm"] for k in keys],
+        [SHOT_TYPES[k]["side_spin_axis"] for k in keys],
+        record_points=False,
+        time_step=0.02
+    )
+
+    for i, key in enumerate(keys):
+        np.testing.assert_allclose(ensemble[key], np.tile(batch["landing"][i, :2], (2, 1)), atol=1e-9)
+
+
+def test_rollout_moves_forward():
+    """Rest positions lie beyond the landings on fairway."""
+    landings = simulate_landing_ensemble(SHOT_TYPES, 140, samples=450, seed=1)
+    rests = simulate_landing_ensemble(SHOT_TYPES, 140, samples=450, seed=1, include_rollout=True)
+
+    for key in SHOT_TYPES:
+        assert (rests[key][:, 0] >= landings[key][:, 0] - 1e-9).all()
+        assert rests[key][:, 0].mean() > landings[key][:, 0].mean() + 1.0
+
+
+def test_surface_combinations_rejected():
+    """The carry surface has no landing velocity and is flat-ground only."""
+    surface = object()
+    with pytest.raises(ValueError):
+        simulate_landing_ensemble(SHOT_TYPES, 140, samples=90, surface=surface, include_rollout=True)
+    with pytest.raises(ValueError):
+        simulate_landing_ensemble(SHOT_TYPES, 140, samples=90, surface=surface,
+                                  ground_height=lambda x, y: np.zeros_like(x))
+
+
+def test_ellipse_of_known_gaussian():
+    """Semi-axes scale with the chi-square quantile, orientation follows the major axis."""
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, [4.0, 1.0], size=(200000, 2))
+    angle = math.radians(30)
+    rotation = np.array([[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
+    samples = samples @ rotation.T + [100.0, -5.0]
+
+    ellipse = fit_landing_ellipse(samples, confidence=0.9)
+    scale = math.sqrt(-2 * math.log(0.1))
+
+    assert ellipse["center_x"] == pytest.approx(100.0, abs=0.05)
+    assert ellipse["center_y"] == pytest.approx(-5.0, abs=0.05)
+    assert ellipse["semi_major_m"] == pytest.approx(4.0 * scale, rel=0.01)
+    assert ellipse["semi_minor_m"] == pytest.approx(1.0 * scale, rel=0.01)
+    assert ellipse["orientation_deg"] == pytest.approx(30.0, abs=0.5)
+
+
+def test_ellipse_of_too_few_samples():
+    """Fewer than three samples give a zero-size ellipse at their mean."""
+    ellipse = fit_landing_ellipse(np.array([[10.0, 2.0], [12.0, 4.0]]))
+
+    assert (ellipse["center_x"], ellipse["center_y"]) == (11.0, 3.0)
+    assert ellipse["semi_major_m"] == ellipse["semi_minor_m"] == 0.0
+
+
+def test_density_grid_sums_to_one():
+    """Every sample lands in exactly one cell."""
+    rng = np.random.default_rng(1)
+    samples = rng.normal([150.0, 0.0], [8.0, 3.0], size=(5000, 2))
+    grid = landing_density_grid(samples, cell_size_m=5.0)
+
+    assert grid["probabilities"].sum() == pytest.approx(1.0)
+    origin = np.array(grid["origin"])
+    assert (origin <= samples.min(axis=0)).all()
+    upper = origin + np.array(grid["probabilities"].shape) * grid["cell_size_m"]
+    assert (upper > samples.max(axis=0)).all()
+
+
+if __name__ == "__main__":
+    print("Landing Ensemble Test")
+    print("=" * 60)
+
+    for test in (test_seeded_and_split_evenly, test_exact_without_uncertainty,
+                 test_rollout_moves_forward, test_surface_combinations_rejected,
+                 test_ellipse_of_known_gaussian, test_ellipse_of_too_few_samples,
+                 test_density_grid_sums_to_one):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,96 @@
+"""
+Inverse launch fit against a synthetic pixel track:
+- positions_at_times reproduces simulate_flight and interpolates between steps
+- fit_launch_parameters recovers speed and angle from noisy observations
+- fit_launch_vector uses the fit with a calibration, the point estimate without
+
+Run directly (python test_launch_fit.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from homography_calibration import HomographyCalibrator
+from launch_vector import LaunchVectorCalculator
+
+simulator = TrajectorySimulator()
+
+PIXELS_PER_METER = 50.0
+TIMES = np.arange(8) / 30  # 8 frames at 30 fps
+
+
+def project(positions):
+    """Side-on camera: image x along the shot, image y down."""
+    return np.stack([100 + positions[..., 0] * PIXELS_PER_METER,
+                     400 - positions[..., 2] * PIXELS_PER_METER], axis=-1)
+
+
+def test_positions_at_step_times():
+    """On integration steps the batch positions are simulate_flight's points."""
+    times = np.arange(8) * simulator.time_step
+    positions = simulator.positions_at_times(times, 145, 12, 2500, 5)[0]
+    points = np.array(simulator.simulate_flight(145, 12, 2500, 5)["points"])[:8]
+
+    np.testing.assert_allclose(positions, points, atol=1e-12)
+
+
+def test_positions_between_steps():
+    """The Hermite interpolant matches a much finer integration."""
+    times = np.array([0.013, 0.0371, 0.1])
+    coarse = simulator.positions_at_times(times, [145, 120], 12, 2500, [5, -5])
+    fine = simulator.positions_at_times(times, [145, 120], 12, 2500, [5, -5], time_step=0.0005)
+
+    assert coarse.shape == (2, 3, 3)
+    np.testing.assert_allclose(coarse, fine, atol=1e-8)
+    with pytest.raises(ValueError):
+        simulator.positions_at_times([-0.1], 145, 12, 2500, 0)
+
+
+def test_fit_recovers_launch():
+    """Speed and angle are recovered from a track with 1 px noise."""
+    flight = simulator.positions_at_times(TIMES, 150, 14, 2500, 0)[0]
+    observed = project(flight) + np.random.default_rng(0).normal(0, 1.0, (len(TIMES), 2))
+
+    fit = simulator.fit_launch_parameters(TIMES, observed, project, initial_speed_mph=120,
+                                          initial_angle_deg=10, measurement_std=1.0)
+
+    assert fit["converged"]
+    assert fit["speed_mph"] == pytest.approx(150, abs=1.5)
+    assert fit["launch_angle"] == pytest.approx(14, abs=0.5)
+    assert fit["rms_error"] < 1.5
+    assert 0 < fit["std"]["speed_mph"] < 1.5
+
+
+def test_fit_needs_three_observations():
+    """Too few or mismatched observations are rejected."""
+    with pytest.raises(ValueError):
+        simulator.fit_launch_parameters(TIMES[:2], np.zeros((2, 2)), project, 120, 10)
+    with pytest.raises(ValueError):
+        simulator.fit_launch_parameters(TIMES, np.zeros((len(TIMES) - 1, 2)), project, 120, 10)
+
+
+def test_launch_vector_uses_fit_when_calibrated():
+    """A calibrated calculator fits the track; without calibration it estimates."""
+    flight = simulator.positions_at_times(TIMES, 150, 14, 2500, 0)[0]
+    track = [{'x': x, 'y': y, 'timestamp': t} for (x, y), t in zip(project(flight), TIMES)]
+
+    calibrator = HomographyCalibrator()
+    calibrator.pixels_per_meter = PIXELS_PER_METER
+    fitted = LaunchVectorCalculator(calibrator).fit_launch_vector(track)
+    assert fitted["method"] == "inverse_fit"
+    assert fitted["speed_mph"] == pytest.approx(150, abs=1.0)
+    assert fitted["launch_angle"] == pytest.approx(14, abs=0.5)
+
+    estimate = LaunchVectorCalculator().fit_launch_vector(track)
+    assert estimate["method"] != "inverse_fit"
+
+
+if __name__ == "__main__":
+    print("Launch Fit Test")
+    print("=" * 60)
+
+    for test in (test_positions_at_step_times, test_positions_between_steps, test_fit_recovers_launch,
+                 test_fit_needs_three_observations, test_launch_vector_uses_fit_when_calibrated):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,141 @@
+"""
+Motion gate on synthetic frames:
+- None while warming up, on whole-frame changes and on scene-wide motion
+- [] when nothing moves, ball-sized crops around a moving ball
+- reset() and resolution changes start a new background
+- BallDetector with gating ignores a static circle
+
+Run directly (python test_motion_gate.py) or under pytest.
+"""
+import cv2
+import numpy as np
+import pytest
+from motion_gate import MotionGate
+from ball_detector import BallDetector
+
+MARKER = (500, 280)
+
+
+def make_background(seed=1, shape=(360, 640)):
+    """Textured grass-colored frame with a static red tee marker."""
+    rng = np.random.default_rng(seed)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, shape, dtype=np.uint8), (0, 0), 3)
+    background = np.dstack([texture // 8 + 40, texture // 6 + 80, texture // 8 + 40]).astype(np.uint8)
+    cv2.circle(background, MARKER, 10, (30, 30, 220), -1)
+    return background
+
+
+BACKGROUND = make_background()
+
+
+def with_ball(center, frame=BACKGROUND):
+    """Copy of frame with a white ball drawn at center."""
+    frame = frame.copy()
+    cv2.circle(frame, center, 6, (235, 235, 235), -1)
+    return frame
+
+
+def contains(region, point):
+    """Whether an (x, y, w, h) crop contains a pixel."""
+    x, y, w, h = region
+    return x <= point[0] < x + w and y <= point[1] < y + h
+
+
+def test_warmup_then_static_scene():
+    """The first frames build the background; a static scene gives no crops."""
+    gate = MotionGate(warmup_frames=2)
+
+    assert gate.update(BACKGROUND) is None
+    assert gate.update(BACKGROUND) is None
+    assert gate.update(BACKGROUND) == []
+    assert gate.motion_fraction == 0.0
+
+
+def test_moving_ball_becomes_crop():
+    """A moving ball yields a clamped crop around it; the marker never does."""
+    gate = MotionGate()
+    gate.update(BACKGROUND)
+
+    for i in range(1, 8):
+        center = (40 + 80 * i, 300 - 40 * i)
+        regions = gate.update(with_ball(center))
+        assert regions and contains(regions[0], center)
+        assert not any(contains(region, MARKER) for region in regions)
+        for x, y, w, h in regions:
+            assert x >= 0 and y >= 0 and x + w <= 640 and y + h <= 360
+            assert w <= gate.max_blob_size + 2 * gate.margin
+
+    corner = gate.update(with_ball((2, 2)))
+    assert any(region[:2] == (0, 0) for region in corner)
+
+
+def test_falls_back_to_full_frame():
+    """Whole-frame changes and scene-wide motion return None, not crops."""
+    gate = MotionGate()
+    gate.update(BACKGROUND)
+    assert gate.update(cv2.add(BACKGROUND, (40, 40, 40, 0))) is None  # Exposure jump
+    assert gate.motion_fraction > gate.max_motion_fraction
+
+    gate = MotionGate(max_regions=3)
+    gate.update(BACKGROUND)
+    frame = BACKGROUND
+    for i in range(5):
+        frame = with_ball((60 + 100 * i, 60), frame)
+    assert gate.update(frame) is None
+
+    gate = MotionGate(max_blob_size=8)
+    gate.update(BACKGROUND)
+    assert gate.update(with_ball((100, 100))) == []  # Blob wider than max_blob_size
+
+
+def test_reset_and_resolution_change():
+    """reset() and a new frame size both restart the warm-up."""
+    gate = MotionGate()
+    gate.update(BACKGROUND)
+    assert gate.update(BACKGROUND) == []
+
+    gate.reset()
+    assert gate.update(with_ball((100, 100))) is None
+    assert gate.update(with_ball((100, 100))) == []
+
+    small = cv2.resize(BACKGROUND, (320, 180))
+    assert gate.update(small) is None
+    assert gate.update(small) == []
+
+    with pytest.raises(ValueError):
+        MotionGate(downscale=0)
+    with pytest.raises(ValueError):
+        MotionGate(learning_rate=0)
+
+
+def test_detector_ignores_static_circle():
+    """With gating, BallDetector reports the moving ball and never the marker."""
+    gated = BallDetector(motion_gating=True)
+    ungated = BallDetector()
+
+    marker_hits = {True: 0, False: 0}
+    gated.detect_ball(BACKGROUND, return_all=True)
+    for i in range(1, 8):
+        center = (40 + 80 * i, 300 - 40 * i)
+        frame = with_ball(center)
+        for gating, detector in ((True, gated), (False, ungated)):
+            detections = detector.detect_ball(frame, return_all=True)
+            marker_hits[gating] += any(np.hypot(c[0] - MARKER[0], c[1] - MARKER[1]) <= 8
+                                       for c, _, _ in detections)
+            if gating:
+                assert detections and np.hypot(detections[0][0][0] - center[0],
+                                               detections[0][0][1] - center[1]) <= 3
+
+    assert marker_hits[True] == 0 < marker_hits[False]
+
+
+if __name__ == "__main__":
+    print("Motion Gate Test")
+    print("=" * 60)
+
+    for test in (test_warmup_then_static_scene, test_moving_ball_becomes_crop, test_falls_back_to_full_frame,
+                 test_reset_and_resolution_change, test_detector_ignores_static_circle):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
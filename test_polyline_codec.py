@@ -0,0 +1,75 @@
+"""
+Round-trip tests for the encoded polyline wire format
+
+Run directly (python test_polyline_codec.py) or under pytest.
+"""
+import numpy as np
+from polyline_codec import (
+    encode_values, decode_values, encode_polyline, decode_polyline,
+    encode_gps_points, DEFAULT_PRECISION, DEFAULT_ELEVATION_PRECISION
+)
+
+
+def test_google_reference():
+    """Matches the example in Google's polyline documentation."""
+    points = [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]]
+    encoded = encode_polyline(points, precision=5)
+
+    assert encoded == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    np.testing.assert_allclose(decode_polyline(encoded, precision=5), points, atol=1e-9)
+
+
+def test_values_round_trip():
+    """Signed integers survive encoding, including chunk boundaries."""
+    values = np.array([0, 1, -1, 15, -16, 16, 31, -32, 511, -512, 2 ** 20, -(2 ** 20),
+                       2 ** 30, -(2 ** 31)], dtype=np.int64)
+
+    np.testing.assert_array_equal(decode_values(encode_values(values)), values)
+    assert encode_values([]) == ""
+    assert decode_values("").size == 0
+
+
+def test_random_values_round_trip():
+    """Random deltas of every magnitude decode to themselves."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(-(2 ** 31), 2 ** 31, size=5000) >> rng.integers(0, 31, size=5000)
+
+    np.testing.assert_array_equal(decode_values(encode_values(values)), values)
+
+
+def test_gps_round_trip():
+    """A GPS trajectory decodes to within half a unit of the encoding precision."""
+    rng = np.random.default_rng(1)
+    lat = 34.05 + np.cumsum(rng.normal(0, 1e-5, 200))
+    lon = -118.24 + np.cumsum(rng.normal(0, 1e-5, 200))
+    elevation = 30 + np.cumsum(rng.normal(0, 0.5, 200))
+    points = np.column_stack([lat, lon, elevation])
+
+    encoded = encode_gps_points(points)
+    path = decode_polyline(encoded["path"])
+    heights = decode_polyline(encoded["elevation"], dims=1, precision=DEFAULT_ELEVATION_PRECISION)
+
+    assert path.shape == (200, 2)
+    assert np.abs(path - points[:, :2]).max() <= 0.5 * 10 ** -DEFAULT_PRECISION + 1e-12
+    assert np.abs(heights[:, 0] - elevation).max() <= 0.5 * 10 ** -DEFAULT_ELEVATION_PRECISION + 1e-9
+
+
+def test_lat_lon_only():
+    """2D input has no elevation polyline."""
+    encoded = encode_gps_points([[34.05, -118.24], [34.051, -118.239]])
+
+    assert set(encoded) == {"path"}
+    np.testing.assert_allclose(decode_polyline(encoded["path"]),
+                               [[34.05, -118.24], [34.051, -118.239]], atol=1e-9)
+
+
+if __name__ == "__main__":
+    print("Polyline Codec Test")
+    print("=" * 60)
+
+    for test in (test_google_reference, test_values_round_trip, test_random_values_round_trip,
+                 test_gps_round_trip, test_lat_lon_only):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,132 @@
+"""
+Terrain-aware landing on synthetic DEMs:
+- bilinear elevation lookups and relative heights
+- find_landing on flat ground, slopes, a bank at the tee and above the terrain
+- the batch engine's ground_height contact agrees with find_landing
+- memory-mapped save/load and the terrain service
+
+Run directly (python test_terrain_model.py) or under pytest.
+"""
+import math
+import tempfile
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from terrain_model import ElevationModel, TerrainService, save_elevation_model, load_elevation_model
+from gps_converter import EARTH_RADIUS
+
+simulator = TrajectorySimulator()
+
+START_LAT, START_LON = 34.05, -118.24
+CELL_LAT = math.degrees(1 / EARTH_RADIUS)  # ~1m cells
+CELL_LON = math.degrees(1 / (EARTH_RADIUS * math.cos(math.radians(START_LAT))))
+SIZE = 1000  # 1km x 1km, tee in the middle
+
+
+def make_model(rise_per_meter_north=0.0, base=100.0):
+    """Planar DEM rising to the north (row 0), tee at the center."""
+    rows = np.arange(SIZE, dtype=np.float64)[:, None]
+    heights = base + (SIZE / 2 - rows) * rise_per_meter_north + np.zeros((1, SIZE))
+    return ElevationModel(heights.astype(np.float32), START_LAT + SIZE / 2 * CELL_LAT,
+                          START_LON - SIZE / 2 * CELL_LON, CELL_LAT, CELL_LON)
+
+
+def flight(floor_m=-30.0, shot=(140, 12, 2500, 0)):
+    """Points integrated below the tee so they cross any nearby terrain."""
+    return simulator.simulate_flight(*shot, ground_level_m=floor_m)["points"]
+
+
+def test_elevation_is_bilinear():
+    """A planar grid is reproduced exactly between cells, clamped outside."""
+    model = make_model(0.04)
+
+    assert model.elevation_at(START_LAT, START_LON) == pytest.approx(100.0, abs=1e-3)
+    assert model.elevation_at(START_LAT + 100.5 * CELL_LAT, START_LON) == pytest.approx(104.02, abs=1e-3)
+    assert model.elevation_at(model.north + 1.0, START_LON) == pytest.approx(model.elevation_at(
+        model.north, START_LON))
+    heights = model.relative_height([0, 100, 100], [0, 0, 50], START_LAT, START_LON, 0)
+    np.testing.assert_allclose(heights, [0.0, 4.0, 4.0], atol=1e-3)
+
+
+def test_flat_landing_matches_flight():
+    """On flat terrain the landing is the flat-ground landing."""
+    landing = make_model().find_landing(flight(), START_LAT, START_LON, 0)
+    flat = simulator.simulate_flight(140, 12, 2500, 0)
+
+    assert landing is not None
+    assert landing["carry_distance_yards"] == pytest.approx(flat["carry_distance_yards"], abs=0.05)
+    assert landing["elevation_change_m"] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_slopes_shorten_and_lengthen_carry():
+    """Uphill lands short and above the tee, downhill long and below it."""
+    model = make_model(0.04)
+    flat = simulator.simulate_flight(140, 12, 2500, 0)["carry_distance_yards"]
+
+    uphill = model.find_landing(flight(), START_LAT, START_LON, 0)
+    downhill = model.find_landing(flight(), START_LAT, START_LON, 180)
+
+    assert uphill["carry_distance_yards"] < flat < downhill["carry_distance_yards"]
+    assert uphill["elevation_change_m"] > 0 > downhill["elevation_change_m"]
+    assert uphill["landing_gps"]["lat"] > START_LAT > downhill["landing_gps"]["lat"]
+
+
+def test_bank_at_the_tee_lands_immediately():
+    """Ground rising faster than the ball is an immediate landing, not a miss."""
+    landing = make_model(1.0).find_landing(flight(), START_LAT, START_LON, 0)
+
+    assert landing is not None
+    assert landing["landing_index"] == 1
+    assert landing["carry_distance_yards"] < 2.0
+
+
+def test_no_landing_before_trajectory_ends():
+    """A flight that ends above the terrain returns None."""
+    points = simulator.simulate_flight(140, 12, 2500, 0)["points"]
+
+    assert make_model(-0.1).find_landing(points, START_LAT, START_LON, 0) is None
+
+
+def test_batch_ground_height_matches_find_landing():
+    """simulate_batch lands on the terrain where find_landing does."""
+    model = make_model(0.04)
+    for bearing in (0, 180):
+        def ground_height(x, y, ids):
+            return model.relative_height(x, y, START_LAT, START_LON, bearing)
+
+        batch = simulator.simulate_batch(140, 12, 2500, 0, record_points=False,
+                                         ground_height=ground_height)
+        landing = model.find_landing(flight(), START_LAT, START_LON, bearing)
+
+        np.testing.assert_allclose(batch["landing"][0, :2], landing["landing"][:2], atol=0.01)
+        assert batch["carry_distance_yards"][0] == pytest.approx(landing["carry_distance_yards"], abs=0.01)
+
+
+def test_save_load_and_service():
+    """A saved DEM maps back identically and the service finds it by location."""
+    model = make_model(0.04)
+    with tempfile.TemporaryDirectory() as directory:
+        path = save_elevation_model(model.heights, model.north, model.west,
+                                    CELL_LAT, CELL_LON, "hill", directory)
+        loaded = load_elevation_model(path)
+        assert isinstance(loaded.heights, np.memmap)
+        assert loaded.elevation_at(START_LAT, START_LON) == model.elevation_at(START_LAT, START_LON)
+
+        service = TerrainService(directory)
+        assert service.get_model(START_LAT, START_LON).name == "hill"
+        assert service.get_model(START_LAT + 1.0, START_LON) is None
+        del loaded, service  # Release the memory maps before the directory goes
+
+
+if __name__ == "__main__":
+    print("Terrain Model Test")
+    print("=" * 60)
+
+    for test in (test_elevation_is_bilinear, test_flat_landing_matches_flight,
+                 test_slopes_shorten_and_lengthen_carry, test_bank_at_the_tee_lands_immediately,
+                 test_no_landing_before_trajectory_ends, test_batch_ground_height_matches_find_landing,
+                 test_save_load_and_service):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,119 @@
+"""
+Array-backed trajectory container:
+- construction from points, pixels and raw arrays; column and block views
+- growth and the rolling max_length trail
+- GPS fill against the spherical reference
+- JSON and binary round trips
+
+Run directly (python test_trajectory_array.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from trajectory_array import TrajectoryArray, POSITION_FIELDS, PIXEL_FIELDS
+from gps_converter import local_to_gps_arrays
+
+simulator = TrajectorySimulator()
+POINTS = simulator.simulate_flight(140, 12, 2500, 5)["points"]
+
+
+def test_from_points_views():
+    """Columns and the xyz block are views of one buffer."""
+    times = np.arange(len(POINTS)) * simulator.time_step
+    trajectory = TrajectoryArray.from_points(POINTS, times)
+
+    assert len(trajectory) == len(POINTS)
+    np.testing.assert_array_equal(trajectory.xyz, POINTS)
+    np.testing.assert_array_equal(trajectory.t, times)
+    assert np.isnan(trajectory.lat).all()
+    assert np.shares_memory(trajectory.xyz, trajectory.data)
+
+    trajectory.z[:] = 0.0
+    assert (trajectory.data[:, 3] == 0.0).all()
+    assert trajectory.to_list() == [[x, y, 0.0] for x, y, _ in POINTS]
+
+
+def test_indexing_and_unknown_fields():
+    """Strings give columns, ints give row dicts, slices give trajectories."""
+    trajectory = TrajectoryArray.from_points(POINTS, fields=POSITION_FIELDS)
+
+    row = trajectory[1]
+    assert np.isnan(row["t"]) and [row[name] for name in "xyz"] == list(POINTS[1])
+    assert len(trajectory[2:5]) == 3
+    np.testing.assert_array_equal(trajectory["x"], trajectory.x)
+    with pytest.raises(KeyError):
+        trajectory.lat
+    with pytest.raises(ValueError):
+        TrajectoryArray(("t", "speed"))
+    with pytest.raises(ValueError):
+        TrajectoryArray.from_array(np.zeros((3, 2)), POSITION_FIELDS)
+
+
+def test_append_grows_and_rolls():
+    """Appends grow the buffer; max_length keeps only the newest rows."""
+    grown = TrajectoryArray(PIXEL_FIELDS, capacity=2)
+    for i in range(10):
+        grown.append(t=i / 30, frame=i, px=i, py=2 * i)
+    assert len(grown) == 10
+    np.testing.assert_array_equal(grown.frame, np.arange(10))
+    assert np.isnan(grown.radius).all()
+
+    trail = TrajectoryArray(PIXEL_FIELDS, capacity=8, max_length=4)
+    for i in range(25):
+        trail.append(frame=i, px=i, py=i)
+    assert len(trail) == 4
+    np.testing.assert_array_equal(trail.frame, [21, 22, 23, 24])
+
+    trail.clear()
+    assert len(trail) == 0
+
+
+def test_set_gps_matches_spherical():
+    """The projected GPS fill agrees with the spherical formulas."""
+    trajectory = TrajectoryArray.from_points(POINTS)
+    projected = trajectory.copy().set_gps(34.05, -118.24, 30).latlon
+    precise = trajectory.set_gps(34.05, -118.24, 30, precise=True).latlon
+    lat, lon = local_to_gps_arrays(trajectory.x, trajectory.y, 34.05, -118.24, 30)
+
+    np.testing.assert_array_equal(precise, np.column_stack([lat, lon]))
+    np.testing.assert_allclose(projected, precise, atol=1e-7)
+
+
+def test_json_round_trip():
+    """to_json / from_json keep fields; NaN becomes None and back."""
+    pixels = TrajectoryArray.from_pixels([[10, 20], [11, 22]], times=[0.0, 1 / 30])
+    payload = pixels.to_json()
+
+    assert payload["fields"] == list(PIXEL_FIELDS)
+    assert payload["data"][0][1] is None
+    restored = TrajectoryArray.from_json(payload)
+    np.testing.assert_array_equal(restored.pixels, pixels.pixels)
+    assert np.isnan(restored.frame).all()
+    assert pixels.to_dicts(("px", "py")) == [{"px": 10.0, "py": 20.0}, {"px": 11.0, "py": 22.0}]
+
+
+def test_binary_round_trip():
+    """to_bytes is exact in float64 and close in float32."""
+    trajectory = TrajectoryArray.from_points(POINTS).set_gps(34.05, -118.24, 30)
+
+    exact = TrajectoryArray.from_bytes(trajectory.to_bytes())
+    assert exact.fields == trajectory.fields
+    np.testing.assert_array_equal(exact.data, trajectory.data)
+
+    half = trajectory.to_bytes("<f4")
+    assert len(half) < len(trajectory.to_bytes())
+    np.testing.assert_allclose(TrajectoryArray.from_bytes(half).xyz, trajectory.xyz, atol=1e-4)
+    with pytest.raises(ValueError):
+        TrajectoryArray.from_bytes(b"XXXX" + trajectory.to_bytes()[4:])
+
+
+if __name__ == "__main__":
+    print("Trajectory Array Test")
+    print("=" * 60)
+
+    for test in (test_from_points_views, test_indexing_and_unknown_fields, test_append_grows_and_rolls,
+                 test_set_gps_matches_spherical, test_json_round_trip, test_binary_round_trip):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,135 @@
+"""
+Quantized trajectory cache:
+- nearby inputs hit the same entry, simulated at the quantized values
+- LRU eviction by entry count and by memory, TTL expiry
+- shared results are read-only
+
+Run directly (python test_trajectory_cache.py) or under pytest.
+"""
+import time
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from trajectory_cache import TrajectoryCache, ENTRY_OVERHEAD_BYTES
+from shot_archetypes import SHOT_TYPES
+
+simulator = TrajectorySimulator()
+
+
+def test_hit_returns_shared_result():
+    """Inputs in the same bins hit one entry simulated at the bin values."""
+    cache = TrajectoryCache(simulator)
+    first = cache.simulate_flight(145.1, 12.1, 2510, 0)
+    second = cache.simulate_flight(144.9, 11.9, 2490, 0.1)
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    exact = simulator.simulate_flight(145.0, 12.0, 2500, 0.0)
+    np.testing.assert_array_equal(first["points"], np.array(exact["points"]))
+    assert first["carry_distance_yards"] == exact["carry_distance_yards"]
+
+
+def test_keys_separate_entry_points_and_integrators():
+    """simulate_flight, simulate_archetypes and each integrator have their own entries."""
+    cache = TrajectoryCache(simulator)
+    straight = SHOT_TYPES["straight"]
+    shot = (140, straight["launch_angle"], straight["backspin_rpm"], straight["side_spin_axis"])
+
+    rk4 = cache.simulate_flight(*shot)
+    dopri5 = cache.simulate_flight(*shot, integrator="dopri5")
+    archetype = cache.simulate_archetypes({"straight": straight}, 140)["straight"]
+
+    assert cache.misses == 3 and cache.hits == 0
+    assert "force_evaluations" in rk4 and "force_evaluations" not in archetype
+    assert dopri5 is not rk4
+
+
+def test_archetypes_served_from_cache():
+    """A repeated archetype request is all hits and returns the same objects."""
+    cache = TrajectoryCache(simulator)
+    first = cache.simulate_archetypes(SHOT_TYPES, 140.1, wind_speed_mph=8.1, wind_direction_deg=30)
+    second = cache.simulate_archetypes(SHOT_TYPES, 139.9, wind_speed_mph=7.9, wind_direction_deg=31)
+
+    assert list(second) == list(SHOT_TYPES)
+    assert all(second[key] is first[key] for key in SHOT_TYPES)
+    assert cache.hits == len(SHOT_TYPES)
+
+
+def test_lru_eviction():
+    """The least recently used entry goes first when the count bound is hit."""
+    cache = TrajectoryCache(simulator, max_entries=2)
+    a = cache.simulate_flight(130, 12, 2500, 0)
+    cache.simulate_flight(140, 12, 2500, 0)
+    assert cache.simulate_flight(130, 12, 2500, 0) is a  # refreshes a
+    cache.simulate_flight(150, 12, 2500, 0)  # evicts 140
+
+    assert cache.evictions == 1
+    assert cache.get_stats()["entries"] == 2
+    assert cache.simulate_flight(130, 12, 2500, 0) is a
+    misses = cache.misses
+    cache.simulate_flight(140, 12, 2500, 0)
+    assert cache.misses == misses + 1
+
+
+def test_memory_bound():
+    """Entries are evicted to stay under max_bytes."""
+    one = TrajectoryCache(simulator).simulate_flight(140, 12, 2500, 0)
+    size = one["points"].nbytes + ENTRY_OVERHEAD_BYTES
+    cache = TrajectoryCache(simulator, max_bytes=int(size * 2.5))
+
+    for speed in (130, 135, 140, 145):
+        cache.simulate_flight(speed, 12, 2500, 0)
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["evictions"] == 4 - stats["entries"] > 0
+
+
+def test_ttl_expiry():
+    """Entries older than ttl_seconds are re-simulated."""
+    cache = TrajectoryCache(simulator, ttl_seconds=0.05)
+    first = cache.simulate_flight(140, 12, 2500, 0)
+    assert cache.simulate_flight(140, 12, 2500, 0) is first
+
+    time.sleep(0.1)
+    again = cache.simulate_flight(140, 12, 2500, 0)
+
+    assert again is not first
+    assert cache.expirations == 1
+    np.testing.assert_array_equal(again["points"], first["points"])
+
+
+def test_results_are_read_only():
+    """Shared results can't be modified by a caller."""
+    result = TrajectoryCache(simulator).simulate_flight(140, 12, 2500, 0)
+
+    with pytest.raises(ValueError):
+        result["points"][0, 0] = 1.0
+    with pytest.raises(TypeError):
+        result["carry_distance_yards"] = 0.0
+    assert isinstance(result["landing_velocity"], tuple)
+
+
+def test_clear_resets():
+    """clear() drops entries and statistics."""
+    cache = TrajectoryCache(simulator)
+    cache.simulate_flight(140, 12, 2500, 0)
+    cache.simulate_flight(140, 12, 2500, 0)
+    cache.clear()
+
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (0, 0, 0, 0)
+
+
+if __name__ == "__main__":
+    print("Trajectory Cache Test")
+    print("=" * 60)
+
+    for test in (test_hit_returns_shared_result, test_keys_separate_entry_points_and_integrators,
+                 test_archetypes_served_from_cache, test_lru_eviction, test_memory_bound,
+                 test_ttl_expiry, test_results_are_read_only, test_clear_resets):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
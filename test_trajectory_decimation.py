@@ -0,0 +1,95 @@
+"""
+Trajectory decimation (level of detail before GPS conversion):
+- tee, apex and landing always survive
+- every dropped point is within tolerance of the simplified polyline
+- point budgets, pass-through and argument validation
+
+Run directly (python test_trajectory_decimation.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator
+from trajectory_decimation import simplify_trajectory
+
+simulator = TrajectorySimulator()
+POINTS = np.array(simulator.simulate_flight(150, 12, 2800, -15, wind_speed_mph=10,
+                                            wind_direction_deg=45)["points"])
+
+
+def _kept_indices(points, simplified):
+    """Indices of the simplified points in the original (they are a subset, in order)."""
+    indices = [int(np.flatnonzero((points == p).all(axis=1))[0]) for p in np.asarray(simplified)]
+    assert indices == sorted(indices)
+    return indices
+
+
+def _max_deviation(points, kept):
+    """Largest distance of a dropped point from its simplified segment."""
+    worst = 0.0
+    for start, end in zip(kept, kept[1:]):
+        a, chord = points[start], points[end] - points[start]
+        for p in points[start + 1:end]:
+            t = np.clip((p - a) @ chord / (chord @ chord), 0.0, 1.0)
+            worst = max(worst, float(np.linalg.norm(p - a - t * chord)))
+    return worst
+
+
+def test_keeps_tee_apex_and_landing():
+    """The three key points survive any tolerance or budget."""
+    apex = int(np.argmax(POINTS[:, 2]))
+    for kwargs in ({"tolerance_m": 0.05}, {"tolerance_m": 1.0}, {"tolerance_m": 50.0},
+                   {"tolerance_m": 0, "max_points": 3}, {"tolerance_m": 0, "max_points": 12}):
+        kept = _kept_indices(POINTS, simplify_trajectory(POINTS, **kwargs))
+        assert {0, apex, len(POINTS) - 1} <= set(kept), kwargs
+
+
+def test_within_tolerance():
+    """Dropped points stay within the tolerance of the simplified polyline."""
+    for tolerance in (0.05, 0.25, 1.0):
+        simplified = simplify_trajectory(POINTS, tolerance_m=tolerance)
+        assert len(simplified) < len(POINTS)
+        assert _max_deviation(POINTS, _kept_indices(POINTS, simplified)) <= tolerance
+
+
+def test_point_budget():
+    """A budget caps the output and spends points on the largest deviations."""
+    coarse = simplify_trajectory(POINTS, tolerance_m=0, max_points=6)
+    fine = simplify_trajectory(POINTS, tolerance_m=0, max_points=20)
+
+    assert len(coarse) == 6 and len(fine) == 20
+    assert (_max_deviation(POINTS, _kept_indices(POINTS, fine)) <
+            _max_deviation(POINTS, _kept_indices(POINTS, coarse)))
+
+
+def test_straight_segments_collapse():
+    """A linear climb and descent reduces to tee, apex and landing."""
+    x = np.linspace(0, 100, 101)
+    points = np.column_stack([x, np.zeros_like(x), 50 - np.abs(x - 50)])
+
+    assert simplify_trajectory(points) == [[0.0, 0.0, 0.0], [50.0, 0.0, 50.0], [100.0, 0.0, 0.0]]
+
+
+def test_pass_through():
+    """No tolerance and no budget, or too few points, return the input."""
+    assert simplify_trajectory(POINTS, tolerance_m=0) == POINTS.tolist()
+    assert simplify_trajectory([[0, 0, 0], [1, 0, 1]]) == [[0.0, 0.0, 0.0], [1.0, 0.0, 1.0]]
+
+
+def test_invalid_arguments():
+    """Negative tolerances and budgets below three points are rejected."""
+    with pytest.raises(ValueError):
+        simplify_trajectory(POINTS, tolerance_m=-1)
+    with pytest.raises(ValueError):
+        simplify_trajectory(POINTS, max_points=2)
+
+
+if __name__ == "__main__":
+    print("Trajectory Decimation Test")
+    print("=" * 60)
+
+    for test in (test_keeps_tee_apex_and_landing, test_within_tolerance, test_point_budget,
+                 test_straight_segments_collapse, test_pass_through, test_invalid_arguments):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,213 @@
+"""
+Numerical agreement between the trajectory integration paths:
+- simulate_batch (vectorized RK4) and simulate_archetypes reproduce N
+  single simulate_flight calls
+- dopri5 (adaptive, exact ground contact) agrees with fixed-step RK4
+- dense output (DenseTrajectory) evaluates either flight at any time
+
+Run directly (python test_trajectory_physics.py) or under pytest.
+"""
+import numpy as np
+import pytest
+from trajectory_physics import TrajectorySimulator, DenseTrajectory
+from shot_archetypes import SHOT_TYPES
+
+simulator = TrajectorySimulator()
+
+# (speed mph, launch angle, backspin rpm, spin axis, wind mph, wind direction)
+SHOTS = [
+    (145, 12, 2500, 0, 0, 0),       # stock driver, calm
+    (110, 18, 4500, -8, 10, 45),    # high draw, quartering wind
+    (165, 9, 2200, 6, 15, 180),     # low fade downwind
+    (90, 22, 5000, 15, 5, 270),     # wedge slice, crosswind
+]
+
+
+def test_batch_matches_rk4():
+    """simulate_batch integrates the same steps as N simulate_flight calls."""
+    speed, angle, backspin, axis, wind, direction = np.array(SHOTS, dtype=float).T
+    batch = simulator.simulate_batch(speed, angle, backspin, axis,
+                                     wind_speed_mph=wind, wind_direction_deg=direction)
+
+    for i, shot in enumerate(SHOTS):
+        single = simulator.simulate_flight(*shot)
+        assert batch["num_points"][i] == single["num_points"]
+        np.testing.assert_allclose(batch["points"][i], np.array(single["points"]), atol=1e-9)
+        for field in ("carry_distance_yards", "apex_height_yards", "curve_yards",
+                      "flight_time_seconds", "final_spin_rpm"):
+            np.testing.assert_allclose(batch[field][i], single[field], rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(batch["landing_velocity"][i], single["landing_velocity"], atol=1e-9)
+
+
+def test_batch_without_points():
+    """Skipping the point history doesn't change any landing result."""
+    speed, angle, backspin, axis, wind, direction = np.array(SHOTS, dtype=float).T
+    recorded = simulator.simulate_batch(speed, angle, backspin, axis,
+                                        wind_speed_mph=wind, wind_direction_deg=direction)
+    bare = simulator.simulate_batch(speed, angle, backspin, axis,
+                                    wind_speed_mph=wind, wind_direction_deg=direction,
+                                    record_points=False)
+
+    assert bare["points"] is None
+    for field in ("landing", "landing_velocity", "carry_distance_yards", "apex_height_yards",
+                  "flight_time_seconds", "num_points"):
+        np.testing.assert_array_equal(bare[field], recorded[field])
+
+
+def test_batch_broadcasts_scalars():
+    """Scalar arguments broadcast against array ones."""
+    batch = simulator.simulate_batch(140, [10, 12, 14], 2500, 0, record_points=False)
+
+    assert batch["carry_distance_yards"].shape == (3,)
+    for i, angle in enumerate((10, 12, 14)):
+        single = simulator.simulate_flight(140, angle, 2500, 0)
+        np.testing.assert_allclose(batch["carry_distance_yards"][i], single["carry_distance_yards"],
+                                   rtol=1e-9)
+
+
+def test_archetypes_match_single_flights():
+    """simulate_archetypes returns simulate_archetype results for every key."""
+    results = simulator.simulate_archetypes(SHOT_TYPES, launch_speed_mph=140, wind_speed_mph=8,
+                                            wind_direction_deg=30)
+
+    assert list(results) == list(SHOT_TYPES)
+    for key, archetype in SHOT_TYPES.items():
+        single = simulator.simulate_archetype(archetype, 140, wind_speed_mph=8, wind_direction_deg=30)
+        assert results[key]["num_points"] == single["num_points"]
+        np.testing.assert_allclose(results[key]["points"], single["points"], atol=1e-9)
+        np.testing.assert_allclose(results[key]["carry_distance_yards"],
+                                   single["carry_distance_yards"], rtol=1e-9)
+
+
+def test_dopri5_matches_rk4():
+    """Adaptive and fixed-step integration agree on the interpolated landing."""
+    for shot in SHOTS:
+        rk4 = simulator.simulate_flight(*shot)
+        dopri5 = simulator.simulate_flight(*shot, integrator="dopri5")
+
+        assert abs(rk4["flight_time_seconds"] - dopri5["flight_time_seconds"]) < 1e-3
+        assert abs(rk4["carry_distance_yards"] - dopri5["carry_distance_yards"]) < 0.01
+        assert abs(rk4["apex_height_yards"] - dopri5["apex_height_yards"]) < 0.01
+        assert abs(rk4["curve_yards"] - dopri5["curve_yards"]) < 0.01
+        assert dopri5["force_evaluations"] < rk4["force_evaluations"] / 10
+
+
+def test_dopri5_lands_exactly():
+    """The last dopri5 point is the ground contact, at any ground level."""
+    for ground in (0.0, -5.0):
+        result = simulator.simulate_flight(*SHOTS[1], integrator="dopri5", ground_level_m=ground)
+        assert result["points"][-1][2] == pytest.approx(ground, abs=1e-9)
+        assert all(point[2] >= ground - 1e-9 for point in result["points"])
+
+
+def test_dopri5_tolerance_converges():
+    """Tightening the dopri5 tolerances barely moves the landing point."""
+    loose = simulator.simulate_flight(*SHOTS[1], integrator="dopri5", rtol=1e-4, atol=1e-4)
+    tight = simulator.simulate_flight(*SHOTS[1], integrator="dopri5", rtol=1e-9, atol=1e-9)
+
+    assert abs(loose["carry_distance_yards"] - tight["carry_distance_yards"]) < 0.05
+    assert tight["force_evaluations"] > loose["force_evaluations"]
+
+
+def test_unknown_integrator():
+    """Integrator names are validated."""
+    with pytest.raises(ValueError):
+        simulator.simulate_flight(*SHOTS[0], integrator="euler")
+
+
+def test_point_times():
+    """Every point has a time; the last one is the interpolated landing."""
+    for shot in SHOTS:
+        result = simulator.simulate_flight(*shot)
+        times = np.array(result["times"])
+
+        assert len(times) == result["num_points"]
+        assert (np.diff(times) > 0).all()
+        assert times[-1] == result["flight_time_seconds"]
+        assert result["points"][-1][2] == pytest.approx(0.0, abs=1e-9)
+        np.testing.assert_allclose(times[:-1], np.arange(len(times) - 1) * simulator.time_step)
+
+    # The batch engine reports the same times
+    speed, angle, backspin, axis, wind, direction = np.array(SHOTS, dtype=float).T
+    batch = simulator.simulate_batch(speed, angle, backspin, axis,
+                                     wind_speed_mph=wind, wind_direction_deg=direction)
+    for i, shot in enumerate(SHOTS):
+        np.testing.assert_allclose(batch["times"][i], simulator.simulate_flight(*shot)["times"],
+                                   rtol=1e-12, atol=1e-12)
+
+
+def test_dense_output_matches_lists():
+    """dense_output returns the same points as arrays plus a DenseTrajectory."""
+    lists = simulator.simulate_flight(*SHOTS[0])
+    dense = simulator.simulate_flight(*SHOTS[0], dense_output=True)
+    trajectory = dense["trajectory"]
+
+    assert isinstance(trajectory, DenseTrajectory)
+    np.testing.assert_array_equal(dense["points"], np.array(lists["points"]))
+    np.testing.assert_array_equal(trajectory.times, lists["times"])
+    np.testing.assert_array_equal(trajectory.at_time(trajectory.times), trajectory.positions)
+    assert trajectory.to_list() == lists["points"]
+
+
+def test_dense_between_steps():
+    """Both integrators' interpolants match a fine integration mid-flight."""
+    times = np.array([0.505, 1.2345, 2.7001])
+    fine = simulator.positions_at_times(times, *SHOTS[0][:4], time_step=0.0005)[0]
+
+    rk4 = simulator.simulate_flight(*SHOTS[0], dense_output=True)["trajectory"]
+    dopri5 = simulator.simulate_flight(*SHOTS[0], integrator="dopri5", dense_output=True)["trajectory"]
+
+    np.testing.assert_allclose(rk4.at_time(times), fine, atol=1e-6)
+    np.testing.assert_allclose(dopri5.at_time(times), fine, atol=1e-3)
+    assert len(dopri5) < len(rk4) / 10
+
+
+def test_dense_sampling():
+    """Uniform resampling in time or arc length keeps both ends."""
+    trajectory = simulator.simulate_flight(*SHOTS[0], dense_output=True)["trajectory"]
+
+    by_count = trajectory.sample(num_points=50)
+    assert len(by_count) == 50
+    np.testing.assert_allclose(by_count[[0, -1]], trajectory.positions[[0, -1]], atol=1e-12)
+
+    by_time = trajectory.sample(interval=0.1)
+    assert len(by_time) == int(np.ceil(trajectory.duration / 0.1)) + 1
+    np.testing.assert_allclose(by_time[-1], trajectory.positions[-1], atol=1e-12)
+
+    by_distance = trajectory.sample(interval=1.0, by="distance")
+    spacing = np.linalg.norm(np.diff(by_distance[:-1], axis=0), axis=1)
+    np.testing.assert_allclose(spacing, 1.0, atol=0.01)
+    assert trajectory.at_distance(trajectory.length) == pytest.approx(trajectory.positions[-1])
+
+
+def test_dense_validation():
+    """Malformed inputs and sampling requests are rejected."""
+    trajectory = DenseTrajectory.from_points([[0, 0, 0], [1, 0, 1], [2, 0, 0]], 0.5)
+    assert trajectory.duration == 1.0
+
+    with pytest.raises(ValueError):
+        DenseTrajectory([], [])
+    with pytest.raises(ValueError):
+        trajectory.sample()
+    with pytest.raises(ValueError):
+        trajectory.sample(num_points=5, interval=0.1)
+    with pytest.raises(ValueError):
+        trajectory.sample(num_points=5, by="frame")
+    with pytest.raises(ValueError):
+        trajectory.sample(interval=0)
+
+
+if __name__ == "__main__":
+    print("Trajectory Physics Agreement Test")
+    print("=" * 60)
+
+    for test in (test_batch_matches_rk4, test_batch_without_points,
+                 test_batch_broadcasts_scalars, test_archetypes_match_single_flights,
+                 test_dopri5_matches_rk4, test_dopri5_lands_exactly,
+                 test_dopri5_tolerance_converges, test_unknown_integrator,
+                 test_point_times, test_dense_output_matches_lists, test_dense_between_steps,
+                 test_dense_sampling, test_dense_validation):
+        test()
+        print(f"✓ {test.__name__}")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,379 @@
+"""
+Array-Backed Trajectory Container
+
+One representation for every trajectory that moves through the system:
+simulated flights, GPS tracks, archetype table curves and tracked ball
+positions in the image.
+
+- Backed by a single (N, F) float64 buffer, one column per field
+- Zero-copy views: t / x / y / z, lat / lon, pixel px / py, and the
+  combined xyz, latlon and pixels blocks
+- Amortized O(1) append with an optional maximum length (rolling trail)
+- JSON (field names + rows) and compact binary serializers
+
+Fields are chosen per instance, so a pixel trail does not pay for GPS
+columns. Coordinate frames are whatever the producer uses; the container
+only names the columns.
+"""
+
+import json
+import struct
+import numpy as np
+
+
+# All known fields, in canonical column order
+FIELDS = ("t", "frame", "x", "y", "z", "lat", "lon", "px", "py", "radius")
+
+# Common field sets
+POSITION_FIELDS = ("t", "x", "y", "z")
+GPS_FIELDS = ("t", "x", "y", "z", "lat", "lon")
+PIXEL_FIELDS = ("t", "frame", "px", "py", "radius")
+
+MAGIC = b"LKTR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # magic, version, field count, rows
+
+
+class TrajectoryArray:
+    """
+    Growable trajectory backed by one float64 array.
+
+    Column properties (t, x, y, ...) and slices are views into the buffer:
+    they are invalidated by a later append that reallocates it.
+    """
+
+    __slots__ = ("fields", "max_length", "_columns", "_buffer", "_start", "_stop")
+
+    def __init__(self, fields=GPS_FIELDS, capacity=64, max_length=None):
+        """
+        Args:
+            fields: Field names (subset of FIELDS), in column order
+            capacity: Initial number of rows to allocate
+            max_length: Keep only the most recent rows when set
+        """
+        unknown = [name for name in fields if name not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown trajectory fields: {unknown}")
+
+        self.fields = tuple(fields)
+        self.max_length = max_length
+        self._columns = {name: i for i, name in enumerate(self.fields)}
+        self._buffer = np.full((max(capacity, 1), len(self.fields)), np.nan)
+        self._start = 0
+        self._stop = 0
+
+    @classmethod
+    def from_array(cls, data, fields):
+        """
+        Wrap an existing (N, len(fields)) float64 array without copying.
+
+        Args:
+            data: Array of rows
+            fields: Field name per column
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != len(fields):
+            raise ValueError(f"Expected an (N, {len(fields)}) array, got {data.shape}")
+
+        trajectory = cls(fields, capacity=1)
+        trajectory._buffer = data
+        trajectory._stop = len(data)
+        return trajectory
+
+    @classmethod
+    def from_points(cls, points, times=None, fields=GPS_FIELDS):
+        """
+        Build from [x, y, z] points (lists, arrays or DenseTrajectory samples).
+
+        Args:
+            points: (N, 3) positions in meters
+            times: (N,) seconds (optional)
+            fields: Field set; must include x, y and z
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        trajectory = cls(fields, capacity=len(points))
+        trajectory._stop = len(points)
+        trajectory.xyz[:] = points
+        if times is not None:
+            trajectory.t[:] = times
+        return trajectory
+
+    @classmethod
+    def from_pixels(cls, pixels, times=None, frames=None, radii=None, fields=PIXEL_FIELDS):
+        """
+        Build from tracked image positions.
+
+        Args:
+            pixels: (N, 2) [px, py] in pixels
+            times: (N,) seconds (optional)
+            frames: (N,) frame numbers (optional)
+            radii: (N,) ball radius in pixels (optional)
+            fields: Field set; must include px and py
+        """
+        pixels = np.asarray(pixels, dtype=np.float64).reshape(-1, 2)
+        trajectory = cls(fields, capacity=len(pixels))
+        trajectory._stop = len(pixels)
+        trajectory.pixels[:] = pixels
+        for name, values in (("t", times), ("frame", frames), ("radius", radii)):
+            if values is not None:
+                trajectory[name][:] = values
+        return trajectory
+
+    # -- Size and raw access ------------------------------------------------
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def data(self):
+        """(N, F) view of all rows."""
+        return self._buffer[self._start:self._stop]
+
+    @property
+    def records(self):
+        """Structured (N,) view with one named field per column."""
+        dtype = np.dtype([(name, np.float64) for name in self.fields])
+        return np.ascontiguousarray(self.data).view(dtype).reshape(-1)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the live rows."""
+        return self.data.nbytes
+
+    def column(self, name):
+        """(N,) view of one field."""
+        try:
+            return self.data[:, self._columns[name]]
+        except KeyError:
+            raise KeyError(f"Trajectory has no field '{name}' (fields: {self.fields})") from None
+
+    def _block(self, names):
+        """(N, len(names)) view of adjacent fields (copy if not adjacent)."""
+        first = self._columns.get(names[0])
+        if first is not None and all(self._columns.get(name) == first + i for i, name in enumerate(names)):
+            return self.data[:, first:first + len(names)]
+        return np.column_stack([self.column(name) for name in names])
+
+    def __getitem__(self, key):
+        """
+        trajectory["x"] -> column view, trajectory[i] -> dict of one row,
+        trajectory[a:b] -> TrajectoryArray view of the rows.
+        """
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            return TrajectoryArray.from_array(self.data[key], self.fields)
+        return dict(zip(self.fields, self.data[key].tolist()))
+
+    def __iter__(self):
+        for row in self.data.tolist():
+            yield dict(zip(self.fields, row))
+
+    # -- Named views ---------------------------------------------------------
+
+    t = property(lambda self: self.column("t"), doc="Seconds (view).")
+    frame = property(lambda self: self.column("frame"), doc="Frame numbers (view).")
+    x = property(lambda self: self.column("x"), doc="x in meters (view).")
+    y = property(lambda self: self.column("y"), doc="y in meters (view).")
+    z = property(lambda self: self.column("z"), doc="z in meters (view).")
+    lat = property(lambda self: self.column("lat"), doc="Latitude (view).")
+    lon = property(lambda self: self.column("lon"), doc="Longitude (view).")
+    px = property(lambda self: self.column("px"), doc="Image x in pixels (view).")
+    py = property(lambda self: self.column("py"), doc="Image y in pixels (view).")
+    radius = property(lambda self: self.column("radius"), doc="Ball radius in pixels (view).")
+
+    @property
+    def xyz(self):
+        """(N, 3) positions (view for the standard field sets)."""
+        return self._block(("x", "y", "z"))
+
+    @property
+    def latlon(self):
+        """(N, 2) [lat, lon] (view for the standard field sets)."""
+        return self._block(("lat", "lon"))
+
+    @property
+    def pixels(self):
+        """(N, 2) [px, py] (view for the standard field sets)."""
+        return self._block(("px", "py"))
+
+    # -- Mutation ------------------------------------------------------------
+
+    def append(self, **values):
+        """
+        Append one row; fields not given are NaN.
+
+        When max_length is set the oldest rows are dropped, so the trajectory
+        acts as a rolling trail without reallocating.
+        """
+        if self._stop == len(self._buffer):
+            live = len(self)
+            if self._start > 0 and live < len(self._buffer) // 2 + 1:
+                # Slide the live window back to the front
+                self._buffer[:live] = self._buffer[self._start:self._stop]
+            else:
+                grown = np.full((2 * len(self._buffer), len(self.fields)), np.nan)
+                grown[:live] = self._buffer[self._start:self._stop]
+                self._buffer = grown
+            self._start, self._stop = 0, live
+
+        row = self._buffer[self._stop]
+        row[:] = np.nan
+        for name, value in values.items():
+            row[self._columns[name]] = value
+        self._stop += 1
+
+        if self.max_length is not None and len(self) > self.max_length:
+            self._start = self._stop - self.max_length
+
+    def clear(self):
+        """Drop all rows (keeps the allocation)."""
+        self._start = self._stop = 0
+
+    def copy(self):
+        """Independent copy of the live rows."""
+        return TrajectoryArray.from_array(self.data.copy(), self.fields)
+
+    def set_gps(self, start_lat, start_lon, bearing_deg, precise=False):
+        """
+        Fill lat/lon from x (forward) and y (lateral, positive right) in meters.
+
+        Args:
+            start_lat, start_lon: Origin (tee) position
+            bearing_deg: Direction of +x (degrees from North)
+            precise: Spherical formulas instead of the cached tangent-plane projection
+
+        Returns:
+            self
+        """
+        from gps_converter import get_projection, local_to_gps_arrays
+
+        if precise:
+            self.lat[:], self.lon[:] = local_to_gps_arrays(self.x, self.y, start_lat, start_lon, bearing_deg)
+        else:
+            self.lat[:], self.lon[:] = get_projection(start_lat, start_lon).shot_to_gps(
+                self.x, self.y, bearing_deg
+            )
+        return self
+
+    # -- Serialization -------------------------------------------------------
+
+    def to_list(self, fields=("x", "y", "z"), decimals=None):
+        """
+        Rows as plain lists (the legacy [[x, y, z], ...] style).
+
+        Args:
+            fields: Fields per row, in order
+            decimals: Round each value (Python round, as the JSON tables use)
+        """
+        rows = self._block(tuple(fields)).tolist()
+        if decimals is not None:
+            rows = [[round(v, decimals) for v in row] for row in rows]
+        return rows
+
+    def to_dicts(self, fields=None, decimals=None):
+        """Rows as dicts keyed by field name (e.g. table points, saved shots)."""
+        fields = tuple(fields or self.fields)
+        return [dict(zip(fields, row)) for row in self.to_list(fields, decimals)]
+
+    def to_json(self, fields=None, decimals=None):
+        """
+        Compact JSON-ready dict: {"fields": [...], "data": [[...], ...]}.
+
+        NaN (missing) values become None.
+        """
+        fields = tuple(fields or self.fields)
+        rows = self.to_list(fields, decimals)
+        rows = [[None if v != v else v for v in row] for row in rows]
+        return {"fields": list(fields), "data": rows}
+
+    @classmethod
+    def from_json(cls, payload):
+        """Inverse of to_json."""
+        if isinstance(payload, (str, bytes)):
+            payload = json.loads(payload)
+        data = np.array(payload["data"], dtype=np.float64).reshape(-1, len(payload["fields"]))
+        return cls.from_array(data, payload["fields"])
+
+    def to_bytes(self, dtype="<f8"):
+        """
+        Binary encoding: header, comma-separated field names, row-major data.
+
+        Args:
+            dtype: "<f8" (exact) or "<f4" (half the size; flag stored in the version)
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype("<f8"), np.dtype("<f4")):
+            raise ValueError("dtype must be '<f8' or '<f4'")
+
+        names = ",".join(self.fields).encode("ascii")
+        version = FORMAT_VERSION | (0x100 if dtype == np.dtype("<f4") else 0)
+        return (HEADER.pack(MAGIC, version, len(self.fields), len(self))
+                + struct.pack("<H", len(names)) + names
+                + np.ascontiguousarray(self.data, dtype=dtype).tobytes())
+
+    @classmethod
+    def from_bytes(cls, payload):
+        """Inverse of to_bytes (the data is copied out of the payload once)."""
+        magic, version, num_fields, rows = HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise ValueError("Not a binary trajectory")
+        if version & 0xFF != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trajectory format version {version & 0xFF}")
+
+        offset = HEADER.size
+        (names_length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        fields = payload[offset:offset + names_length].decode("ascii").split(",")
+        offset += names_length
+
+        dtype = "<f4" if version & 0x100 else "<f8"
+        data = np.frombuffer(payload, dtype=dtype, count=rows * num_fields, offset=offset)
+        return cls.from_array(data.astype(np.float64).reshape(rows, num_fields), fields)
+
+    def __repr__(self):
+        return f"TrajectoryArray({len(self)} rows, fields={self.fields})"
+
+
+if __name__ == "__main__":
+    """Compare the container with the list-of-lists / list-of-dicts forms"""
+    import sys
+    import time
+    from trajectory_physics import TrajectorySimulator
+    from gps_converter import trajectory_to_gps
+
+    print("Trajectory Array Test")
+    print("=" * 60)
+
+    result = TrajectorySimulator().simulate_flight(145, 12, 2500, 5)
+    points = result["points"]
+
+    list_bytes = sys.getsizeof(points) + sum(sys.getsizeof(p) + 3 * 24 for p in points)
+    trajectory = TrajectoryArray.from_points(points)
+    print(f"\n{len(points)} points: list of lists ~{list_bytes / 1024:.1f} KB, "
+          f"array {trajectory.nbytes / 1024:.1f} KB")
+
+    start_time = time.perf_counter()
+    legacy = trajectory_to_gps(points, 34.05, -118.24, 30, precise=True)
+    legacy_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    trajectory.set_gps(34.05, -118.24, 30)
+    array_time = time.perf_counter() - start_time
+
+    error = np.abs(np.array(legacy)[:, :2] - trajectory.latlon).max()
+    print(f"GPS conversion: list {legacy_time * 1000:.2f} ms, array {array_time * 1000:.2f} ms "
+          f"(max difference {error * 111e3 * 100:.2f} cm)")
+
+    encoded = trajectory.to_bytes()
+    as_json = json.dumps(trajectory.to_json(("lat", "lon", "z")))
+    print(f"Binary: {len(encoded)} bytes, JSON (lat/lon/z): {len(as_json)} bytes")
+    assert np.array_equal(TrajectoryArray.from_bytes(encoded).data, trajectory.data, equal_nan=True)
+
+    trail = TrajectoryArray(PIXEL_FIELDS, capacity=8, max_length=60)
+    for i in range(1000):
+        trail.append(t=i / 30, frame=i, px=100 + i, py=300 - i)
+    print(f"Rolling trail: {len(trail)} rows, buffer {len(trail._buffer)} rows, "
+          f"first frame {trail.frame[0]:.0f}")
+
+    print("\n" + "=" * 60)
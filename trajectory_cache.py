@@ -0,0 +1,319 @@
+"""
+Trajectory Memoization Cache
+
+LRU/TTL cache in front of TrajectorySimulator:
+1. Quantize inputs to configurable resolutions (0.5 mph, 0.5°, 50 rpm, ...)
+2. Simulate misses at the quantized values, so every hit is reproducible
+3. Store results read-only and hand the same object to every caller
+
+Golfers on the same course send nearly identical archetype/speed/wind
+combinations, so most requests skip both the integration and the copying.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+import numpy as np
+from trajectory_physics import TrajectorySimulator
+
+
+# Default input resolutions (inputs are rounded to the nearest multiple)
+DEFAULT_RESOLUTION = {
+    "launch_speed_mph": 0.5,
+    "launch_angle_deg": 0.5,
+    "backspin_rpm": 50,
+    "side_spin_axis_deg": 0.5,
+    "wind_speed_mph": 0.5,
+    "wind_direction_deg": 5,
+    "temperature_f": 2,
+    "altitude_m": 25,
+    "ground_level_m": 1,
+}
+
+# Approximate per-entry overhead beyond the point array (dict, key, scalars)
+ENTRY_OVERHEAD_BYTES = 1024
+
+
+def _freeze_value(value):
+    """Read-only copy of one result value (arrays stay arrays, lists become tuples)."""
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_value(item) for key, item in value.items()})
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _freeze(result):
+    """
+    Make a simulator result immutable so it can be shared between callers.
+
+    Args:
+        result: Trajectory dict from simulate_flight or simulate_archetypes
+
+    Returns:
+        Read-only mapping whose "points" is a read-only (N, 3) float array;
+        every other sequence (e.g. "landing_velocity") becomes a tuple
+    """
+    points = np.array(result["points"], dtype=float).reshape(-1, 3)
+    points.flags.writeable = False
+
+    frozen = {key: _freeze_value(value) for key, value in result.items() if key != "points"}
+    frozen["points"] = points
+
+    return MappingProxyType(frozen)
+
+
+class TrajectoryCache:
+    """
+    Quantized LRU/TTL memoization of simulate_flight results.
+
+    Results are shared, read-only mappings; callers that need to modify
+    the points must copy them first.
+    """
+
+    def __init__(self, simulator=None, resolution=None, max_entries=5000,
+                 max_bytes=64 * 1024 * 1024, ttl_seconds=3600):
+        """
+        Args:
+            simulator: TrajectorySimulator (default: new instance)
+            resolution: Dict overriding DEFAULT_RESOLUTION entries
+            max_entries: Maximum number of cached trajectories
+            max_bytes: Approximate memory bound for cached trajectories
+            ttl_seconds: Entry lifetime (None = never expire)
+        """
+        self.simulator = simulator or TrajectorySimulator()
+        self.resolution = {**DEFAULT_RESOLUTION, **(resolution or {})}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # key -> (result, size_bytes, timestamp)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _quantize(self, name, value):
+        """Round an input to its configured resolution."""
+        step = self.resolution[name]
+        return round(round(float(value) / step) * step, 6) if step else float(value)
+
+    def _quantize_inputs(self, **inputs):
+        """Quantize all simulator inputs, keeping their names."""
+        return {name: self._quantize(name, value) for name, value in inputs.items()}
+
+    def _lookup(self, key):
+        """Return a live cached result (refreshing its LRU position) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, size, timestamp = entry
+            if self.ttl_seconds is not None and time.time() - timestamp > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def _store(self, key, result):
+        """Insert a frozen result and evict least recently used entries."""
+        size = result["points"].nbytes + ENTRY_OVERHEAD_BYTES
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (result, size, time.time())
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def simulate_flight(self, launch_speed_mph, launch_angle_deg,
+                        backspin_rpm, side_spin_axis_deg,
+                        wind_speed_mph=0, wind_direction_deg=0,
+                        temperature_f=70, altitude_m=0,
+                        integrator="rk4", rtol=1e-6, atol=1e-6, ground_level_m=0):
+        """
+        Cached TrajectorySimulator.simulate_flight.
+
+        Args:
+            Same as TrajectorySimulator.simulate_flight
+
+        Returns:
+            Read-only trajectory mapping (shared between callers) simulated
+            at the quantized inputs
+        """
+        inputs = self._quantize_inputs(
+            launch_speed_mph=launch_speed_mph,
+            launch_angle_deg=launch_angle_deg,
+            backspin_rpm=backspin_rpm,
+            side_spin_axis_deg=side_spin_axis_deg,
+            wind_speed_mph=wind_speed_mph,
+            wind_direction_deg=wind_direction_deg,
+            temperature_f=temperature_f,
+            altitude_m=altitude_m,
+            ground_level_m=ground_level_m
+        )
+        key = ("simulate_flight", integrator, rtol, atol) + tuple(inputs.values())
+
+        result = self._lookup(key)
+        if result is None:
+            result = _freeze(self.simulator.simulate_flight(
+                **inputs, integrator=integrator, rtol=rtol, atol=atol
+            ))
+            self._store(key, result)
+
+        return result
+
+    def simulate_archetypes(self, archetypes, launch_speed_mph,
+                            wind_speed_mph=0, wind_direction_deg=0,
+                            ground_level_m=0):
+        """
+        Cached TrajectorySimulator.simulate_archetypes.
+
+        Hits are served from the cache; all misses are integrated together
+        in one vectorized batch.
+
+        Args:
+            Same as TrajectorySimulator.simulate_archetypes
+
+        Returns:
+            Dict of key -> read-only trajectory mapping
+        """
+        shared = self._quantize_inputs(
+            launch_speed_mph=launch_speed_mph,
+            wind_speed_mph=wind_speed_mph,
+            wind_direction_deg=wind_direction_deg,
+            ground_level_m=ground_level_m
+        )
+
+        results = {}
+        missing = {}
+
+        for archetype_key, archetype in archetypes.items():
+            shot = self._quantize_inputs(
+                launch_angle_deg=archetype["launch_angle"],
+                backspin_rpm=archetype["backspin_rpm"],
+                side_spin_axis_deg=archetype["side_spin_axis"]
+            )
+            # Own key space: batch results carry different fields than
+            # simulate_flight (no force_evaluations)
+            key = ("simulate_archetypes", shared["launch_speed_mph"],
+                   shot["launch_angle_deg"], shot["backspin_rpm"], shot["side_spin_axis_deg"],
+                   shared["wind_speed_mph"], shared["wind_direction_deg"],
+                   self._quantize("temperature_f", 70), self._quantize("altitude_m", 0),
+                   shared["ground_level_m"])
+
+            cached = self._lookup(key)
+            if cached is not None:
+                results[archetype_key] = cached
+            else:
+                missing[archetype_key] = (key, {
+                    "launch_angle": shot["launch_angle_deg"],
+                    "backspin_rpm": shot["backspin_rpm"],
+                    "side_spin_axis": shot["side_spin_axis_deg"]
+                })
+
+        if missing:
+            simulated = self.simulator.simulate_archetypes(
+                {archetype_key: shot for archetype_key, (_, shot) in missing.items()},
+                **shared
+            )
+
+            for archetype_key, (key, _) in missing.items():
+                result = _freeze(simulated[archetype_key])
+                self._store(key, result)
+                results[archetype_key] = result
+
+        return {archetype_key: results[archetype_key] for archetype_key in archetypes}
+
+    def clear(self):
+        """Drop all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict with hits, misses, hit_rate, entries, bytes, evictions,
+            expirations and the configured bounds
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
+# Singleton instance
+_trajectory_cache = None
+
+
+def get_trajectory_cache():
+    """Get or create the shared trajectory cache"""
+    global _trajectory_cache
+    if _trajectory_cache is None:
+        _trajectory_cache = TrajectoryCache()
+    return _trajectory_cache
+
+
+if __name__ == "__main__":
+    """Test the trajectory cache"""
+    from shot_archetypes import SHOT_TYPES
+
+    print("Trajectory Cache Test")
+    print("=" * 60)
+
+    cache = TrajectoryCache()
+
+    # Nearby speeds and winds land in the same bins after the first request
+    for speed, wind in [(140.1, 8.1), (139.9, 7.9), (140.2, 8.2), (152.0, 8.0)]:
+        start_time = time.perf_counter()
+        results = cache.simulate_archetypes(SHOT_TYPES, speed, wind_speed_mph=wind, wind_direction_deg=30)
+        elapsed = time.perf_counter() - start_time
+        print(f"\n{speed} mph, {wind} mph wind: {elapsed * 1000:.2f} ms "
+              f"(straight carry {results['straight']['carry_distance_yards']:.1f} yds)")
+
+    flight = cache.simulate_flight(145, 12, 2500, 0)
+    print(f"\nsimulate_flight points read-only: {not flight['points'].flags.writeable}")
+    print(f"Same object on hit: {cache.simulate_flight(145.1, 12, 2510, 0) is flight}")
+
+    stats = cache.get_stats()
+    print(f"\nHits: {stats['hits']}, misses: {stats['misses']}, hit rate {stats['hit_rate']:.0%}")
+    print(f"Entries: {stats['entries']}, memory: {stats['bytes'] / 1024:.0f} KB")
+
+    print("\n" + "=" * 60)
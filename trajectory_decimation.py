@@ -0,0 +1,129 @@
+"""
+Trajectory Decimation
+
+Level-of-detail stage for simulated flights before GPS conversion:
+1. Always keep the tee, apex and landing points exactly
+2. Refine with Ramer-Douglas-Peucker, worst segment first
+3. Stop at a distance tolerance (meters) and/or a fixed point budget
+
+A few hundred points per flight typically reduce to about a dozen at 0.25m
+tolerance, so trajectory_to_gps does a fraction of the trig and the JSON
+response shrinks to match.
+"""
+
+import heapq
+import numpy as np
+
+
+DEFAULT_TOLERANCE_M = 0.25
+
+
+def _segment_error(points, start, end):
+    """
+    Find the point farthest from the chord between two kept points.
+
+    Args:
+        points: (N, 3) array of trajectory points
+        start: Index of the first kept point
+        end: Index of the last kept point
+
+    Returns:
+        (distance_meters, index) of the farthest interior point,
+        or (0.0, -1) if the segment has no interior points
+    """
+    if end - start < 2:
+        return 0.0, -1
+
+    a = points[start]
+    chord = points[end] - a
+    interior = points[start + 1:end] - a
+
+    length_sq = float(chord @ chord)
+    if length_sq > 0:
+        t = np.clip(interior @ chord / length_sq, 0.0, 1.0)
+        interior = interior - t[:, None] * chord
+
+    distances = np.einsum('ij,ij->i', interior, interior)
+    i = int(np.argmax(distances))
+    return float(np.sqrt(distances[i])), start + 1 + i
+
+
+def simplify_trajectory(points, tolerance_m=DEFAULT_TOLERANCE_M, max_points=None):
+    """
+    Simplify a trajectory while keeping its tee, apex and landing points.
+
+    Segments are split at their farthest point in order of error, so a point
+    budget always spends points where the polyline deviates most.
+
+    Args:
+        points: List or array of [x, y, z] points in meters
+        tolerance_m: Maximum distance from the simplified polyline to any
+            dropped point (0 = limited by max_points only)
+        max_points: Optional cap on returned points (minimum 3)
+
+    Returns:
+        List of [x, y, z] points (a subset of the input, in order)
+    """
+    if tolerance_m < 0:
+        raise ValueError(f"tolerance_m must be non-negative, got {tolerance_m}")
+    if max_points is not None and max_points < 3:
+        raise ValueError(f"max_points must be at least 3, got {max_points}")
+
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3 or (tolerance_m == 0 and max_points is None):
+        return points.tolist()
+
+    last = len(points) - 1
+    apex = int(np.argmax(points[:, 2]))
+    kept = sorted({0, apex, last})
+
+    budget = max_points if max_points is not None else len(points)
+
+    # Max-heap of segments keyed by their worst point distance
+    heap = []
+    for start, end in zip(kept, kept[1:]):
+        error, index = _segment_error(points, start, end)
+        if index >= 0:
+            heapq.heappush(heap, (-error, index, start, end))
+
+    while heap and len(kept) < budget:
+        error, index, start, end = heapq.heappop(heap)
+        if -error <= tolerance_m:
+            break
+
+        kept.append(index)
+        for segment in ((start, index), (index, end)):
+            error, split = _segment_error(points, *segment)
+            if split >= 0:
+                heapq.heappush(heap, (-error, split, *segment))
+
+    return points[sorted(kept)].tolist()
+
+
+if __name__ == "__main__":
+    """Test trajectory decimation"""
+    import time
+    from trajectory_physics import TrajectorySimulator
+
+    print("Trajectory Decimation Test")
+    print("=" * 60)
+
+    simulator = TrajectorySimulator()
+    result = simulator.simulate_flight(150, 12, 2800, -15, wind_speed_mph=10, wind_direction_deg=45)
+    points = result['points']
+    print(f"\nFull trajectory: {len(points)} points")
+
+    for tolerance in (0.05, 0.25, 1.0):
+        start_time = time.perf_counter()
+        simplified = simplify_trajectory(points, tolerance_m=tolerance)
+        elapsed = time.perf_counter() - start_time
+        print(f"  tolerance {tolerance:.2f}m: {len(simplified)} points "
+              f"({len(points) / len(simplified):.0f}x smaller, {elapsed * 1000:.2f} ms)")
+
+    budgeted = simplify_trajectory(points, tolerance_m=0, max_points=12)
+    print(f"  budget 12: {len(budgeted)} points")
+
+    apex = max(points, key=lambda p: p[2])
+    print(f"\nApex kept: {apex in simplified}, landing kept: {simplified[-1] == list(points[-1])}")
+
+    print("\n" + "=" * 60)
@@ -14,6 +14,180 @@ import numpy as np
 import math
 
 
+# Dormand-Prince 5(4) Butcher tableau (Hairer, Norsett & Wanner)
+DOPRI_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+DOPRI_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+DOPRI_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+
+# Difference between 5th and 4th order weights (7th stage is FSAL)
+DOPRI_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+# 4th order continuous extension: y(t + θh) = y + h * K^T P [θ, θ², θ³, θ⁴]
+DOPRI_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+
+class DenseTrajectory:
+    """
+    Compact trajectory with a cubic Hermite interpolant between stored states.
+    
+    Step times, positions and velocities live in NumPy arrays; the flight can
+    be evaluated at any time or arc length, at any density, without keeping
+    per-step Python lists.
+    """
+    
+    def __init__(self, times, positions, velocities=None):
+        """
+        Args:
+            times: (K,) increasing step times in seconds
+            positions: (K, 3) positions [x, y, z] in meters
+            velocities: (K, 3) velocities in m/s (default: finite differences)
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        
+        if len(self.times) != len(self.positions) or len(self.times) == 0:
+            raise ValueError("times and positions must be non-empty and the same length")
+        
+        if velocities is None:
+            if len(self.times) > 1:
+                velocities = np.gradient(self.positions, self.times, axis=0)
+            else:
+                velocities = np.zeros_like(self.positions)
+        self.velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 3)
+        
+        self._arc_lengths = None
+    
+    @classmethod
+    def from_points(cls, points, time_step):
+        """
+        Build a trajectory from equally spaced points (velocities estimated).
+        
+        Args:
+            points: (K, 3) positions recorded every time_step seconds
+            time_step: Seconds between points
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        return cls(np.arange(len(points)) * time_step, points)
+    
+    def __len__(self):
+        return len(self.times)
+    
+    @property
+    def duration(self):
+        """Time of the last stored state in seconds."""
+        return float(self.times[-1])
+    
+    @property
+    def nbytes(self):
+        """Memory held by the state arrays."""
+        return self.times.nbytes + self.positions.nbytes + self.velocities.nbytes
+    
+    @property
+    def arc_lengths(self):
+        """(K,) cumulative path length at each stored state (chord approximation)."""
+        if self._arc_lengths is None:
+            steps = np.linalg.norm(np.diff(self.positions, axis=0), axis=1)
+            self._arc_lengths = np.concatenate([[0.0], np.cumsum(steps)])
+        return self._arc_lengths
+    
+    @property
+    def length(self):
+        """Total path length in meters."""
+        return float(self.arc_lengths[-1])
+    
+    def at_time(self, t):
+        """
+        Evaluate positions at arbitrary times (clamped to the flight).
+        
+        Args:
+            t: Scalar or array of times in seconds
+            
+        Returns:
+            (3,) position for a scalar, (M, 3) array otherwise
+        """
+        t = np.asarray(t, dtype=np.float64)
+        scalar = t.ndim == 0
+        t = np.clip(np.atleast_1d(t), self.times[0], self.times[-1])
+        
+        if len(self.times) == 1:
+            result = np.repeat(self.positions, t.size, axis=0)
+            return result[0] if scalar else result
+        
+        i = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 2)
+        h = (self.times[i + 1] - self.times[i])[:, None]
+        theta = (t[:, None] - self.times[i][:, None]) / h
+        theta2 = theta * theta
+        theta3 = theta2 * theta
+        
+        result = ((2 * theta3 - 3 * theta2 + 1) * self.positions[i]
+                  + (theta3 - 2 * theta2 + theta) * h * self.velocities[i]
+                  + (-2 * theta3 + 3 * theta2) * self.positions[i + 1]
+                  + (theta3 - theta2) * h * self.velocities[i + 1])
+        
+        return result[0] if scalar else result
+    
+    def at_distance(self, s):
+        """
+        Evaluate positions at arc lengths along the flight path.
+        
+        Args:
+            s: Scalar or array of distances along the path in meters
+            
+        Returns:
+            (3,) position for a scalar, (M, 3) array otherwise
+        """
+        return self.at_time(np.interp(s, self.arc_lengths, self.times))
+    
+    def sample(self, num_points=None, interval=None, by="time"):
+        """
+        Resample the flight uniformly in time or arc length.
+        
+        Args:
+            num_points: Number of samples including both ends
+            interval: Spacing in seconds (by="time") or meters (by="distance");
+                the final state is always included
+            by: "time" or "distance"
+            
+        Returns:
+            (M, 3) array of positions
+        """
+        if by not in ("time", "distance"):
+            raise ValueError(f"Unknown sampling mode: {by}")
+        if (num_points is None) == (interval is None):
+            raise ValueError("Specify exactly one of num_points or interval")
+        
+        end = self.duration if by == "time" else self.length
+        if num_points is not None:
+            stations = np.linspace(0.0, end, max(int(num_points), 2))
+        else:
+            if interval <= 0:
+                raise ValueError(f"interval must be positive, got {interval}")
+            stations = np.append(np.arange(0.0, end, interval), end)
+        
+        if by == "time":
+            return self.at_time(self.times[0] + stations)
+        return self.at_distance(stations)
+    
+    def to_list(self):
+        """Stored positions as a list of [x, y, z] (simulate_flight format)."""
+        return self.positions.tolist()
+
+
 class TrajectorySimulator:
     def __init__(self):
         """Initialize physics constants."""
@@ -33,6 +207,10 @@ class TrajectorySimulator:
         # Physics constants
         self.gravity = 9.81  # m/s²
         
+        # Integration settings
+        self.time_step = 0.01  # 10ms time steps
+        self.max_flight_time = 15.0  # Maximum 15 seconds
+        
     def set_conditions(self, altitude_meters=0, temperature_f=70, humidity=50):
         """
         Adjust air density for environmental conditions.
@@ -108,6 +286,23 @@ class TrajectorySimulator:
         
         return [ax, ay, az]
     
+    def _derivative(self, state, wind_vector):
+        """
+        Time derivative of the state vector.
+        
+        Args:
+            state: [x, y, z, vx, vy, vz, spin_rate, spin_axis]
+            wind_vector: (wind_x, wind_y) in m/s
+            
+        Returns:
+            [vx, vy, vz, ax, ay, az, spin_decay, 0]
+        """
+        x, y, z, vx, vy, vz, spin, axis = state
+        ax, ay, az = self._forces(state, wind_vector)
+        # Spin decay (simplified - loses ~2% per second)
+        spin_decay = -0.02 * spin
+        return [vx, vy, vz, ax, ay, az, spin_decay, 0]
+    
     def _rk4_step(self, state, dt, wind_vector):
         """
         Single Runge-Kutta 4th order integration step.
@@ -121,11 +316,7 @@ class TrajectorySimulator:
             New state after dt
         """
         def derivative(s):
-            x, y, z, vx, vy, vz, spin, axis = s
-            ax, ay, az = self._forces(s, wind_vector)
-            # Spin decay (simplified - loses ~2% per second)
-            spin_decay = -0.02 * spin
-            return [vx, vy, vz, ax, ay, az, spin_decay, 0]
+            return self._derivative(s, wind_vector)
         
         k1 = derivative(state)
         k2 = derivative([state[i] + dt/2 * k1[i] for i in range(len(state))])
@@ -139,10 +330,181 @@ class TrajectorySimulator:
         
         return new_state
     
+    @staticmethod
+    def _hermite_crossing(p0, v0, p1, v1, dt, level):
+        """
+        Ground contact within RK4 steps, on each step's cubic Hermite interpolant.
+        
+        The bracketing states are 4th order accurate and so is the cubic
+        through their positions and velocities, so the crossing keeps the
+        integrator's order (a linear crossing would be 2nd order).
+        
+        Args:
+            p0, v0: (3, N) positions and velocities at the start of the steps
+            p1, v1: (3, N) positions and velocities at the end (below level)
+            dt: Step length in seconds
+            level: Height of the ground (scalar or (N,))
+            
+        Returns:
+            (theta, position, velocity): (N,) fraction of the step and (3, N)
+            state at the crossing, position z set exactly to level
+        """
+        z0, z1 = p0[2] - level, p1[2] - level
+        m0, m1 = v0[2] * dt, v1[2] * dt
+        
+        # Newton on the cubic z(theta) - level, from the linear crossing
+        theta = z0 / np.maximum(z0 - z1, 1e-12)
+        for _ in range(4):
+            t2 = theta * theta
+            t3 = t2 * theta
+            z = (2 * t3 - 3 * t2 + 1) * z0 + (t3 - 2 * t2 + theta) * m0 + (3 * t2 - 2 * t3) * z1 + (t3 - t2) * m1
+            dz = (6 * t2 - 6 * theta) * (z0 - z1) + (3 * t2 - 4 * theta + 1) * m0 + (3 * t2 - 2 * theta) * m1
+            theta = np.clip(theta - z / np.where(dz < 0, dz, -1e-12), 0.0, 1.0)
+        
+        t2 = theta * theta
+        t3 = t2 * theta
+        position = ((2 * t3 - 3 * t2 + 1) * p0 + (t3 - 2 * t2 + theta) * dt * v0
+                    + (3 * t2 - 2 * t3) * p1 + (t3 - t2) * dt * v1)
+        velocity = (((6 * t2 - 6 * theta) * (p0 - p1)) / dt + (3 * t2 - 4 * theta + 1) * v0
+                    + (3 * t2 - 2 * theta) * v1)
+        position[2] = level
+        
+        return theta, position, velocity
+    
+    def _integrate_adaptive(self, state, wind_vector, rtol=1e-6, atol=1e-6,
+                            ground_level_m=0.0):
+        """
+        Integrate a flight with adaptive Dormand-Prince 5(4) steps.
+        
+        The step size is controlled by the embedded 4th order error estimate.
+        Apex and ground contact are located exactly by finding the roots of
+        vz and z on each step's 4th order dense output polynomial.
+        
+        Args:
+            state: Initial state [x, y, z, vx, vy, vz, spin_rate, spin_axis]
+            wind_vector: (wind_x, wind_y) in m/s
+            rtol: Relative error tolerance per step
+            atol: Absolute error tolerance per step
+            ground_level_m: Height at which the flight ends
+            
+        Returns:
+            (times, states, apex_height, flight_time, force_evaluations) with
+            states a (K, 8) array of accepted step states; the last row is
+            the final (landing) state
+        """
+        y = np.array(state, dtype=float)
+        f = np.array(self._derivative(y, wind_vector))
+        evaluations = 1
+        
+        t = 0.0
+        h = 0.05  # Initial guess, adapted immediately
+        min_step = 1e-6
+        max_time = self.max_flight_time
+        
+        # Accepted steps go into preallocated rows (doubled when full)
+        times = np.empty(64)
+        states = np.empty((64, y.size))
+        times[0], states[0] = t, y
+        count = 1
+        apex_height = max(y[2], 0.0)
+        K = np.empty((7, y.size))
+        
+        while t < max_time:
+            h = min(h, max_time - t)
+            
+            K[0] = f
+            for i in range(1, 6):
+                dy = np.dot(DOPRI_A[i], K[:i]) * h
+                K[i] = self._derivative(y + dy, wind_vector)
+            y_new = y + h * np.dot(DOPRI_B, K[:6])
+            K[6] = f_new = np.array(self._derivative(y_new, wind_vector))
+            evaluations += 6
+            
+            # Scaled RMS error of the embedded 4th order solution
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error = np.sqrt(np.mean((h * np.dot(DOPRI_E, K) / scale) ** 2))
+            
+            if error > 1 and h > min_step:
+                h *= max(0.2, 0.9 * error ** -0.2)
+                continue
+            
+            if count == len(times):
+                times = np.concatenate([times, np.empty_like(times)])
+                states = np.concatenate([states, np.empty_like(states)])
+            
+            # Dense output coefficients for this step
+            Q = h * np.dot(K.T, DOPRI_P)
+            
+            # Apex: vz changes sign within the step
+            if y[5] > 0 >= y_new[5]:
+                theta = self._dense_root(y[5], Q[5])
+                apex_height = max(apex_height, self._dense_eval(y, Q, theta)[2])
+            apex_height = max(apex_height, y_new[2])
+            
+            # Ground contact: z changes sign within the step
+            if y_new[2] < ground_level_m:
+                theta = self._dense_root(y[2] - ground_level_m, Q[2])
+                landing = self._dense_eval(y, Q, theta)
+                landing[2] = ground_level_m
+                times[count], states[count] = t + theta * h, landing
+                count += 1
+                return times[:count], states[:count], apex_height, t + theta * h, evaluations
+            
+            t += h
+            y, f = y_new, f_new
+            times[count], states[count] = t, y
+            count += 1
+            
+            if error > 0:
+                h *= min(5.0, max(0.2, 0.9 * error ** -0.2))
+            else:
+                h *= 5.0
+        
+        return times[:count], states[:count], apex_height, t, evaluations
+    
+    @staticmethod
+    def _dense_eval(y, Q, theta):
+        """Evaluate the dense output polynomial at fraction theta of a step."""
+        return y + np.dot(Q, theta ** np.arange(1, 5))
+    
+    @staticmethod
+    def _dense_root(value, coefficients):
+        """
+        First root in (0, 1] of value + c1*θ + c2*θ² + c3*θ³ + c4*θ⁴.
+        
+        Args:
+            value: Component value at the start of the step
+            coefficients: Dense output row [c1, c2, c3, c4] for that component
+            
+        Returns:
+            theta in (0, 1]
+        """
+        roots = np.roots([coefficients[3], coefficients[2], coefficients[1],
+                          coefficients[0], value])
+        real = roots[np.abs(roots.imag) < 1e-9].real
+        real = real[(real > 1e-12) & (real <= 1 + 1e-9)]
+        
+        if real.size:
+            return min(real.min(), 1.0)
+        
+        # Fall back to bisection if the polynomial root was lost to rounding
+        lo, hi = 0.0, 1.0
+        poly = lambda th: value + np.dot(coefficients, th ** np.arange(1, 5))
+        sign_lo = np.sign(poly(lo))
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            if np.sign(poly(mid)) == sign_lo:
+                lo = mid
+            else:
+                hi = mid
+        return hi
+    
     def simulate_flight(self, launch_speed_mph, launch_angle_deg, 
                        backspin_rpm, side_spin_axis_deg,
                        wind_speed_mph=0, wind_direction_deg=0,
-                       temperature_f=70, altitude_m=0):
+                       temperature_f=70, altitude_m=0,
+                       integrator="rk4", rtol=1e-6, atol=1e-6,
+                       dense_output=False, ground_level_m=0):
         """
         Simulate complete ball flight trajectory.
         
@@ -155,10 +517,24 @@ class TrajectorySimulator:
             wind_direction_deg: Wind direction (0 = headwind, 90 = right, 180 = tailwind)
             temperature_f: Temperature in Fahrenheit
             altitude_m: Altitude in meters
+            integrator: "rk4" (fixed 10ms steps) or "dopri5" (adaptive with
+                exact apex and ground contact)
+            rtol: Relative error tolerance (dopri5 only)
+            atol: Absolute error tolerance (dopri5 only)
+            dense_output: Return a DenseTrajectory under "trajectory";
+                "points" and "times" are then array views (otherwise lists,
+                as JSON-ready output). Either way the last point is the
+                ground contact, interpolated within the final RK4 step
+            ground_level_m: Height (relative to the tee) at which the flight
+                ends; lower it to keep integrating below the tee for terrain
+                intersection (see terrain_model)
             
         Returns:
             dict with trajectory data
         """
+        if integrator not in ("rk4", "dopri5"):
+            raise ValueError(f"Unknown integrator: {integrator}")
+        
         # Set environmental conditions
         self.set_conditions(altitude_m, temperature_f)
         
@@ -181,27 +557,65 @@ class TrajectorySimulator:
         # Initial state: [x, y, z, vx, vy, vz, spin_rate, spin_axis]
         state = [0, 0, 0, vx0, vy0, vz0, backspin_rpm, side_spin_axis_deg]
         
-        # Simulation parameters
-        dt = 0.01  # 10ms time steps
-        max_time = 15.0  # Maximum 15 seconds
+        trajectory = None
         
-        # Storage
-        trajectory_points = []
-        time = 0
-        apex_height = 0
-        
-        # Simulate until ball hits ground
-        while state[2] >= 0 and time < max_time:
-            # Record point
-            trajectory_points.append([state[0], state[1], state[2]])
+        if integrator == "dopri5":
+            times, states, apex_height, time, evaluations = \
+                self._integrate_adaptive(state, wind_vector, rtol, atol, ground_level_m)
+            state = list(states[-1])
+            if dense_output:
+                velocities = states[:, 3:6]
+                trajectory = DenseTrajectory(times, states[:, :3], velocities)
+                trajectory_points = trajectory.positions
+            else:
+                trajectory_points = states[:, :3].tolist()
+                times = times.tolist()
+        else:
+            # Fixed RK4 steps into preallocated state rows, trimmed after landing
+            dt = self.time_step
+            max_steps = int(round(self.max_flight_time / dt))
+            states = np.empty((max_steps + 1, len(state)))
+            states[0] = state
+            steps = 0
+            apex_height = 0
+            
+            # Simulate until ball hits ground
+            while state[2] >= ground_level_m and steps < max_steps:
+                # Track apex
+                if state[2] > apex_height:
+                    apex_height = state[2]
+                
+                # Integration step
+                state = self._rk4_step(state, dt, wind_vector)
+                steps += 1
+                states[steps] = state
+            
+            time = steps * dt
+            evaluations = 4 * steps
+            states = states[:steps + 1]
+            times = np.arange(steps + 1) * dt
             
-            # Track apex
-            if state[2] > apex_height:
-                apex_height = state[2]
+            if steps and state[2] < ground_level_m:
+                # Replace the first state below ground by the exact contact
+                before, after = states[steps - 1:steps + 1, :, None]
+                theta, position, velocity = self._hermite_crossing(
+                    before[:3], before[3:6], after[:3], after[3:6], dt, ground_level_m
+                )
+                theta = float(theta[0])
+                states[steps, :3] = position[:, 0]
+                states[steps, 3:6] = velocity[:, 0]
+                states[steps, 6] = before[6, 0] + theta * (after[6, 0] - before[6, 0])
+                time = (steps - 1 + theta) * dt
+                times[steps] = time
+                state = list(states[steps])
             
-            # Integration step
-            state = self._rk4_step(state, dt, wind_vector)
-            time += dt
+            if dense_output:
+                trajectory = DenseTrajectory(times, states[:, :3], states[:, 3:6])
+                trajectory_points = trajectory.positions
+            else:
+                # Lists for JSON output (the last point is the landing)
+                trajectory_points = states[:, :3].tolist()
+                times = times.tolist()
         
         # Calculate final metrics
         carry_distance = math.sqrt(state[0]**2 + state[1]**2)  # Total distance
@@ -213,15 +627,23 @@ class TrajectorySimulator:
         apex_yards = apex_height * 1.09361
         curve_yards = lateral_displacement * 1.09361
         
-        return {
+        result = {
             "points": trajectory_points,  # List of [x, y, z] in meters
+            "times": times,  # Seconds after launch of each point
             "apex_height_yards": apex_yards,
             "carry_distance_yards": carry_yards,
             "curve_yards": curve_yards,
             "flight_time_seconds": flight_time,
             "final_spin_rpm": state[6],  # Spin at landing
-            "num_points": len(trajectory_points)
+            "landing_velocity": [state[3], state[4], state[5]],  # m/s at landing
+            "num_points": len(trajectory_points),
+            "force_evaluations": evaluations
         }
+        
+        if trajectory is not None:
+            result["trajectory"] = trajectory
+        
+        return result
     
     def simulate_archetype(self, archetype_data, launch_speed_mph, 
                           wind_speed_mph=0, wind_direction_deg=0):
@@ -246,6 +668,503 @@ class TrajectorySimulator:
             wind_direction_deg=wind_direction_deg
         )
 
+    def _batch_accel(self, velocity, spin, lift_x, lift_z, wind):
+        """
+        Vectorized version of _forces for a batch of balls.
+        
+        Args:
+            velocity: (3, N) array of [vx, vy, vz]
+            spin: (N,) spin rates in RPM
+            lift_x, lift_z: (N,) Magnus factors per RPM, i.e.
+                0.5 * rho * A / m * lift_coefficient_per_spin * sin/cos(spin axis)
+            wind: (3, N) wind velocity (z row is zero)
+        
+        Returns:
+            (3, N) acceleration array
+        """
+        rel = velocity - wind
+        v_sq = (rel * rel).sum(axis=0)
+        v_rel = np.sqrt(v_sq)
+        
+        # Drag: |a| = k*Cd*v² along -rel/v  ->  -k*Cd*v*rel
+        k_drag = 0.5 * self.air_density * self.ball_area / self.ball_mass * self.drag_coefficient
+        accel = rel * (v_rel * -k_drag)
+        
+        # Magnus: backspin lifts along z, side spin pushes along x (as in _forces)
+        magnus = spin * v_sq
+        accel[0] += magnus * lift_x
+        accel[2] += magnus * lift_z - self.gravity
+        
+        if v_rel.min() < 0.1:  # Some balls have stopped
+            stopped = v_rel < 0.1
+            accel[:, stopped] = 0.0
+            accel[2, stopped] = -self.gravity
+        
+        return accel
+    
+    def _batch_rk4_step(self, position, velocity, spin, lift_x, lift_z, wind, dt):
+        """
+        Single RK4 step for a batch of balls (same scheme as _rk4_step).
+        
+        Position and spin stages are folded into closed form: the position
+        stages are velocity stages, and spin decay is linear, so each RK4
+        spin stage is the current spin times a constant.
+        
+        Returns:
+            (position, velocity, spin) after dt
+        """
+        h = -0.02 * dt  # Spin decay per step, as in _rk4_step
+        c2 = 1 + h / 2
+        c3 = 1 + h / 2 * c2
+        c4 = 1 + h * c3
+        
+        a1 = self._batch_accel(velocity, spin, lift_x, lift_z, wind)
+        a2 = self._batch_accel(velocity + dt / 2 * a1, spin * c2, lift_x, lift_z, wind)
+        a3 = self._batch_accel(velocity + dt / 2 * a2, spin * c3, lift_x, lift_z, wind)
+        a4 = self._batch_accel(velocity + dt * a3, spin * c4, lift_x, lift_z, wind)
+        
+        # v + 2*v2 + 2*v3 + v4 == 6*v + dt*(a1 + a2 + a3)
+        new_position = position + dt * velocity + dt * dt / 6 * (a1 + a2 + a3)
+        new_velocity = velocity + dt / 6 * (a1 + 2 * a2 + 2 * a3 + a4)
+        new_spin = spin * (1 + h / 6 * (1 + 2 * c2 + 2 * c3 + c4))
+        
+        return new_position, new_velocity, new_spin
+    
+    def _batch_initial_state(self, launch_speed_mph, launch_angle_deg,
+                             backspin_rpm, side_spin_axis_deg,
+                             wind_speed_mph, wind_direction_deg,
+                             temperature_f, altitude_m):
+        """
+        Broadcast launch arguments and build the structure-of-arrays state.
+        
+        Returns:
+            (position, velocity, spin, lift_x, lift_z, wind) for _batch_rk4_step
+        """
+        self.set_conditions(altitude_m, temperature_f)
+        
+        speed, angle, backspin, axis, wind_speed, wind_dir = np.broadcast_arrays(
+            *(np.asarray(a, dtype=np.float64) for a in (
+                launch_speed_mph, launch_angle_deg, backspin_rpm,
+                side_spin_axis_deg, wind_speed_mph, wind_direction_deg
+            ))
+        )
+        speed, angle, backspin, axis, wind_speed, wind_dir = (
+            a.ravel() for a in (speed, angle, backspin, axis, wind_speed, wind_dir)
+        )
+        n = speed.size
+        
+        # Initial state (structure-of-arrays)
+        v0 = speed * 0.44704
+        angle_rad = np.radians(angle)
+        position = np.zeros((3, n))
+        velocity = np.zeros((3, n))
+        velocity[0] = v0 * np.cos(angle_rad)
+        velocity[2] = v0 * np.sin(angle_rad)
+        spin = backspin.copy()
+        
+        axis_rad = np.radians(axis)
+        k_lift = (0.5 * self.air_density * self.ball_area / self.ball_mass
+                  * self.lift_coefficient_per_spin)
+        lift_x = k_lift * np.sin(axis_rad)
+        lift_z = k_lift * np.cos(axis_rad)
+        
+        wind_ms = wind_speed * 0.44704
+        wind_rad = np.radians(wind_dir)
+        wind = np.zeros((3, n))
+        wind[0] = -wind_ms * np.cos(wind_rad)
+        wind[1] = wind_ms * np.sin(wind_rad)
+        
+        return position, velocity, spin, lift_x, lift_z, wind
+    
+    def simulate_batch(self, launch_speed_mph, launch_angle_deg,
+                       backspin_rpm, side_spin_axis_deg,
+                       wind_speed_mph=0, wind_direction_deg=0,
+                       temperature_f=70, altitude_m=0, record_points=True,
+                       time_step=None, ground_level_m=0, ground_height=None):
+        """
+        Simulate many ball flights at once with a vectorized RK4 integrator.
+        
+        All launch arguments accept scalars or NumPy arrays and are broadcast
+        to a common length N. The state is kept as structure-of-arrays and
+        each ball drops out of the integration on its own ground contact, so
+        results match N calls to simulate_flight.
+        
+        Args:
+            launch_speed_mph: Initial ball speeds in mph
+            launch_angle_deg: Launch angles in degrees
+            backspin_rpm: Backspin rates in RPM
+            side_spin_axis_deg: Side spin axis tilts (+ = right, - = left)
+            wind_speed_mph: Wind speeds in mph
+            wind_direction_deg: Wind directions (0 = headwind, 90 = right, 180 = tailwind)
+            temperature_f: Temperature in Fahrenheit (shared by the batch)
+            altitude_m: Altitude in meters (shared by the batch)
+            record_points: Keep per-step positions (disable for large ensembles)
+            time_step: Integration step override (default: self.time_step)
+            ground_level_m: Height at which each flight ends
+            ground_height: Optional callable (x, y, ids) -> (M,) ground height
+                relative to the tee under balls ids at positions x, y (e.g.
+                from terrain_model.ElevationModel.relative_height); replaces
+                ground_level_m, and the contact is interpolated linearly on
+                the clearance as in ElevationModel.find_landing
+        
+        Returns:
+            dict of arrays, one entry per ball:
+                landing: (N, 3) ground contact (interpolated within the last
+                    step, as simulate_flight), in meters
+                landing_velocity: (N, 3) velocity at that position, in m/s
+                apex_height_yards, carry_distance_yards, curve_yards,
+                flight_time_seconds, final_spin_rpm, num_points: (N,)
+                points: list of (num_points, 3) arrays, or None
+                times: list of (num_points,) point times in seconds, or None
+        """
+        position, velocity, spin, lift_x, lift_z, wind = self._batch_initial_state(
+            launch_speed_mph, launch_angle_deg, backspin_rpm, side_spin_axis_deg,
+            wind_speed_mph, wind_direction_deg, temperature_f, altitude_m
+        )
+        n = spin.size
+        
+        dt = time_step or self.time_step
+        max_steps = int(round(self.max_flight_time / dt))
+        
+        num_points = np.zeros(n, dtype=np.int64)
+        flight_time = np.zeros(n)
+        apex = np.zeros(n)
+        
+        # Working set: balls still integrated. Landed balls are written back
+        # immediately but only dropped from the working set once enough of
+        # them have accumulated, so most steps avoid fancy indexing.
+        live = np.arange(n)
+        alive = np.ones(n, dtype=bool)
+        p, v, s = position.copy(), velocity.copy(), spin.copy()
+        lx, lz, w = lift_x, lift_z, wind
+        live_apex = np.zeros(n)
+        history = []  # (live indices, positions) per step
+        
+        step = 0
+        while live.size and step < max_steps:
+            if record_points:
+                history.append((live, p))
+            live_apex = np.maximum(live_apex, p[2])
+            
+            p0, v0, s0 = p, v, s
+            p, v, s = self._batch_rk4_step(p, v, s, lx, lz, w, dt)
+            step += 1
+            
+            if ground_height is None:
+                landed = alive & (p[2] < ground_level_m)
+            else:
+                ground = ground_height(p[0], p[1], live)
+                landed = alive & (p[2] < ground)
+            if landed.any():
+                ids = live[landed]
+                if ground_height is None:
+                    theta, position[:, ids], velocity[:, ids] = self._hermite_crossing(
+                        p0[:, landed], v0[:, landed], p[:, landed], v[:, landed], dt, ground_level_m
+                    )
+                else:
+                    # Clearance before and after the step; the launch point sits
+                    # on the ground, so a ball under a bank lands at once
+                    before = p0[2, landed] - ground_height(p0[0, landed], p0[1, landed], ids)
+                    after = p[2, landed] - ground[landed]
+                    theta = np.where(before > 0, before / np.maximum(before - after, 1e-12), 0.0)
+                    position[:, ids] = p0[:, landed] + theta * (p[:, landed] - p0[:, landed])
+                    velocity[:, ids] = v0[:, landed] + theta * (v[:, landed] - v0[:, landed])
+                spin[ids] = s0[landed] + theta * (s[landed] - s0[landed])
+                apex[ids] = live_apex[landed]
+                flight_time[ids] = (step - 1 + theta) * dt
+                num_points[ids] = step + 1
+                alive &= ~landed
+                
+                remaining = np.count_nonzero(alive)
+                if remaining < 0.75 * live.size:
+                    live = live[alive]
+                    p, v, s = p[:, alive], v[:, alive], s[alive]
+                    lx, lz, w = lx[alive], lz[alive], w[:, alive]
+                    live_apex = live_apex[alive]
+                    alive = np.ones(remaining, dtype=bool)
+        
+        # Balls still airborne at the time limit
+        if live.size:
+            ids = live[alive]
+            position[:, ids] = p[:, alive]
+            velocity[:, ids] = v[:, alive]
+            spin[ids] = s[alive]
+            apex[ids] = live_apex[alive]
+            flight_time[ids] = step * dt
+            num_points[ids] = step + 1
+        
+        points = times = None
+        if record_points:
+            times = [np.append(np.arange(num_points[i] - 1) * dt, flight_time[i]) for i in range(n)]
+            points = [np.empty((num_points[i], 3)) for i in range(n)]
+            for i in range(n):
+                points[i][-1] = position[:, i]  # Landing (or final) state
+            start = 0
+            while start < len(history):
+                # Consecutive steps share the same working set until it is compacted
+                ids = history[start][0]
+                stop = start
+                while stop < len(history) and history[stop][0] is ids:
+                    stop += 1
+                segment = np.stack([pos for _, pos in history[start:stop]])
+                for col, i in enumerate(ids):
+                    count = min(num_points[i] - 1, stop) - start
+                    if count > 0:
+                        points[i][start:start + count] = segment[:count, :, col]
+                start = stop
+        
+        carry = np.hypot(position[0], position[1])
+        
+        return {
+            "landing": position.T.copy(),
+            "landing_velocity": velocity.T.copy(),
+            "apex_height_yards": apex * 1.09361,
+            "carry_distance_yards": carry * 1.09361,
+            "curve_yards": position[1] * 1.09361,
+            "flight_time_seconds": flight_time,
+            "final_spin_rpm": spin,
+            "num_points": num_points,
+            "points": points,
+            "times": times
+        }
+    
+    def simulate_archetypes(self, archetypes, launch_speed_mph,
+                            wind_speed_mph=0, wind_direction_deg=0,
+                            ground_level_m=0):
+        """
+        Simulate several shot archetypes in one vectorized batch.
+        
+        Args:
+            archetypes: Dict of key -> archetype data (e.g. SHOT_TYPES)
+            launch_speed_mph: Detected ball speed
+            wind_speed_mph: Wind speed
+            wind_direction_deg: Wind direction
+            ground_level_m: Height at which each flight ends
+        
+        Returns:
+            Dict of key -> trajectory dict (same format as simulate_flight)
+        """
+        keys = list(archetypes)
+        batch = self.simulate_batch(
+            launch_speed_mph=launch_speed_mph,
+            launch_angle_deg=[archetypes[k]["launch_angle"] for k in keys],
+            backspin_rpm=[archetypes[k]["backspin_rpm"] for k in keys],
+            side_spin_axis_deg=[archetypes[k]["side_spin_axis"] for k in keys],
+            wind_speed_mph=wind_speed_mph,
+            wind_direction_deg=wind_direction_deg,
+            ground_level_m=ground_level_m
+        )
+        
+        results = {}
+        for i, key in enumerate(keys):
+            results[key] = {
+                "points": batch["points"][i].tolist(),
+                "times": batch["times"][i].tolist(),
+                "apex_height_yards": float(batch["apex_height_yards"][i]),
+                "carry_distance_yards": float(batch["carry_distance_yards"][i]),
+                "curve_yards": float(batch["curve_yards"][i]),
+                "flight_time_seconds": float(batch["flight_time_seconds"][i]),
+                "final_spin_rpm": float(batch["final_spin_rpm"][i]),
+                "landing_velocity": batch["landing_velocity"][i].tolist(),
+                "num_points": int(batch["num_points"][i])
+            }
+        
+        return results
+
+    
+    def positions_at_times(self, times, launch_speed_mph, launch_angle_deg,
+                           backspin_rpm, side_spin_axis_deg,
+                           wind_speed_mph=0, wind_direction_deg=0,
+                           temperature_f=70, altitude_m=0, time_step=None):
+        """
+        Ball positions at given times after launch for a batch of launches.
+        
+        Integrates the whole batch with the vectorized RK4 step up to the
+        last requested time (no ground contact check, meant for the early
+        flight seen on camera) and evaluates each time with a cubic Hermite
+        interpolant between steps.
+        
+        Args:
+            times: (T,) seconds after launch (non-negative)
+            launch_speed_mph, launch_angle_deg, backspin_rpm,
+            side_spin_axis_deg, wind_speed_mph, wind_direction_deg:
+                Scalars or arrays broadcast to a batch of N launches
+            temperature_f: Temperature in Fahrenheit
+            altitude_m: Altitude in meters
+            time_step: Integration step override (default: self.time_step)
+        
+        Returns:
+            (N, T, 3) array of [x, y, z] positions in meters
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if times.size and times.min() < 0:
+            raise ValueError("times must be non-negative")
+        
+        position, velocity, spin, lift_x, lift_z, wind = self._batch_initial_state(
+            launch_speed_mph, launch_angle_deg, backspin_rpm, side_spin_axis_deg,
+            wind_speed_mph, wind_direction_deg, temperature_f, altitude_m
+        )
+        
+        dt = time_step or self.time_step
+        steps = int(math.ceil(times.max() / dt)) if times.size else 0
+        
+        positions = [position]
+        velocities = [velocity]
+        for _ in range(steps):
+            position, velocity, spin = self._batch_rk4_step(
+                position, velocity, spin, lift_x, lift_z, wind, dt
+            )
+            positions.append(position)
+            velocities.append(velocity)
+        
+        positions = np.stack(positions)    # (steps + 1, 3, N)
+        velocities = np.stack(velocities)
+        
+        # Cubic Hermite between the steps on either side of each time
+        index = np.minimum((times / dt).astype(np.int64), max(steps - 1, 0))
+        theta = (times / dt - index)[:, None, None]
+        if steps == 0:
+            return np.repeat(positions[:1], times.size, axis=0).transpose(2, 0, 1)
+        
+        p0, p1 = positions[index], positions[index + 1]
+        m0, m1 = velocities[index] * dt, velocities[index + 1] * dt
+        theta2 = theta * theta
+        theta3 = theta2 * theta
+        result = ((2 * theta3 - 3 * theta2 + 1) * p0 + (theta3 - 2 * theta2 + theta) * m0
+                  + (-2 * theta3 + 3 * theta2) * p1 + (theta3 - theta2) * m1)
+        
+        return result.transpose(2, 0, 1)
+    
+    def fit_launch_parameters(self, times, observed, project, initial_speed_mph,
+                              initial_angle_deg, initial_axis_deg=0.0,
+                              backspin_rpm=2500, wind_speed_mph=0,
+                              wind_direction_deg=0, measurement_std=1.0,
+                              axis_prior_std_deg=10.0, max_iterations=20,
+                              tolerance=1e-6):
+        """
+        Inverse mode: fit launch speed, angle and spin axis to an observed track.
+        
+        Levenberg-Marquardt on the residuals of every observation at once.
+        Each iteration integrates the candidate and its three finite-difference
+        perturbations together in one positions_at_times batch. A launch
+        position offset (forward and vertical) is fitted alongside, since the
+        first tracked point is rarely the exact launch point.
+        
+        Side spin barely changes the early flight, so the spin axis carries a
+        Gaussian prior around its initial guess to keep the fit well posed.
+        
+        Args:
+            times: (T,) seconds since launch of each observation
+            observed: (T, 2) observed measurements (e.g. pixel coordinates)
+            project: Callable mapping (N, T, 3) positions in meters to
+                (N, T, 2) measurements in the same units as observed
+            initial_speed_mph: Starting speed guess
+            initial_angle_deg: Starting launch angle guess
+            initial_axis_deg: Starting spin axis guess
+            backspin_rpm: Backspin used for the fit (not fitted)
+            wind_speed_mph: Wind speed
+            wind_direction_deg: Wind direction (0 = headwind)
+            measurement_std: 1-sigma observation noise (measurement units)
+            axis_prior_std_deg: 1-sigma width of the spin axis prior
+            max_iterations: Maximum Levenberg-Marquardt iterations
+            tolerance: Relative cost change that counts as converged
+        
+        Returns:
+            dict with speed_mph, launch_angle, side_spin_axis, offset_m [x, z],
+            rms_error (measurement units), std (1-sigma per fitted parameter),
+            iterations and converged
+        """
+        times = np.asarray(times, dtype=np.float64)
+        observed = np.asarray(observed, dtype=np.float64)
+        if len(times) < 3 or observed.shape != (len(times), 2):
+            raise ValueError("Need at least 3 observations with matching (T, 2) measurements")
+        
+        # Parameters: speed (mph), angle (deg), axis (deg), offset x (m), offset z (m)
+        params = np.array([initial_speed_mph, initial_angle_deg, initial_axis_deg, 0.0, 0.0])
+        steps = np.array([0.05, 0.02, 0.2, 1e-3, 1e-3])
+        names = ["speed_mph", "launch_angle", "side_spin_axis", "offset_x_m", "offset_z_m"]
+        
+        def evaluate(p):
+            """Residuals and Jacobian at p from one batched integration."""
+            batch = np.tile(p[:3], (4, 1))
+            batch[1:, :] += np.diag(steps[:3])
+            positions = self.positions_at_times(
+                times, batch[:, 0], batch[:, 1], backspin_rpm, batch[:, 2],
+                wind_speed_mph, wind_direction_deg
+            )
+            positions[:, :, 0] += p[3]
+            positions[:, :, 2] += p[4]
+            
+            # Offsets only move the projected track, no integration needed
+            shifted = np.repeat(positions[:1], 2, axis=0)
+            shifted[0, :, 0] += steps[3]
+            shifted[1, :, 2] += steps[4]
+            
+            predicted = project(np.concatenate([positions, shifted])) / measurement_std
+            residuals = (predicted[0] - observed / measurement_std).ravel()
+            jacobian = ((predicted[1:] - predicted[:1]).reshape(5, -1) / steps[:, None]).T
+            
+            # Spin axis prior as one extra whitened residual
+            residuals = np.append(residuals, (p[2] - initial_axis_deg) / axis_prior_std_deg)
+            jacobian = np.vstack([jacobian, [0, 0, 1 / axis_prior_std_deg, 0, 0]])
+            return residuals, jacobian
+        
+        residuals, jacobian = evaluate(params)
+        cost = residuals @ residuals
+        damping = 1e-3
+        converged = False
+        iteration = 0
+        
+        for iteration in range(1, max_iterations + 1):
+            jtj = jacobian.T @ jacobian
+            gradient = jacobian.T @ residuals
+            scale = np.diag(jtj).copy()
+            scale[scale == 0] = 1.0
+            
+            try:
+                delta = np.linalg.solve(jtj + damping * np.diag(scale), -gradient)
+            except np.linalg.LinAlgError:
+                break
+            
+            candidate = params + delta
+            candidate[0] = max(candidate[0], 1.0)
+            new_residuals, new_jacobian = evaluate(candidate)
+            new_cost = new_residuals @ new_residuals
+            
+            if new_cost < cost:
+                improvement = (cost - new_cost) / max(cost, 1e-12)
+                params, residuals, jacobian, cost = candidate, new_residuals, new_jacobian, new_cost
+                damping = max(damping / 3, 1e-9)
+                if improvement < tolerance:
+                    converged = True
+                    break
+            else:
+                damping *= 5
+                if damping > 1e6:
+                    converged = True  # No downhill step left
+                    break
+        
+        # Parameter covariance from the final Jacobian, inflated when the
+        # track scatters more than measurement_std
+        data_residuals = residuals[:-1] * measurement_std
+        dof = max(data_residuals.size - len(params), 1)
+        sigma_sq = max(cost / dof, 1.0)
+        try:
+            covariance = np.linalg.pinv(jacobian.T @ jacobian) * sigma_sq
+            std = np.sqrt(np.maximum(np.diag(covariance), 0))
+        except np.linalg.LinAlgError:
+            std = np.full(len(params), np.inf)
+        
+        return {
+            "speed_mph": float(params[0]),
+            "launch_angle": float(params[1]),
+            "side_spin_axis": float(params[2]),
+            "offset_m": [float(params[3]), float(params[4])],
+            "rms_error": float(math.sqrt(data_residuals @ data_residuals / data_residuals.size)),
+            "std": {name: float(value) for name, value in zip(names, std)},
+            "iterations": iteration,
+            "converged": converged
+        }
 
 if __name__ == "__main__":
     """Test the physics simulator"""
@@ -295,4 +1214,35 @@ if __name__ == "__main__":
     print(f"  Carry distance: {result['carry_distance_yards']:.1f} yards")
     print(f"  Distance loss from wind: ~{220 - result['carry_distance_yards']:.1f} yards")
     
+    # Test case: Adaptive integrator vs fixed step
+    print("\nTest: 145mph driver, fixed RK4 vs adaptive Dormand-Prince")
+    for integrator in ("rk4", "dopri5"):
+        result = sim.simulate_flight(
+            launch_speed_mph=145,
+            launch_angle_deg=12,
+            backspin_rpm=2500,
+            side_spin_axis_deg=0,
+            integrator=integrator
+        )
+        print(f"  {integrator:7s} Carry: {result['carry_distance_yards']:.2f} yards  "
+              f"Flight: {result['flight_time_seconds']:.3f}s  "
+              f"Force evaluations: {result['force_evaluations']}")
+    
+    # Test case: All archetypes in one vectorized batch
+    from shot_archetypes import SHOT_TYPES
+    print("\nTest: All archetypes at 140mph (vectorized batch)")
+    results = sim.simulate_archetypes(SHOT_TYPES, launch_speed_mph=140)
+    
+    for key, batch_result in results.items():
+        print(f"  {key:15s} Carry: {batch_result['carry_distance_yards']:.1f} yards")
+    
+    # Test case: Dense output sampled at arbitrary times and distances
+    print("\nTest: Dense trajectory (dopri5 steps, Hermite interpolant)")
+    result = sim.simulate_flight(145, 12, 2500, 0, integrator="dopri5", dense_output=True)
+    trajectory = result["trajectory"]
+    print(f"  Stored states: {len(trajectory)} ({trajectory.nbytes} bytes)")
+    print(f"  Position at t=1.0s: {np.round(trajectory.at_time(1.0), 2)}")
+    print(f"  60 Hz samples: {len(trajectory.sample(interval=1 / 60))}, "
+          f"every 10m of path: {len(trajectory.sample(interval=10, by='distance'))}")
+    
     print("\n" + "=" * 60)